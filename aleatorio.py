@@ -0,0 +1,164 @@
+"""
+aleatorio.py - Generadores de números aleatorios reproducibles para mesas y mazos.
+
+Los mazos, los jugadores computarizados, las políticas y el generador de
+cartas aceptan un generador propio (cualquier `random.Random`). Si no se les
+pasa ninguno usan el módulo `random`, como siempre.
+
+Para simulaciones en paralelo conviene darle a cada mesa su propio generador:
+los procesos no comparten estado y cada mesa es reproducible a partir de una
+semilla. `GeneradorContador` está pensado para eso: el número n de un flujo se
+obtiene cifrando el contador n con una clave derivada de (semilla, flujo), así
+que crear un flujo nuevo es barato (no hay que inicializar los 2,5 KB de estado
+del Mersenne Twister), los flujos distintos son independientes y se puede
+saltar a cualquier posición sin generar los números anteriores. Además
+baraja más rápido que random.shuffle porque toma todas las palabras que
+necesita de una vez.
+
+Clases:
+    - GeneradorContador: Generador basado en contador (SHAKE-256), subclase de random.Random.
+
+Uso típico:
+
+    generador = GeneradorContador(semilla=42, flujo=numero_de_mesa)
+    juego = BlackJack(interactivo=False, generador=generador)
+"""
+
+import hashlib
+import random
+import sys
+from array import array
+
+PALABRAS_POR_BLOQUE = 256
+_ESCALA = 2.0 ** -53
+
+
+class GeneradorContador(random.Random):
+    """Generador de números aleatorios basado en contador.
+
+    Cada bloque es SHAKE-256(clave || contador), con la clave derivada de la
+    semilla y el flujo, y se consume como PALABRAS_POR_BLOQUE palabras de 64
+    bits. Generar muchas palabras por bloque amortiza el costo de la función de
+    hash, que está en C. Hereda de random.Random, así que tiene randint,
+    shuffle, choice, etc.
+
+    Atributos:
+        __clave (bytes): Clave derivada de la semilla y el flujo.
+        __flujo (int): Número de flujo.
+        __contador (int): Número del próximo bloque a generar.
+        __palabras (tuple[int, ...]): Palabras del bloque actual.
+        __indice (int): Próxima palabra a usar del bloque actual.
+    """
+
+    def __init__(self, semilla=None, flujo: int = 0) -> None:
+        """Inicializa el generador.
+
+        Args:
+            semilla (optional): Cualquier valor con repr estable (int, str, bytes...). Por defecto,
+                una semilla tomada del sistema operativo.
+            flujo (int, optional): Número de flujo; cada flujo de una misma semilla es independiente.
+                Por defecto es 0.
+        """
+        self.__flujo: int = flujo
+        super().__init__(semilla)
+
+    @property
+    def flujo(self) -> int:
+        """Retorna el número de flujo."""
+        return self.__flujo
+
+    def seed(self, a=None, version: int = 2) -> None:
+        """Reinicia el generador con una semilla nueva, en el mismo flujo."""
+        if a is None:
+            a = random.SystemRandom().getrandbits(128)
+        material = f"{a!r}/{self.__flujo}".encode()
+        self.__clave: bytes = hashlib.blake2b(material, digest_size=32).digest()
+        self.__contador: int = 0
+        self.__palabras: list = []
+        self.__indice: int = PALABRAS_POR_BLOQUE
+        self.gauss_next = None
+
+    def __nuevo_bloque(self) -> None:
+        """Genera el bloque del contador actual y avanza el contador."""
+        bloque = hashlib.shake_256(self.__clave + self.__contador.to_bytes(8, "little"))
+        palabras = array("Q", bloque.digest(8 * PALABRAS_POR_BLOQUE))
+        if sys.byteorder == "big":
+            palabras.byteswap()
+        self.__palabras = palabras.tolist()
+        self.__contador += 1
+        self.__indice = 0
+
+    def __siguiente(self) -> int:
+        """Retorna la próxima palabra de 64 bits."""
+        indice = self.__indice
+        if indice >= PALABRAS_POR_BLOQUE:
+            self.__nuevo_bloque()
+            indice = 0
+        self.__indice = indice + 1
+        return self.__palabras[indice]
+
+    def __tomar(self, cantidad: int) -> list:
+        """Retorna las próximas `cantidad` palabras de 64 bits."""
+        palabras = self.__palabras[self.__indice:self.__indice + cantidad]
+        self.__indice += len(palabras)
+        while len(palabras) < cantidad:
+            self.__nuevo_bloque()
+            faltan = cantidad - len(palabras)
+            palabras += self.__palabras[:faltan]
+            self.__indice = min(faltan, PALABRAS_POR_BLOQUE)
+        return palabras
+
+    def shuffle(self, x: list) -> None:
+        """Baraja la lista en el lugar.
+
+        Es Fisher-Yates, pero cada posición se elige multiplicando una palabra de 64
+        bits por el rango en lugar de descartar valores fuera de rango, y las palabras
+        se toman todas juntas. El sesgo es menor a len(x) / 2**64.
+        """
+        largo = len(x)
+        for i, palabra in zip(range(largo - 1, 0, -1), self.__tomar(largo - 1)):
+            j = palabra * (i + 1) >> 64
+            x[i], x[j] = x[j], x[i]
+
+    def random(self) -> float:
+        """Retorna un float en [0, 1)."""
+        return (self.__siguiente() >> 11) * _ESCALA
+
+    def getrandbits(self, k: int) -> int:
+        """Retorna un entero con k bits aleatorios."""
+        if k <= 64:
+            if k < 0:
+                raise ValueError("La cantidad de bits no puede ser negativa")
+            # Camino rápido de randint y shuffle: mismo código que __siguiente, sin la llamada
+            indice = self.__indice
+            if indice >= PALABRAS_POR_BLOQUE:
+                self.__nuevo_bloque()
+                indice = 0
+            self.__indice = indice + 1
+            return self.__palabras[indice] >> (64 - k)
+        resultado = 0
+        desplazamiento = 0
+        while desplazamiento < k:
+            resultado |= self.__siguiente() << desplazamiento
+            desplazamiento += 64
+        return resultado >> (desplazamiento - k)
+
+    def saltar(self, bloques: int) -> None:
+        """Avanza el generador al comienzo de `bloques` bloques más adelante, sin generarlos."""
+        self.__contador += bloques
+        self.__palabras = []
+        self.__indice = PALABRAS_POR_BLOQUE
+
+    def getstate(self) -> tuple:
+        """Retorna el estado del generador."""
+        return self.__clave, self.__flujo, self.__contador, tuple(self.__palabras), self.__indice, self.gauss_next
+
+    def setstate(self, estado: tuple) -> None:
+        """Restaura un estado obtenido con getstate."""
+        (self.__clave, self.__flujo, self.__contador,
+         palabras, self.__indice, self.gauss_next) = estado
+        self.__palabras = list(palabras)
+
+    def __reduce__(self):
+        # random.Random se serializa llamando a __init__ sin argumentos y luego a setstate
+        return self.__class__, (0, self.__flujo), self.getstate()
@@ -0,0 +1,105 @@
+"""
+barajado.py - Políticas de barajado del mazo de Black Jack.
+
+Una política de barajado decide qué pasa con las cartas usadas al final de cada
+ronda y si hay que barajar antes de repartir la siguiente:
+
+    - BarajarCadaRonda: Las cartas vuelven al mazo y se baraja todo en cada ronda.
+      Es lo que hace `BlackJack` si no se indica otra política.
+    - CartaDeCorte: Las cartas van a la bandeja de descarte y solo se baraja cuando
+      se llega a la carta de corte (un porcentaje de penetración del mazo), como en
+      un casino con zapato.
+    - BarajadoContinuo: Cada carta usada se inserta en una posición al azar del
+      mazo, como una máquina barajadora continua; nunca se baraja el mazo entero.
+
+Las políticas no guardan estado (la bandeja de descarte es del mazo), así que una
+misma política se puede usar en varias mesas. `BlackJack` baraja el mazo cada vez
+que lo llena, antes de consultar a la política.
+
+Uso típico:
+
+    juego = BlackJack(interactivo=False, barajado=CartaDeCorte(0.75))
+"""
+
+from abc import ABC, abstractmethod
+from mazos import MazoBlackJack
+
+
+class PoliticaBarajado(ABC):
+    """Define una interfaz para manejar el mazo entre rondas."""
+
+    @abstractmethod
+    def antes_de_repartir(self, mazo: MazoBlackJack) -> None:
+        """Prepara el mazo antes de repartir una ronda (por ejemplo, barajándolo).
+
+        Args:
+            mazo (MazoBlackJack): El mazo de la mesa.
+        """
+        pass
+
+    @abstractmethod
+    def descartar(self, mazo: MazoBlackJack, cartas: list) -> None:
+        """Recibe las cartas usadas en la ronda.
+
+        Args:
+            mazo (MazoBlackJack): El mazo de la mesa.
+            cartas (list[CartaPoker]): Las cartas de todas las manos, en orden de asiento.
+        """
+        pass
+
+
+class BarajarCadaRonda(PoliticaBarajado):
+    """Devuelve las cartas al mazo y baraja las 312 cartas en cada ronda."""
+
+    def antes_de_repartir(self, mazo: MazoBlackJack) -> None:
+        mazo.barajar()
+
+    def descartar(self, mazo: MazoBlackJack, cartas: list) -> None:
+        mazo.poner_cartas(cartas)
+
+
+class CartaDeCorte(PoliticaBarajado):
+    """Baraja solo cuando se alcanza la carta de corte.
+
+    Atributos:
+        penetracion (float): Fracción del mazo que se reparte antes de volver a barajar.
+    """
+
+    def __init__(self, penetracion: float = 0.75) -> None:
+        """Inicializa la política.
+
+        Args:
+            penetracion (float, optional): Fracción del mazo que se reparte antes de
+                barajar, mayor que 0 y menor que 1. Por defecto es 0.75.
+
+        Raises:
+            ValueError: Si la penetración está fuera de rango.
+        """
+        if not 0 < penetracion < 1:
+            raise ValueError("La penetración debe estar entre 0 y 1")
+        self.__penetracion: float = penetracion
+
+    @property
+    def penetracion(self) -> float:
+        """Retorna la fracción del mazo que se reparte antes de barajar."""
+        return self.__penetracion
+
+    def antes_de_repartir(self, mazo: MazoBlackJack) -> None:
+        if len(mazo) <= mazo.total * (1 - self.__penetracion):
+            mazo.recoger_descartes()
+            mazo.barajar()
+
+    def descartar(self, mazo: MazoBlackJack, cartas: list) -> None:
+        mazo.descartar_cartas(cartas)
+
+
+class BarajadoContinuo(PoliticaBarajado):
+    """Inserta cada carta usada en una posición al azar, como una barajadora continua."""
+
+    def antes_de_repartir(self, mazo: MazoBlackJack) -> None:
+        # Las inserciones al azar mantienen mezclado el mazo
+        pass
+
+    def descartar(self, mazo: MazoBlackJack, cartas: list) -> None:
+        for carta in cartas:
+            mazo.insertar_al_azar(carta)
@@ -0,0 +1,216 @@
+"""
+benchmarks.py - Mediciones de rendimiento de los caminos más usados del juego.
+
+Mide operaciones por segundo y memoria de:
+    - MazoBlackJack.llenar, barajar y sacar_carta
+    - JugadorBlackJack.sumar_cartas
+    - str(CartaPoker), que pasa por strclr
+    - Una ronda completa del modo silencioso de BlackJack
+
+Cada medición toma el mejor de varios intentos (como timeit). La memoria se mide
+aparte con tracemalloc: el pico de memoria durante el intento y la cantidad neta
+de bloques que quedaron asignados.
+
+Las ops/s dependen de la máquina y de la versión de Python, así que la línea base
+no se guarda en el repositorio: cada uno la genera en su máquina con --guardar
+(por ejemplo antes de un cambio) y compara contra ella con --comparar.
+
+Uso:
+
+    python benchmarks.py                      # Muestra los resultados
+    python benchmarks.py --guardar            # Guarda la línea base en benchmarks_base.json
+    python benchmarks.py --comparar           # Compara contra la línea base; sale con 1 si algo empeoró
+    python benchmarks.py --comparar --tolerancia 0.3
+"""
+
+import argparse
+import gc
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+from cartas import CartaPoker
+from juego_black_jack import BlackJack
+from jugadores import Bot
+from mazos import MazoBlackJack
+from politicas import ApuestaFija, PoliticaEstrategiaBasica
+
+RUTA_BASE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmarks_base.json")
+
+
+def _preparar_llenar():
+    mazo = MazoBlackJack()
+    return mazo.llenar
+
+
+def _preparar_barajar():
+    mazo = MazoBlackJack(con_cartas=True)
+    return mazo.barajar
+
+
+def _preparar_sacar_carta():
+    mazo = MazoBlackJack(con_cartas=True)
+
+    def sacar_y_devolver():
+        mazo.poner_carta(mazo.sacar_carta())
+    return sacar_y_devolver
+
+
+def _preparar_sumar_cartas():
+    jugador = Bot("Benchmark", 100, PoliticaEstrategiaBasica(), ApuestaFija(1))
+    for numero in (1, 5, 1, 10):
+        jugador.poner_carta(CartaPoker(numero, 1))
+    return jugador.sumar_cartas
+
+
+def _preparar_carta_str():
+    carta = CartaPoker(12, 1)
+    return lambda: str(carta)
+
+
+def _preparar_ronda():
+    juego = BlackJack(interactivo=False)
+    for i in range(3):
+        juego.agregar_jugador(Bot(f"Bot {i}", 10 ** 12, PoliticaEstrategiaBasica(), ApuestaFija(1)))
+    juego.mazo.llenar()
+    return juego.jugar_ronda
+
+
+# nombre -> (función que prepara la operación, cantidad de operaciones por intento)
+BENCHMARKS = {
+    "mazo_llenar": (_preparar_llenar, 2_000),
+    "mazo_barajar": (_preparar_barajar, 500),
+    "mazo_sacar_carta": (_preparar_sacar_carta, 50_000),
+    "jugador_sumar_cartas": (_preparar_sumar_cartas, 100_000),
+    "carta_str": (_preparar_carta_str, 20_000),
+    "ronda_silenciosa": (_preparar_ronda, 1_000),
+}
+
+
+def medir(nombre: str, intentos: int = 5, escala: float = 1.0) -> dict:
+    """Mide un benchmark.
+
+    Args:
+        nombre (str): El nombre del benchmark en BENCHMARKS.
+        intentos (int, optional): Cantidad de intentos; se toma el más rápido. Por defecto 5.
+        escala (float, optional): Multiplica la cantidad de operaciones por intento. Por defecto 1.
+
+    Returns:
+        dict: ops_por_segundo, bytes_pico y bloques_netos.
+    """
+    preparar, cantidad = BENCHMARKS[nombre]
+    cantidad = max(1, int(cantidad * escala))
+    random.seed(0)
+    operacion = preparar()
+    repeticiones = range(cantidad)
+    mejor = float("inf")
+    gc_activo = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(intentos):
+            inicio = time.perf_counter()
+            for _ in repeticiones:
+                operacion()
+            mejor = min(mejor, time.perf_counter() - inicio)
+    finally:
+        if gc_activo:
+            gc.enable()
+
+    bloques_antes = sys.getallocatedblocks()
+    tracemalloc.start()
+    try:
+        base = tracemalloc.get_traced_memory()[0]
+        for _ in repeticiones:
+            operacion()
+        pico = tracemalloc.get_traced_memory()[1] - base
+    finally:
+        tracemalloc.stop()
+    bloques_netos = sys.getallocatedblocks() - bloques_antes
+    return {
+        "ops_por_segundo": cantidad / mejor,
+        "bytes_pico": pico,
+        "bloques_netos": bloques_netos,
+    }
+
+
+def medir_todos(intentos: int = 5, escala: float = 1.0, nombres=None) -> dict:
+    """Mide todos los benchmarks (o los indicados) y retorna un diccionario por nombre."""
+    return {nombre: medir(nombre, intentos, escala) for nombre in (nombres or BENCHMARKS)}
+
+
+def comparar(actual: dict, base: dict, tolerancia: float = 0.20) -> list[str]:
+    """Compara resultados contra una línea base.
+
+    Args:
+        actual (dict): Resultados actuales.
+        base (dict): Resultados de la línea base.
+        tolerancia (float, optional): Caída relativa de ops/s permitida. Por defecto 0.20 (20 %).
+
+    Returns:
+        list[str]: Los nombres de los benchmarks que empeoraron más que la tolerancia.
+    """
+    empeorados = []
+    for nombre, resultado in actual.items():
+        if nombre not in base:
+            continue
+        anterior = base[nombre]["ops_por_segundo"]
+        if resultado["ops_por_segundo"] < anterior * (1 - tolerancia):
+            empeorados.append(nombre)
+    return empeorados
+
+
+def _mostrar(resultados: dict, base: dict = None) -> None:
+    print(f"{'benchmark':<22}{'ops/s':>14}{'bytes pico':>12}{'bloques':>9}{'vs base':>10}")
+    for nombre, r in resultados.items():
+        cambio = ""
+        if base and nombre in base:
+            cambio = f"{r['ops_por_segundo'] / base[nombre]['ops_por_segundo'] - 1:+.1%}"
+        print(f"{nombre:<22}{r['ops_por_segundo']:>14,.0f}{r['bytes_pico']:>12,}{r['bloques_netos']:>9}{cambio:>10}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmarks de Juego_Black_Jack")
+    parser.add_argument("--guardar", nargs="?", const=RUTA_BASE, metavar="RUTA",
+                        help="guarda los resultados como línea base")
+    parser.add_argument("--comparar", nargs="?", const=RUTA_BASE, metavar="RUTA",
+                        help="compara contra una línea base")
+    parser.add_argument("--tolerancia", type=float, default=0.20,
+                        help="caída relativa de ops/s permitida al comparar (por defecto 0.20)")
+    parser.add_argument("--intentos", type=int, default=5)
+    parser.add_argument("--escala", type=float, default=1.0,
+                        help="multiplica la cantidad de operaciones de cada benchmark")
+    parser.add_argument("nombres", nargs="*", metavar="NOMBRE",
+                        help=f"benchmarks a medir: {', '.join(BENCHMARKS)} (por defecto todos)")
+    args = parser.parse_args()
+    desconocidos = [nombre for nombre in args.nombres if nombre not in BENCHMARKS]
+    if desconocidos:
+        parser.error(f"benchmarks desconocidos: {', '.join(desconocidos)}")
+    if args.comparar and not os.path.exists(args.comparar):
+        parser.error(f"no hay línea base en {args.comparar}: generala en esta máquina con --guardar")
+
+    resultados = medir_todos(args.intentos, args.escala, args.nombres)
+    base = None
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as archivo:
+            datos = json.load(archivo)
+        base = datos["resultados"]
+        if datos.get("python") != sys.version.split()[0]:
+            print(f"Aviso: la línea base se midió con Python {datos.get('python')}")
+    _mostrar(resultados, base)
+    if args.guardar:
+        with open(args.guardar, "w", encoding="utf-8") as archivo:
+            json.dump({"python": sys.version.split()[0], "resultados": resultados}, archivo, indent=2)
+        print(f"Línea base guardada en {args.guardar}")
+    if base is not None:
+        empeorados = comparar(resultados, base, args.tolerancia)
+        if empeorados:
+            print(f"Empeoraron más de {args.tolerancia:.0%}: {', '.join(empeorados)}")
+            return 1
+        print("Sin regresiones")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
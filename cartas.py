@@ -5,6 +5,12 @@ Este módulo provee una representación de cartas de póker y
 funcionalidades asociadas para manipularlas. Las cartas pueden
 estar tapadas o destapadas, y se pueden comparar entre sí.
 
+Las cartas de póker son inmutables y únicas: solo existen 104 (cada una de las
+52 cartas, destapada y tapada), así que `CartaPoker(10, 4)` siempre devuelve el
+mismo objeto y los mazos no crean cartas nuevas al sacarlas. Tapar o destapar
+una carta de póker devuelve la otra versión de la carta; quien la tiene (la
+mano o el mazo) decide cuál guarda.
+
 Clases:
     - Carta:
     - CartaPoker: Representa una carta de póker con un número y un palo.
@@ -19,11 +25,13 @@ Uso típico:
 Véase la documentación de `CartaPoker` para más detalles.
 """
 
-from txtcolores import strclr
+from txtcolores import strclr, colores_activos
 import random
 from abc import ABC, abstractmethod
 
 class Carta(ABC):
+    __slots__ = ("__numero", "__palo", "__tapada")
+
     def __init__(self, numero: int, palo: int, tapada: bool = False) -> None:
         """
         Inicializa una carta con un número, palo y si está tapada.
@@ -122,6 +130,14 @@ class Carta(ABC):
 
 
 class CartaPoker(Carta):
+    """Carta de póker inmutable y única por (número, palo, tapada).
+
+    Atributos:
+        __destapada (CartaPoker): La versión destapada de esta carta (ella misma si está destapada).
+        __contraria (CartaPoker): La versión con la otra cara hacia arriba.
+    """
+
+    __slots__ = ("__destapada", "__contraria")
 
     # Constantes de clase
     CORAZON = "♥"
@@ -134,6 +150,107 @@ class CartaPoker(Carta):
     PALOS = (FONDO,CORAZON,DIAMANTE,TREBOL,PICA)
     NUMEROS = (FONDO, "A", "2", "3", "4", "5", "6",
                "7", "8", "9", "10", "J", "Q", "K")
+
+    # Dibujo de cada (numero, palo, tapada, colores activos), se llena la primera vez que se usa
+    __dibujos: dict = {}
+    # Las 104 cartas, por (numero, palo, tapada); se crean al importar el módulo
+    __registro: dict = {}
+    # Las 52 cartas destapadas, por código (numero - 1) * 4 + palo - 1
+    __por_codigo: tuple = ()
+
+    def __new__(cls, numero: int, palo: int, tapada: bool = False) -> "CartaPoker":
+        """
+        Retorna la carta indicada, sin crear un objeto nuevo.
+
+        Raises:
+            ValueError: Si el número o palo no es válido.
+        """
+        try:
+            return CartaPoker.__registro[(numero, palo, bool(tapada))]
+        except (KeyError, TypeError):
+            raise ValueError("Número o palo no válido") from None
+
+    def __init__(self, numero: int, palo: int, tapada: bool = False) -> None:
+        """Las cartas ya existen (ver `__new__`), no hay nada que inicializar."""
+
+    @classmethod
+    def _crear_todas(cls) -> None:
+        """Crea las 104 cartas únicas. Se llama una sola vez, al importar el módulo."""
+        por_codigo = []
+        for numero in range(1, 14):
+            for palo in range(1, 5):
+                destapada = object.__new__(cls)
+                tapada = object.__new__(cls)
+                Carta.__init__(destapada, numero, palo, False)
+                Carta.__init__(tapada, numero, palo, True)
+                destapada.__destapada = tapada.__destapada = destapada
+                destapada.__contraria, tapada.__contraria = tapada, destapada
+                cls.__registro[(numero, palo, False)] = destapada
+                cls.__registro[(numero, palo, True)] = tapada
+                por_codigo.append(destapada)
+        cls.__por_codigo = tuple(por_codigo)
+
+    @classmethod
+    def de_codigo(cls, codigo: int, tapada: bool = False) -> "CartaPoker":
+        """Retorna la carta con el código (numero - 1) * 4 + palo - 1 (ver MazoBlackJack.codificar)."""
+        carta = cls.__por_codigo[codigo]
+        return carta.__contraria if tapada else carta
+
+    def tapar(self) -> "CartaPoker":
+        """Retorna la versión tapada de la carta (la carta no cambia)."""
+        return self.__destapada.__contraria
+
+    def destapar(self) -> "CartaPoker":
+        """Retorna la versión destapada de la carta (la carta no cambia)."""
+        return self.__destapada
+
+    def darvuelta(self) -> "CartaPoker":
+        """Retorna la carta con la otra cara hacia arriba (la carta no cambia)."""
+        return self.__contraria
+
+    def __eq__(self, other: object) -> bool:
+        """Dos cartas de póker son iguales si tienen el mismo número y palo, estén tapadas o no."""
+        return isinstance(other, CartaPoker) and self.__destapada is other.__destapada
+
+    def __ne__(self, other: object) -> bool:
+        return not self.__eq__(other)
+
+    def __hash__(self) -> int:
+        return id(self.__destapada)
+
+    def __copy__(self) -> "CartaPoker":
+        return self
+
+    def __deepcopy__(self, memo: dict) -> "CartaPoker":
+        return self
+
+    def __reduce__(self):
+        return CartaPoker, (self.numero, self.palo, self.istapada)
+
+    @classmethod
+    def precalcular_dibujos(cls) -> None:
+        """Calcula el dibujo de las 52 cartas, tapadas y destapadas, para el modo de color actual."""
+        activos = colores_activos()
+        for numero in range(1, 14):
+            for palo in range(1, 5):
+                for tapada in (False, True):
+                    cls.__dibujos[(numero, palo, tapada, activos)] = Carta.__str__(cls(numero, palo, tapada))
+
+    def __str__(self) -> str:
+        """
+        Retorna la representación en cadena de la carta.
+
+        Los dibujos se calculan una sola vez por modo de color y después se reutilizan.
+
+        Returns:
+            str: Representación en cadena de la carta.
+        """
+        clave = (self.numero, self.palo, self.istapada, colores_activos())
+        try:
+            return CartaPoker.__dibujos[clave]
+        except KeyError:
+            CartaPoker.precalcular_dibujos()
+            return CartaPoker.__dibujos[clave]
     
     def isroja(self) -> bool:
         """Retorna True si la carta es roja."""
@@ -184,6 +301,10 @@ class CartaEspaniola(Carta):
     def __init__(self, numero: int, palo: int, tapada: bool = False) -> None:
         super().__init__(numero, palo, tapada)
 
+
+CartaPoker._crear_todas()
+
+
 def test_cartas():
     print("Se esta ejecutando el test de la clase CartaPoker")
     carta1 = CartaPoker(10, 4)  # 10 de picas
@@ -0,0 +1,298 @@
+"""
+conteo.py - Conteo de cartas (Hi-Lo, KO y Omega II) para bots y simulaciones.
+
+Un `Contador` observa un `MazoBlackJack` y actualiza la cuenta en O(1) con cada
+carta que sale o vuelve al mazo, sin recorrer nunca la bandeja de descarte. Solo
+cuando el mazo cambia en bloque (se llena, se baraja o se recogen los
+descartes) recalcula la cuenta a partir de las cartas que quedan.
+
+La carta tapada del croupier se cuenta recién cuando se da vuelta (ver
+`MazoBlackJack.sacar_carta_tapada`); si el mazo se recalcula mientras está
+tapada, se cuenta como una carta que todavía no salió.
+
+Clases:
+    - SistemaConteo: Valor que un sistema le asigna a cada carta.
+    - Contador: Cuenta corriente y cuenta verdadera de un mazo.
+    - ApuestaPorConteo: Política de apuesta que sube la apuesta con la cuenta.
+    - EstrategiaConDesvios: Estrategia básica que se aparta de la tabla según la cuenta.
+
+Constantes:
+    - HI_LO, KO, OMEGA_II: Los sistemas de conteo disponibles.
+    - DESVIOS: Desvíos de pedir/plantarse de la estrategia básica para Hi-Lo.
+    - INDICE_SEGURO: Cuenta verdadera desde la cual conviene tomar seguro con Hi-Lo.
+
+Uso típico:
+
+    juego = BlackJack(interactivo=False, barajado=CartaDeCorte(0.75))
+    contador = Contador(HI_LO, juego.mazo)
+    juego.agregar_jugador(Bot("Contador", 1000, EstrategiaConDesvios(contador),
+                              ApuestaPorConteo(contador, maximo=8)))
+"""
+
+import math
+from dataclasses import dataclass
+from cartas import CartaPoker
+from estrategia import EstrategiaBasica, valor_carta, PEDIR, PLANTARSE
+from mazos import MazoBlackJack, ObservadorMazo
+from politicas import PoliticaApuesta, PoliticaEstrategiaBasica
+from reglas import ReglasMesa
+
+
+@dataclass(frozen=True, slots=True)
+class SistemaConteo:
+    """Un sistema de conteo de cartas.
+
+    Atributos:
+        nombre (str): El nombre del sistema.
+        valores (tuple[int, ...]): Lo que suma cada carta, por valor (índice 0 = as, 9 = diez o figura).
+        pivote (int): La cuenta al terminar el mazo en un sistema desbalanceado; 0 si es balanceado.
+    """
+    nombre: str
+    valores: tuple
+    pivote: int = 0
+
+    @property
+    def balanceado(self) -> bool:
+        """Retorna True si un mazo completo suma 0."""
+        return self.suma_por_mazo == 0
+
+    @property
+    def suma_por_mazo(self) -> int:
+        """Retorna lo que suman las 52 cartas de un mazo."""
+        return 4 * sum(self.valores[:9]) + 16 * self.valores[9]
+
+    def cuenta_inicial(self, mazos: int) -> int:
+        """Retorna la cuenta con el mazo recién barajado.
+
+        En los sistemas desbalanceados se empieza de manera que la cuenta llegue al
+        pivote al terminar el mazo (para KO, 4 - 4 * mazos).
+        """
+        return self.pivote - self.suma_por_mazo * mazos
+
+    def valor_codigo(self, codigo: int) -> int:
+        """Retorna lo que suma la carta de ese código (0..51)."""
+        return self.valores[valor_carta(codigo // 4 + 1) - 1]
+
+
+HI_LO = SistemaConteo("Hi-Lo", (-1, 1, 1, 1, 1, 1, 0, 0, 0, -1))
+KO = SistemaConteo("KO", (-1, 1, 1, 1, 1, 1, 1, 0, 0, -1), pivote=4)
+OMEGA_II = SistemaConteo("Omega II", (0, 1, 1, 2, 2, 2, 1, 0, -1, -2))
+
+# (total duro, carta visible) -> cuenta verdadera desde la cual plantarse (Hi-Lo, 6 mazos)
+DESVIOS = {
+    (16, 10): 0,
+    (15, 10): 4,
+    (16, 9): 5,
+    (13, 2): -1,
+    (13, 3): -2,
+    (12, 2): 3,
+    (12, 3): 2,
+    (12, 4): 0,
+    (12, 5): -2,
+    (12, 6): -1,
+}
+
+INDICE_SEGURO = 3
+
+
+class Contador(ObservadorMazo):
+    """Lleva la cuenta de un sistema sobre un mazo.
+
+    Atributos:
+        __sistema (SistemaConteo): El sistema de conteo.
+        __valores (tuple[int, ...]): Lo que suma cada código de carta (0..51).
+        __cuenta (int): La cuenta corriente.
+        __mazo (MazoBlackJack): El mazo observado.
+    """
+
+    def __init__(self, sistema: SistemaConteo = HI_LO, mazo: MazoBlackJack = None) -> None:
+        """Inicializa el contador.
+
+        Args:
+            sistema (SistemaConteo, optional): El sistema de conteo. Por defecto es HI_LO.
+            mazo (MazoBlackJack, optional): El mazo a observar. Si se indica, el contador
+                se agrega como observador del mazo.
+        """
+        self.__sistema: SistemaConteo = sistema
+        self.__valores: tuple = tuple(sistema.valor_codigo(codigo) for codigo in range(52))
+        # Para sumar los valores de muchos códigos con bytes.translate, desplazados a >= 0
+        self.__desplazamiento: int = -min(sistema.valores)
+        self.__tabla: bytes = bytes(valor + self.__desplazamiento for valor in self.__valores) + bytes(204)
+        self.__cuenta: int = 0
+        self.__mazo: MazoBlackJack = None
+        if mazo is not None:
+            mazo.agregar_observador(self)
+
+    @property
+    def sistema(self) -> SistemaConteo:
+        """Retorna el sistema de conteo."""
+        return self.__sistema
+
+    @property
+    def cuenta(self) -> int:
+        """Retorna la cuenta corriente."""
+        return self.__cuenta
+
+    @property
+    def mazos_restantes(self) -> float:
+        """Retorna la cantidad de mazos de 52 cartas que quedan por salir."""
+        return len(self.__mazo) / 52 if self.__mazo is not None else 0.0
+
+    @property
+    def cuenta_verdadera(self) -> float:
+        """Retorna la cuenta corriente dividida por los mazos que quedan.
+
+        En los sistemas desbalanceados (KO) se usa directamente la cuenta corriente,
+        así que no tiene sentido dividirla.
+        """
+        if not self.__sistema.balanceado:
+            return float(self.__cuenta)
+        restantes = self.mazos_restantes
+        return self.__cuenta / restantes if restantes > 0 else float(self.__cuenta)
+
+    def al_sacar(self, codigo: int) -> None:
+        self.__cuenta += self.__valores[codigo]
+
+    def al_devolver(self, codigo: int) -> None:
+        self.__cuenta -= self.__valores[codigo]
+
+    def al_reiniciar(self, mazo: MazoBlackJack) -> None:
+        self.__mazo = mazo
+        # Las cartas tapadas ya salieron del mazo pero todavía no se vieron
+        codigos = mazo.codigos + mazo.tapadas
+        restantes = sum(codigos.translate(self.__tabla)) - self.__desplazamiento * len(codigos)
+        sistema = self.__sistema
+        self.__cuenta = sistema.cuenta_inicial(mazo.mazos) + sistema.suma_por_mazo * mazo.mazos - restantes
+
+    def __str__(self) -> str:
+        return f"{self.__sistema.nombre}: {self.__cuenta} (verdadera {self.cuenta_verdadera:.2f})"
+
+
+class ApuestaPorConteo(PoliticaApuesta):
+    """Apuesta una unidad por cada punto de cuenta por encima del umbral.
+
+    Con la cuenta por debajo del umbral apuesta una unidad; a partir del umbral
+    apuesta (cuenta - umbral + 2) unidades, hasta `maximo` unidades.
+
+    Atributos:
+        contador (Contador): El contador que se consulta.
+        unidad (int): Fichas por unidad de apuesta.
+        maximo (int): Máximo de unidades.
+        umbral (float): Cuenta desde la cual se sube la apuesta.
+        verdadera (bool): Si se usa la cuenta verdadera (True) o la corriente (False).
+    """
+
+    def __init__(self, contador: Contador, unidad: int = 1, maximo: int = 8,
+                 umbral: float = 2, verdadera: bool = None) -> None:
+        """Inicializa la política.
+
+        Args:
+            contador (Contador): El contador que se consulta.
+            unidad (int, optional): Fichas por unidad de apuesta. Por defecto es 1.
+            maximo (int, optional): Máximo de unidades. Por defecto es 8.
+            umbral (float, optional): Cuenta desde la cual se sube la apuesta. Por defecto es 2.
+            verdadera (bool, optional): Si se usa la cuenta verdadera. Por defecto sí en los
+                sistemas balanceados y no en los desbalanceados.
+
+        Raises:
+            ValueError: Si la unidad o el máximo no son positivos.
+        """
+        if unidad < 1 or maximo < 1:
+            raise ValueError("La unidad y el máximo de unidades deben ser positivos")
+        self.__contador: Contador = contador
+        self.__unidad: int = unidad
+        self.__maximo: int = maximo
+        self.__umbral: float = umbral
+        self.__verdadera: bool = contador.sistema.balanceado if verdadera is None else verdadera
+
+    def apuesto(self, jugador) -> int:
+        cuenta = self.__contador.cuenta_verdadera if self.__verdadera else self.__contador.cuenta
+        if cuenta < self.__umbral:
+            unidades = 1
+        else:
+            unidades = min(self.__maximo, math.floor(cuenta - self.__umbral) + 2)
+        return max(1, min(unidades * self.__unidad, jugador.fichas))
+
+
+class EstrategiaConDesvios(PoliticaEstrategiaBasica):
+    """Estrategia básica que se planta o pide según la cuenta verdadera en las jugadas de DESVIOS.
+
+    Los desvíos solo cambian la jugada cuando la tabla indica pedir o plantarse; también
+    toma seguro a partir de INDICE_SEGURO.
+    """
+
+    def __init__(self, contador: Contador, reglas: ReglasMesa = None,
+                 estrategia: EstrategiaBasica = None, desvios: dict = None) -> None:
+        """Inicializa la política.
+
+        Args:
+            contador (Contador): El contador que se consulta.
+            reglas (ReglasMesa, optional): Las reglas de la mesa. Por defecto REGLAS_CLASICAS, las
+                mismas que usa BlackJack.
+            estrategia (EstrategiaBasica, optional): Una tabla ya calculada.
+            desvios (dict, optional): (total duro, carta visible) -> cuenta verdadera desde la
+                cual plantarse. Por defecto DESVIOS.
+        """
+        super().__init__(reglas, estrategia)
+        self.__contador: Contador = contador
+        self.__desvios: dict = DESVIOS if desvios is None else desvios
+
+    def me_planto(self, jugador, carta_croupier: CartaPoker = None) -> bool:
+        if not jugador.isblanda():
+            indice = self.__desvios.get((jugador.sumar_cartas(), valor_carta(carta_croupier.numero)))
+            if indice is not None:
+                return self.__contador.cuenta_verdadera >= indice
+        return super().me_planto(jugador, carta_croupier)
+
+    def decidir(self, jugador, carta_croupier: CartaPoker = None, opciones: int = 0) -> str:
+        accion = super().decidir(jugador, carta_croupier, opciones)
+        if (accion == PEDIR or accion == PLANTARSE) and not jugador.isblanda():
+            indice = self.__desvios.get((jugador.sumar_cartas(), valor_carta(carta_croupier.numero)))
+            if indice is not None:
+                return PLANTARSE if self.__contador.cuenta_verdadera >= indice else PEDIR
+        return accion
+
+    def tomo_seguro(self, jugador, carta_croupier: CartaPoker = None) -> bool:
+        return self.__contador.cuenta_verdadera >= INDICE_SEGURO
+
+
+def test_cuenta_con_tapada():
+    print("Se esta ejecutando el test del conteo al barajar con la carta tapada afuera")
+    mazo = MazoBlackJack(mazos=1)
+    mazo.llenar()
+    contador = Contador(HI_LO, mazo)
+    # Salen todas las cartas menos la última (un rey) y van a la bandeja
+    mazo.descartar_cartas([mazo.sacar_carta() for _ in range(51)])
+    tapada = mazo.sacar_carta_tapada()
+    assert contador.cuenta == 1 and mazo.tapadas == bytes([51])
+    # El mazo se queda vacío en medio de la ronda: se recogen los descartes y se baraja
+    carta = mazo.sacar_carta()
+    mazo.mostrar(tapada)
+    valores = HI_LO.valores
+    assert contador.cuenta == valores[valor_carta(carta.numero) - 1] + valores[9]
+    assert mazo.tapadas == b""
+
+
+def test_cuenta_verdadera_desbalanceada():
+    print("Se esta ejecutando el test de la cuenta verdadera de KO")
+    mazo = MazoBlackJack(mazos=2)
+    mazo.llenar()
+    contador = Contador(KO, mazo)
+    for _ in range(20):
+        mazo.sacar_carta()
+    assert contador.cuenta_verdadera == contador.cuenta
+
+
+
+def test_reglas_por_defecto():
+    print("Se esta ejecutando el test de las reglas por defecto de la estrategia con desvíos")
+    from reglas import REGLAS_CLASICAS
+    # Sin reglas, la tabla es la de la mesa por defecto de BlackJack
+    politica = EstrategiaConDesvios(Contador(HI_LO))
+    assert politica.estrategia.reglas == REGLAS_CLASICAS.para_estrategia()
+
+
+if __name__ == '__main__':
+    test_cuenta_con_tapada()
+    test_cuenta_verdadera_desbalanceada()
+    test_reglas_por_defecto()
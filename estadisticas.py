@@ -0,0 +1,338 @@
+"""
+estadisticas.py - Estadísticas de simulaciones calculadas sobre la marcha.
+
+Todas las estadísticas se actualizan de a un resultado y ocupan memoria
+constante, sin importar cuántas rondas se jueguen: no se guardan listas de
+resultados, solo contadores, sumas y los momentos de Welford. Se pueden
+fusionar, así que cada proceso de una simulación puede acumular las suyas y
+combinarlas al final.
+
+Clases:
+    - Welford: Media y varianza en línea.
+    - Histograma: Frecuencia de cada suma final.
+    - EstadisticasJugador: Ganancias, ROI y pasadas de un jugador, mano por mano.
+    - EstadisticasMesa: Todo lo anterior para una mesa, alimentada con ResultadoRonda.
+
+Funciones:
+    - acumular: Generador que deja pasar las rondas mientras las agrega a unas estadísticas.
+
+Uso típico:
+
+    estadisticas = EstadisticasMesa()
+    for ronda in acumular(juego.rondas(10 ** 8), estadisticas):
+        ...
+    print(estadisticas)
+
+o, si no hace falta hacer nada más con cada ronda:
+
+    estadisticas = EstadisticasMesa().consumir(juego.rondas(10 ** 8))
+"""
+
+import math
+from resultados import ResultadoJugador, ResultadoRonda
+
+MAXIMA_SUMA = 31  # La mayor suma posible: 21 más una carta de 10 sobre 20 ya es 30
+VALORES_VISIBLES = 11  # Índices 1 a 10 para la carta visible del croupier; 0 si no se conoce
+
+
+class Welford:
+    """Media y varianza calculadas en línea con el algoritmo de Welford.
+
+    Atributos:
+        __cantidad (int): Cantidad de valores agregados.
+        __media (float): Media de los valores agregados.
+        __m2 (float): Suma de los cuadrados de las diferencias con la media.
+    """
+
+    __slots__ = ("__cantidad", "__media", "__m2")
+
+    def __init__(self) -> None:
+        self.__cantidad: int = 0
+        self.__media: float = 0.0
+        self.__m2: float = 0.0
+
+    @property
+    def cantidad(self) -> int:
+        """Retorna la cantidad de valores agregados."""
+        return self.__cantidad
+
+    @property
+    def media(self) -> float:
+        """Retorna la media de los valores agregados."""
+        return self.__media
+
+    @property
+    def varianza(self) -> float:
+        """Retorna la varianza muestral, o 0 si hay menos de dos valores."""
+        return self.__m2 / (self.__cantidad - 1) if self.__cantidad > 1 else 0.0
+
+    @property
+    def desviacion(self) -> float:
+        """Retorna la desviación estándar muestral."""
+        return math.sqrt(self.varianza)
+
+    @property
+    def error_estandar(self) -> float:
+        """Retorna el error estándar de la media."""
+        return self.desviacion / math.sqrt(self.__cantidad) if self.__cantidad else 0.0
+
+    def agregar(self, valor: float) -> None:
+        """Agrega un valor."""
+        self.__cantidad += 1
+        delta = valor - self.__media
+        self.__media += delta / self.__cantidad
+        self.__m2 += delta * (valor - self.__media)
+
+    def fusionar(self, otro: "Welford") -> None:
+        """Combina los valores de otro acumulador con los de este (Chan et al.)."""
+        if not otro.__cantidad:
+            return
+        cantidad = self.__cantidad + otro.__cantidad
+        delta = otro.__media - self.__media
+        self.__m2 += otro.__m2 + delta * delta * self.__cantidad * otro.__cantidad / cantidad
+        self.__media += delta * otro.__cantidad / cantidad
+        self.__cantidad = cantidad
+
+    def __str__(self) -> str:
+        return f"{self.__media:.4f} ± {self.error_estandar:.4f} (n={self.__cantidad})"
+
+
+class Histograma:
+    """Frecuencia de cada suma final, de 0 a MAXIMA_SUMA.
+
+    Atributos:
+        __frecuencias (list[int]): Cantidad de veces que salió cada suma.
+    """
+
+    __slots__ = ("__frecuencias",)
+
+    def __init__(self) -> None:
+        self.__frecuencias: list[int] = [0] * (MAXIMA_SUMA + 1)
+
+    @property
+    def frecuencias(self) -> tuple[int, ...]:
+        """Retorna la cantidad de veces que salió cada suma, indexada por suma."""
+        return tuple(self.__frecuencias)
+
+    @property
+    def total(self) -> int:
+        """Retorna la cantidad de sumas agregadas."""
+        return sum(self.__frecuencias)
+
+    def agregar(self, suma: int) -> None:
+        """Agrega una suma final."""
+        self.__frecuencias[min(suma, MAXIMA_SUMA)] += 1
+
+    def proporcion(self, suma: int) -> float:
+        """Retorna la fracción de las manos que terminaron con la suma indicada."""
+        total = self.total
+        return self.__frecuencias[suma] / total if total else 0.0
+
+    def pasadas(self) -> int:
+        """Retorna la cantidad de manos que se pasaron de 21."""
+        return sum(self.__frecuencias[22:])
+
+    def fusionar(self, otro: "Histograma") -> None:
+        """Suma las frecuencias de otro histograma a este."""
+        for suma, cantidad in enumerate(otro.__frecuencias):
+            self.__frecuencias[suma] += cantidad
+
+    def __str__(self) -> str:
+        return " ".join(f"{suma}:{cantidad}" for suma, cantidad in enumerate(self.__frecuencias) if cantidad)
+
+
+class EstadisticasJugador:
+    """Estadísticas de un jugador a lo largo de muchas rondas.
+
+    Las ganancias se cuentan por ronda, porque el pago de las manos divididas y del
+    seguro se informa junto; las sumas y las pasadas, por cada mano que jugó.
+
+    Atributos:
+        ganancias (Welford): Ganancia por ronda.
+        sumas (Histograma): Suma final de cada mano.
+        apostado (int): Total de fichas apostadas, con dobladas, divisiones y seguro.
+        neto (int): Ganancia neta.
+        ganadas, perdidas, empates (int): Cantidad de rondas de cada resultado.
+        pasadas_por_carta (list[int]): Manos en que el jugador se pasó, por carta visible del croupier.
+        manos_por_carta (list[int]): Manos jugadas, por carta visible del croupier.
+    """
+
+    __slots__ = ("ganancias", "sumas", "apostado", "neto", "ganadas", "perdidas", "empates",
+                 "pasadas_por_carta", "manos_por_carta")
+
+    def __init__(self) -> None:
+        self.ganancias: Welford = Welford()
+        self.sumas: Histograma = Histograma()
+        self.apostado: int = 0
+        self.neto: int = 0
+        self.ganadas: int = 0
+        self.perdidas: int = 0
+        self.empates: int = 0
+        self.pasadas_por_carta: list[int] = [0] * VALORES_VISIBLES
+        self.manos_por_carta: list[int] = [0] * VALORES_VISIBLES
+
+    @property
+    def rondas(self) -> int:
+        """Retorna la cantidad de rondas jugadas."""
+        return self.ganancias.cantidad
+
+    @property
+    def manos(self) -> int:
+        """Retorna la cantidad de manos jugadas, contando cada mano dividida."""
+        return sum(self.manos_por_carta)
+
+    @property
+    def roi(self) -> float:
+        """Retorna el retorno sobre lo apostado (neto / apostado)."""
+        return self.neto / self.apostado if self.apostado else 0.0
+
+    def tasa_pasadas(self, carta_visible: int) -> float:
+        """Retorna la fracción de manos en que el jugador se pasó contra esa carta visible."""
+        manos = self.manos_por_carta[carta_visible]
+        return self.pasadas_por_carta[carta_visible] / manos if manos else 0.0
+
+    def agregar(self, resultado: ResultadoJugador, carta_visible: int = 0) -> None:
+        """Agrega el resultado de una ronda, con todas sus manos."""
+        self.ganancias.agregar(resultado.ganancia)
+        self.apostado += resultado.apostado
+        self.neto += resultado.ganancia
+        if resultado.ganancia > 0:
+            self.ganadas += 1
+        elif resultado.ganancia < 0:
+            self.perdidas += 1
+        else:
+            self.empates += 1
+        for suma in resultado.sumas:
+            self.sumas.agregar(suma)
+            self.manos_por_carta[carta_visible] += 1
+            if suma > 21:
+                self.pasadas_por_carta[carta_visible] += 1
+
+    def fusionar(self, otro: "EstadisticasJugador") -> None:
+        """Suma las estadísticas de otro jugador a estas."""
+        self.ganancias.fusionar(otro.ganancias)
+        self.sumas.fusionar(otro.sumas)
+        self.apostado += otro.apostado
+        self.neto += otro.neto
+        self.ganadas += otro.ganadas
+        self.perdidas += otro.perdidas
+        self.empates += otro.empates
+        for carta in range(VALORES_VISIBLES):
+            self.pasadas_por_carta[carta] += otro.pasadas_por_carta[carta]
+            self.manos_por_carta[carta] += otro.manos_por_carta[carta]
+
+    def __str__(self) -> str:
+        return (f"Rondas: {self.rondas} Manos: {self.manos} Ganancia por ronda: {self.ganancias} "
+                f"ROI: {self.roi:.4%} Pasadas: {self.sumas.pasadas()}")
+
+
+class EstadisticasMesa:
+    """Estadísticas de una mesa, alimentadas con los ResultadoRonda de `BlackJack.rondas`.
+
+    Atributos:
+        rondas (int): Rondas agregadas.
+        croupier (Histograma): Suma final del croupier.
+        pasadas_croupier (list[int]): Rondas en que el croupier se pasó, por carta visible.
+        rondas_por_carta (list[int]): Rondas, por carta visible del croupier.
+        jugadores (dict[str, EstadisticasJugador]): Estadísticas de cada jugador, por nombre.
+    """
+
+    __slots__ = ("rondas", "croupier", "pasadas_croupier", "rondas_por_carta", "jugadores")
+
+    def __init__(self) -> None:
+        self.rondas: int = 0
+        self.croupier: Histograma = Histograma()
+        self.pasadas_croupier: list[int] = [0] * VALORES_VISIBLES
+        self.rondas_por_carta: list[int] = [0] * VALORES_VISIBLES
+        self.jugadores: dict[str, EstadisticasJugador] = {}
+
+    def jugador(self, nombre: str) -> EstadisticasJugador:
+        """Retorna las estadísticas de un jugador, creándolas si todavía no existen."""
+        estadisticas = self.jugadores.get(nombre)
+        if estadisticas is None:
+            estadisticas = self.jugadores[nombre] = EstadisticasJugador()
+        return estadisticas
+
+    def total(self) -> EstadisticasJugador:
+        """Retorna las estadísticas de todos los jugadores juntos."""
+        total = EstadisticasJugador()
+        for estadisticas in self.jugadores.values():
+            total.fusionar(estadisticas)
+        return total
+
+    def tasa_pasadas_croupier(self, carta_visible: int) -> float:
+        """Retorna la fracción de rondas en que el croupier se pasó con esa carta visible."""
+        rondas = self.rondas_por_carta[carta_visible]
+        return self.pasadas_croupier[carta_visible] / rondas if rondas else 0.0
+
+    def agregar(self, ronda: ResultadoRonda) -> None:
+        """Agrega el resultado de una ronda."""
+        self.rondas += 1
+        carta = ronda.carta_visible
+        self.croupier.agregar(ronda.suma_croupier)
+        self.rondas_por_carta[carta] += 1
+        if ronda.suma_croupier > 21:
+            self.pasadas_croupier[carta] += 1
+        for resultado in ronda.jugadores:
+            self.jugador(resultado.nombre).agregar(resultado, carta)
+
+    def consumir(self, rondas) -> "EstadisticasMesa":
+        """Agrega todas las rondas de un iterable (por ejemplo `BlackJack.rondas()`).
+
+        Returns:
+            EstadisticasMesa: Estas mismas estadísticas, para encadenar.
+        """
+        for ronda in rondas:
+            self.agregar(ronda)
+        return self
+
+    def fusionar(self, otra: "EstadisticasMesa") -> None:
+        """Suma las estadísticas de otra mesa a estas; los jugadores se combinan por nombre."""
+        self.rondas += otra.rondas
+        self.croupier.fusionar(otra.croupier)
+        for carta in range(VALORES_VISIBLES):
+            self.pasadas_croupier[carta] += otra.pasadas_croupier[carta]
+            self.rondas_por_carta[carta] += otra.rondas_por_carta[carta]
+        for nombre, estadisticas in otra.jugadores.items():
+            self.jugador(nombre).fusionar(estadisticas)
+
+    def __str__(self) -> str:
+        lineas = [f"Rondas: {self.rondas}"]
+        lineas.extend(f"{nombre}: {estadisticas}" for nombre, estadisticas in self.jugadores.items())
+        lineas.append("Croupier se pasa: " + " ".join(
+            f"{carta}:{self.tasa_pasadas_croupier(carta):.3f}"
+            for carta in range(1, VALORES_VISIBLES) if self.rondas_por_carta[carta]))
+        return "\n".join(lineas)
+
+
+def acumular(rondas, estadisticas: EstadisticasMesa):
+    """Deja pasar las rondas de un iterable, agregándolas a unas estadísticas.
+
+    Sirve para armar cadenas de generadores sin guardar los resultados.
+
+    Args:
+        rondas: Iterable de ResultadoRonda.
+        estadisticas (EstadisticasMesa): Donde se acumulan.
+
+    Yields:
+        ResultadoRonda: Cada ronda, sin cambios.
+    """
+    for ronda in rondas:
+        estadisticas.agregar(ronda)
+        yield ronda
+
+
+def test_estadisticas_por_mano():
+    print("Se esta ejecutando el test de las estadísticas con manos divididas")
+    estadisticas = EstadisticasJugador()
+    # Divide y dobla una de las manos: arriesga 30 con una apuesta inicial de 10, y se pasa con la otra
+    estadisticas.agregar(ResultadoJugador("Bot", 10, 30, (20, 24), 10, 110), carta_visible=6)
+    estadisticas.agregar(ResultadoJugador("Bot", 10, 10, (23,), -10, 100), carta_visible=6)
+    assert estadisticas.rondas == 2 and estadisticas.manos == 3
+    assert estadisticas.apostado == 40 and estadisticas.roi == 0.0
+    assert estadisticas.sumas.pasadas() == 2
+    assert estadisticas.tasa_pasadas(6) == 2 / 3
+
+
+if __name__ == '__main__':
+    test_estadisticas_por_mano()
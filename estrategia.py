@@ -0,0 +1,415 @@
+"""
+estrategia.py - Tabla de estrategia básica de BlackJack.
+
+Calcula, para unas reglas dadas, la mejor jugada (pedir, plantarse, doblar o
+dividir) de cada mano inicial contra cada carta visible del croupier. Las
+probabilidades de cada carta salen de la composición del mazo de la mesa sin la
+carta visible del croupier. Si las reglas dicen que el croupier revisa si tiene
+Black Jack antes de que jueguen los jugadores, la tabla supone que no lo tiene; si
+no revisa, su Black Jack se cuenta como cualquier otro 21 (como en una mesa sin
+naturales, por ejemplo REGLAS_CLASICAS).
+
+La tabla se calcula una sola vez por juego de reglas: queda en memoria y se
+guarda en disco, de manera que las consultas posteriores son una búsqueda en
+un diccionario.
+
+Acciones:
+    - PEDIR ("H"), PLANTARSE ("S"), DIVIDIR ("P"), RENDIRSE ("R")
+    - DOBLAR_O_PEDIR ("Dh"): dobla si puede, si no pide.
+    - DOBLAR_O_PLANTARSE ("Ds"): dobla si puede, si no se planta.
+
+Uso típico:
+
+    estrategia = obtener_estrategia(ReglasMesa(mazos=6))
+    estrategia.decidir(16, False, 10)  # "H"
+"""
+
+import json
+import os
+from functools import lru_cache
+from reglas import ReglasMesa, CLAVES_ESTRATEGIA
+
+PEDIR = "H"
+PLANTARSE = "S"
+DOBLAR = "D"
+DIVIDIR = "P"
+RENDIRSE = "R"
+DOBLAR_O_PEDIR = "Dh"
+DOBLAR_O_PLANTARSE = "Ds"
+
+# Valores de carta: 1 es el as y 10 agrupa al 10 y las figuras
+VALORES = range(1, 11)
+# Lo que se pierde al rendirse, por ficha apostada
+EV_RENDIRSE = -0.5
+# Posiciones del vector de resultados del croupier: 17, 18, 19, 20, 21 y pasado
+FINALES = (17, 18, 19, 20, 21)
+PASADO = 5
+
+DIRECTORIO_CACHE = os.path.join(os.path.expanduser("~"), ".cache", "juego_black_jack")
+
+
+def valor_carta(numero: int) -> int:
+    """Retorna el valor de una carta de póker para BlackJack (as = 1, figuras = 10)."""
+    return 10 if numero >= 10 else numero
+
+
+def sumar(total: int, blanda: bool, valor: int) -> tuple[int, bool]:
+    """Agrega una carta a una mano representada por su total y si es blanda.
+
+    Args:
+        total (int): El mejor total de la mano.
+        blanda (bool): Si la mano cuenta un as como 11.
+        valor (int): El valor de la carta (1 a 10).
+
+    Returns:
+        tuple[int, bool]: El nuevo total y si la mano sigue siendo blanda.
+    """
+    if valor == 1 and total + 11 <= 21:
+        return total + 11, True
+    total += valor
+    if total > 21 and blanda:
+        return total - 10, False
+    return total, blanda
+
+
+def probabilidades(mazos: int, carta_visible: int) -> tuple[float, ...]:
+    """Probabilidad de cada valor de carta en un mazo completo sin la carta visible del croupier.
+
+    Returns:
+        tuple[float, ...]: Once posiciones; la posición 0 no se usa.
+    """
+    cantidades = [0] + [4 * mazos] * 9 + [16 * mazos]
+    cantidades[carta_visible] -= 1
+    total = sum(cantidades)
+    return tuple(cantidad / total for cantidad in cantidades)
+
+
+def distribucion_croupier(prob: tuple[float, ...], carta_visible: int,
+                          pide_17_blando: bool, revisa: bool = True) -> tuple[float, ...]:
+    """Distribución del total final del croupier.
+
+    Args:
+        prob (tuple[float, ...]): Probabilidad de cada valor de carta.
+        carta_visible (int): El valor de la carta visible del croupier.
+        pide_17_blando (bool): Si el croupier pide carta con 17 blando.
+        revisa (bool, optional): Si el croupier ya revisó que no tiene Black Jack. Por defecto es True.
+
+    Returns:
+        tuple[float, ...]: Probabilidades de terminar en 17, 18, 19, 20, 21 y de pasarse.
+    """
+    memo = {}
+
+    def final(total: int, blanda: bool) -> list[float]:
+        clave = (total, blanda)
+        if clave in memo:
+            return memo[clave]
+        resultado = [0.0] * 6
+        if total > 21:
+            resultado[PASADO] = 1.0
+        elif total >= 17 and not (pide_17_blando and total == 17 and blanda):
+            resultado[total - 17] = 1.0
+        else:
+            for valor in VALORES:
+                siguiente = final(*sumar(total, blanda, valor))
+                for i in range(6):
+                    resultado[i] += prob[valor] * siguiente[i]
+        memo[clave] = resultado
+        return resultado
+
+    total, blanda = sumar(0, False, carta_visible)
+    # Si el croupier ya revisó, la carta tapada no puede completar un Black Jack
+    prohibida = None
+    if revisa:
+        prohibida = 10 if carta_visible == 1 else 1 if carta_visible == 10 else None
+    normal = 1.0 - (prob[prohibida] if prohibida else 0.0)
+    resultado = [0.0] * 6
+    for valor in VALORES:
+        if valor == prohibida:
+            continue
+        siguiente = final(*sumar(total, blanda, valor))
+        for i in range(6):
+            resultado[i] += prob[valor] / normal * siguiente[i]
+    return tuple(resultado)
+
+
+def ev_plantarse(total: int, croupier: tuple[float, ...]) -> float:
+    """Valor esperado de plantarse con un total contra la distribución del croupier."""
+    if total > 21:
+        return -1.0
+    ev = croupier[PASADO]
+    for i, final in enumerate(FINALES):
+        if total > final:
+            ev += croupier[i]
+        elif total < final:
+            ev -= croupier[i]
+    return ev
+
+
+class _Calculo:
+    """Valores esperados de una carta visible del croupier, con memoria de los estados ya calculados."""
+
+    def __init__(self, prob: tuple[float, ...], croupier: tuple[float, ...]) -> None:
+        self.prob = prob
+        self.croupier = croupier
+        self.__optimo = {}
+
+    def plantarse(self, total: int) -> float:
+        return ev_plantarse(total, self.croupier)
+
+    def pedir(self, total: int, blanda: bool) -> float:
+        ev = 0.0
+        for valor in VALORES:
+            nuevo, nueva_blanda = sumar(total, blanda, valor)
+            ev += self.prob[valor] * (-1.0 if nuevo > 21 else self.optimo(nuevo, nueva_blanda))
+        return ev
+
+    def optimo(self, total: int, blanda: bool) -> float:
+        """Mejor valor esperado entre plantarse y pedir, sin doblar."""
+        clave = (total, blanda)
+        if clave not in self.__optimo:
+            if total >= 21:
+                self.__optimo[clave] = self.plantarse(total)
+            else:
+                self.__optimo[clave] = max(self.plantarse(total), self.pedir(total, blanda))
+        return self.__optimo[clave]
+
+    def doblar(self, total: int, blanda: bool) -> float:
+        ev = 0.0
+        for valor in VALORES:
+            ev += self.prob[valor] * self.plantarse(sumar(total, blanda, valor)[0])
+        return 2.0 * ev
+
+    def dividir(self, valor: int, puede_doblar: bool) -> float:
+        """Valor esperado de dividir un par, sin volver a dividir."""
+        total, blanda = sumar(0, False, valor)
+        ev = 0.0
+        for segunda in VALORES:
+            nuevo, nueva_blanda = sumar(total, blanda, segunda)
+            if valor == 1:  # Los ases divididos reciben una sola carta
+                mano = self.plantarse(nuevo)
+            else:
+                mano = self.optimo(nuevo, nueva_blanda)
+                if puede_doblar and nuevo < 21:
+                    mano = max(mano, self.doblar(nuevo, nueva_blanda))
+            ev += self.prob[segunda] * mano
+        return 2.0 * ev
+
+
+class EstrategiaBasica:
+    """Tabla de estrategia básica para unas reglas dadas.
+
+    Atributos:
+        __reglas (ReglasMesa): Las reglas para las que se calculó la tabla.
+        __tabla (dict): Acción por (total, blanda, carta visible del croupier).
+        __pares (set): Pares (valor, carta visible del croupier) que conviene dividir.
+        __rendiciones (set): Manos (total, blanda, carta visible del croupier) en las que
+            conviene rendirse si la mesa lo permite.
+    """
+
+    def __init__(self, reglas: ReglasMesa, tabla: dict, pares: set, rendiciones: set = frozenset()) -> None:
+        """Inicializa la estrategia a partir de una tabla ya calculada.
+
+        Usar `calcular` u `obtener_estrategia` para construirla.
+        """
+        self.__reglas: ReglasMesa = reglas
+        self.__tabla: dict = tabla
+        self.__pares: set = pares
+        self.__rendiciones: set = rendiciones
+
+    @property
+    def reglas(self) -> ReglasMesa:
+        """Retorna las reglas para las que se calculó la tabla."""
+        return self.__reglas
+
+    @classmethod
+    def calcular(cls, reglas: ReglasMesa) -> "EstrategiaBasica":
+        """Calcula la tabla completa para unas reglas.
+
+        Args:
+            reglas (ReglasMesa): Las reglas de la mesa.
+
+        Returns:
+            EstrategiaBasica: La estrategia calculada.
+        """
+        tabla = {}
+        pares = set()
+        rendiciones = set()
+        for carta_visible in VALORES:
+            prob = probabilidades(reglas.mazos, carta_visible)
+            croupier = distribucion_croupier(prob, carta_visible, reglas.croupier_pide_17_blando,
+                                             reglas.croupier_revisa)
+            calculo = _Calculo(prob, croupier)
+            manos = [(total, False) for total in range(4, 22)] + [(total, True) for total in range(12, 22)]
+            for total, blanda in manos:
+                plantarse = calculo.plantarse(total)
+                pedir = calculo.pedir(total, blanda) if total < 21 else -1.0
+                doblar = calculo.doblar(total, blanda) if total < 21 else -2.0
+                sin_doblar = PLANTARSE if plantarse >= pedir else PEDIR
+                if doblar > max(plantarse, pedir):
+                    accion = DOBLAR_O_PLANTARSE if sin_doblar == PLANTARSE else DOBLAR_O_PEDIR
+                else:
+                    accion = sin_doblar
+                tabla[(total, blanda, carta_visible)] = accion
+                if max(plantarse, pedir, doblar) < EV_RENDIRSE:
+                    rendiciones.add((total, blanda, carta_visible))
+            for valor in VALORES:
+                total, blanda = sumar(*sumar(0, False, valor), valor)
+                sin_dividir = max(calculo.plantarse(total),
+                                  calculo.pedir(total, blanda) if total < 21 else -1.0,
+                                  calculo.doblar(total, blanda) if total < 21 else -2.0)
+                if calculo.dividir(valor, reglas.doblar_despues_de_dividir) > sin_dividir:
+                    pares.add((valor, carta_visible))
+        return cls(reglas, tabla, pares, rendiciones)
+
+    def decidir(self, total: int, blanda: bool, carta_visible: int, par: int = None,
+                puede_doblar: bool = True, puede_dividir: bool = True, puede_rendirse: bool = False) -> str:
+        """Retorna la jugada recomendada.
+
+        Args:
+            total (int): El total de la mano del jugador.
+            blanda (bool): Si la mano del jugador es blanda.
+            carta_visible (int): El valor de la carta visible del croupier (1 a 10).
+            par (int, optional): El valor de las cartas si la mano es un par.
+            puede_doblar (bool, optional): Si la mano todavía puede doblar.
+            puede_dividir (bool, optional): Si la mano todavía puede dividir.
+            puede_rendirse (bool, optional): Si la mano puede rendirse. Por defecto es False.
+
+        Returns:
+            str: PEDIR, PLANTARSE, DOBLAR, DIVIDIR o RENDIRSE.
+        """
+        if par is not None and puede_dividir and (par, carta_visible) in self.__pares:
+            return DIVIDIR
+        if total >= 21:
+            return PLANTARSE
+        if puede_rendirse and (total, blanda, carta_visible) in self.__rendiciones:
+            return RENDIRSE
+        accion = self.__tabla[(total, blanda, carta_visible)]
+        if accion == DOBLAR_O_PEDIR:
+            return DOBLAR if puede_doblar else PEDIR
+        if accion == DOBLAR_O_PLANTARSE:
+            return DOBLAR if puede_doblar else PLANTARSE
+        return accion
+
+    def accion(self, total: int, blanda: bool, carta_visible: int) -> str:
+        """Retorna la entrada de la tabla tal cual, incluyendo "Dh" y "Ds"."""
+        return self.__tabla[(total, blanda, carta_visible)]
+
+    def divide(self, valor: int, carta_visible: int) -> bool:
+        """Retorna True si conviene dividir el par de `valor` contra la carta visible."""
+        return (valor, carta_visible) in self.__pares
+
+    def rinde(self, total: int, blanda: bool, carta_visible: int) -> bool:
+        """Retorna True si conviene rendirse con la mano contra la carta visible."""
+        return (total, blanda, carta_visible) in self.__rendiciones
+
+    def guardar(self, ruta: str) -> None:
+        """Guarda la tabla en un archivo JSON.
+
+        Args:
+            ruta (str): La ruta del archivo.
+        """
+        datos = {
+            "reglas": self.__reglas.como_dict(),
+            "tabla": [[total, blanda, carta, accion] for (total, blanda, carta), accion in self.__tabla.items()],
+            "pares": sorted(self.__pares),
+            "rendiciones": sorted(self.__rendiciones),
+        }
+        directorio = os.path.dirname(ruta)
+        if directorio:
+            os.makedirs(directorio, exist_ok=True)
+        temporal = f"{ruta}.tmp"
+        with open(temporal, "w", encoding="utf-8") as archivo:
+            json.dump(datos, archivo)
+        os.replace(temporal, ruta)
+
+    @classmethod
+    def cargar(cls, ruta: str) -> "EstrategiaBasica":
+        """Carga una tabla guardada con `guardar`.
+
+        Args:
+            ruta (str): La ruta del archivo.
+
+        Returns:
+            EstrategiaBasica: La estrategia guardada.
+        """
+        with open(ruta, encoding="utf-8") as archivo:
+            datos = json.load(archivo)
+        tabla = {(total, blanda, carta): accion for total, blanda, carta, accion in datos["tabla"]}
+        pares = {tuple(par) for par in datos["pares"]}
+        rendiciones = {tuple(mano) for mano in datos["rendiciones"]}
+        return cls(ReglasMesa(**datos["reglas"]), tabla, pares, rendiciones)
+
+    def __str__(self) -> str:
+        """Retorna la tabla con una fila por mano y una columna por carta visible (2..10, A)."""
+        columnas = list(range(2, 11)) + [1]
+        lineas = ["      " + "".join(f"{'A' if c == 1 else c:>4}" for c in columnas)]
+        for blanda, nombre in ((False, "D"), (True, "B")):
+            for total in range(5 if not blanda else 13, 21):
+                lineas.append(f"{nombre}{total:<5}" + "".join(f"{self.__tabla[(total, blanda, c)]:>4}" for c in columnas))
+        for valor in (1,) + tuple(range(2, 11)):
+            nombre = "A" if valor == 1 else str(valor)
+            fila = "".join(f"{DIVIDIR if (valor, c) in self.__pares else '-':>4}" for c in columnas)
+            lineas.append(f"{nombre + ',' + nombre:<6}" + fila)
+        return "\n".join(lineas)
+
+
+def ruta_cache(reglas: ReglasMesa, directorio: str = DIRECTORIO_CACHE) -> str:
+    """Retorna la ruta del archivo donde se guarda la tabla de unas reglas.
+
+    El nombre solo depende de las reglas que cambian la tabla (CLAVES_ESTRATEGIA).
+    """
+    partes = "_".join(f"{clave}-{int(getattr(reglas, clave))}" for clave in CLAVES_ESTRATEGIA)
+    return os.path.join(directorio, f"estrategia_{partes}.json")
+
+
+def obtener_estrategia(reglas: ReglasMesa = ReglasMesa(),
+                       directorio: str = DIRECTORIO_CACHE) -> EstrategiaBasica:
+    """Retorna la estrategia básica de unas reglas, calculándola una sola vez.
+
+    Busca primero en memoria, después en el directorio de caché y, si no la
+    encuentra, la calcula y la guarda. Las reglas que no cambian la tabla (pagos,
+    seguro, rendición, etc.) no se tienen en cuenta, así que mesas que solo
+    difieren en eso comparten la misma tabla.
+
+    Args:
+        reglas (ReglasMesa, optional): Las reglas de la mesa. Por defecto las de ReglasMesa().
+        directorio (str, optional): Directorio de caché en disco.
+
+    Returns:
+        EstrategiaBasica: La estrategia de esas reglas.
+    """
+    return _obtener_estrategia(reglas.para_estrategia(), directorio)
+
+
+@lru_cache(maxsize=None)
+def _obtener_estrategia(reglas: ReglasMesa, directorio: str) -> EstrategiaBasica:
+    """Versión de obtener_estrategia con memoria, para reglas ya normalizadas."""
+    ruta = ruta_cache(reglas, directorio)
+    try:
+        estrategia = EstrategiaBasica.cargar(ruta)
+        if estrategia.reglas == reglas:
+            return estrategia
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    estrategia = EstrategiaBasica.calcular(reglas)
+    try:
+        estrategia.guardar(ruta)
+    except OSError:
+        pass  # Sin caché en disco igual se puede jugar
+    return estrategia
+
+
+def test_croupier_revisa():
+    print("Se esta ejecutando el test de la estrategia con y sin revisar el Black Jack")
+    con_revision = ReglasMesa(croupier_revisa=True)
+    sin_revision = ReglasMesa(croupier_revisa=False)
+    assert con_revision.para_estrategia() != sin_revision.para_estrategia()
+    assert ruta_cache(con_revision) != ruta_cache(sin_revision)
+    # Sin revisar, el croupier con un as visible termina más seguido en 21
+    prob = probabilidades(6, 1)
+    assert distribucion_croupier(prob, 1, False, False)[4] > distribucion_croupier(prob, 1, False, True)[4]
+
+
+if __name__ == '__main__':
+    test_croupier_revisa()
+    print(obtener_estrategia(ReglasMesa()))
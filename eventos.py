@@ -0,0 +1,320 @@
+"""
+eventos.py - Registro binario de los eventos de cada ronda y su reproducción.
+
+Cada evento ocupa 13 bytes fijos (ver `FORMATO`), así que el archivo se puede
+escribir agregando bytes al final y leer con mmap, saltando directamente al
+evento n sin recorrer los anteriores.
+
+Campos de cada evento:
+    - ronda (uint32): Número de ronda, empezando en 1.
+    - tipo (uint8): Uno de los tipos de evento de abajo.
+    - asiento (uint8): Posición del jugador en la mesa, o CROUPIER.
+    - mano (uint8): Posición de la mano del jugador, 0 si no dividió. Al dividir, la mano
+      nueva queda en la posición siguiente a la dividida y las que seguían se corren una;
+      los PAGO usan las posiciones finales.
+    - carta (uint8): Código de la carta (0..51, ver MazoBlackJack.codificar) o SIN_CARTA.
+    - suma (uint8): Suma de la mano después del evento (0 si no aplica). La carta tapada
+      del croupier no suma hasta que se destapa: su REPARTO lleva suma 0 y el de la
+      carta visible, el valor de esa carta sola.
+    - valor (int32): Fichas apostadas, ganadas o perdidas (0 si no aplica).
+
+Clases:
+    - Evento: Un evento leído del registro.
+    - RegistroEventos: Agrega eventos a un archivo, con buffer.
+    - LectorEventos: Lee un archivo de eventos con mmap.
+
+Uso típico:
+
+    with RegistroEventos("partida.bin") as registro:
+        juego = BlackJack(interactivo=False, registro=registro)
+        ...
+    with LectorEventos("partida.bin") as lector:
+        for evento in lector.ronda(10):
+            print(evento)
+"""
+
+import mmap
+import os
+import struct
+from typing import NamedTuple
+
+FORMATO = struct.Struct("<IBBBBBi")
+TAMANIO = FORMATO.size
+
+# Tipos de evento
+INICIO_RONDA = 1
+REPARTO = 2          # Carta inicial para un jugador o para el croupier
+APUESTA = 3
+PIDE = 4             # Carta pedida por un jugador
+CROUPIER_PIDE = 5    # Carta pedida por el croupier
+DESTAPA = 6          # El croupier destapa su carta
+PAGO = 7             # Ganancia (o pérdida) de una mano de un jugador
+RETIRO = 8           # Un jugador se queda sin fichas y se retira
+DOBLA = 9            # Un jugador dobla la apuesta de la mano que juega
+DIVIDE = 10          # Un jugador divide un par; la carta es la que pasa a la mano nueva
+SEGURO = 11          # Un jugador toma seguro
+RINDE = 12           # Un jugador se rinde
+PAGO_SEGURO = 13     # Ganancia (o pérdida) del seguro de un jugador
+
+NOMBRES = {
+    INICIO_RONDA: "INICIO_RONDA", REPARTO: "REPARTO", APUESTA: "APUESTA", PIDE: "PIDE",
+    CROUPIER_PIDE: "CROUPIER_PIDE", DESTAPA: "DESTAPA", PAGO: "PAGO", RETIRO: "RETIRO",
+    DOBLA: "DOBLA", DIVIDE: "DIVIDE", SEGURO: "SEGURO", RINDE: "RINDE", PAGO_SEGURO: "PAGO_SEGURO",
+}
+
+CROUPIER = 255
+SIN_CARTA = 255
+
+
+class Evento(NamedTuple):
+    """Un evento del registro."""
+    ronda: int
+    tipo: int
+    asiento: int
+    mano: int
+    carta: int
+    suma: int
+    valor: int
+
+    def __str__(self) -> str:
+        asiento = "croupier" if self.asiento == CROUPIER else f"asiento {self.asiento}"
+        if self.mano:
+            asiento += f" mano {self.mano}"
+        carta = "" if self.carta == SIN_CARTA else f" carta {self.carta}"
+        return (f"#{self.ronda} {NOMBRES.get(self.tipo, self.tipo)} {asiento}{carta}"
+                f" suma {self.suma} valor {self.valor}")
+
+
+class RegistroEventos:
+    """Agrega eventos al final de un archivo binario.
+
+    Los eventos se acumulan en memoria y se escriben de a bloques.
+
+    Atributos:
+        __archivo: El archivo abierto para agregar.
+        __buffer (bytearray): Eventos que todavía no se escribieron.
+        __limite (int): Tamaño del buffer a partir del cual se escribe.
+    """
+
+    def __init__(self, ruta: str, tamanio_buffer: int = 1 << 16) -> None:
+        """Abre (o crea) el archivo de eventos.
+
+        Args:
+            ruta (str): La ruta del archivo.
+            tamanio_buffer (int, optional): Bytes que se acumulan antes de escribir. Por defecto 64 KiB.
+        """
+        self.__archivo = open(ruta, "ab")
+        self.__buffer: bytearray = bytearray()
+        self.__limite: int = tamanio_buffer
+        self.__cantidad: int = 0
+
+    @property
+    def cantidad(self) -> int:
+        """Retorna la cantidad de eventos registrados desde que se abrió."""
+        return self.__cantidad
+
+    def registrar(self, ronda: int, tipo: int, asiento: int = CROUPIER, carta: int = SIN_CARTA,
+                  suma: int = 0, valor: int = 0, mano: int = 0) -> None:
+        """Agrega un evento.
+
+        Raises:
+            ValueError: Si algún campo no cabe en su tipo (ver FORMATO).
+        """
+        if not (0 <= ronda <= 0xFFFFFFFF and 0 <= tipo <= 255 and 0 <= asiento <= 255 and 0 <= mano <= 255
+                and 0 <= carta <= 255 and -0x80000000 <= valor <= 0x7FFFFFFF):
+            raise ValueError(f"El evento no cabe en el registro: ronda {ronda} tipo {tipo} "
+                             f"asiento {asiento} mano {mano} carta {carta} valor {valor}")
+        self.__buffer += FORMATO.pack(ronda, tipo, asiento, mano, carta, min(suma, 255), valor)
+        self.__cantidad += 1
+        if len(self.__buffer) >= self.__limite:
+            self.vaciar()
+
+    def vaciar(self) -> None:
+        """Escribe en el archivo los eventos acumulados."""
+        if self.__buffer:
+            self.__archivo.write(self.__buffer)
+            self.__buffer.clear()
+        self.__archivo.flush()
+
+    def cerrar(self) -> None:
+        """Escribe lo pendiente y cierra el archivo."""
+        if not self.__archivo.closed:
+            self.vaciar()
+            self.__archivo.close()
+
+    def __enter__(self) -> "RegistroEventos":
+        return self
+
+    def __exit__(self, *excepcion) -> None:
+        self.cerrar()
+
+
+class LectorEventos:
+    """Lee un archivo de eventos con mmap, sin cargarlo entero en memoria."""
+
+    def __init__(self, ruta: str) -> None:
+        """Abre el archivo de eventos.
+
+        Args:
+            ruta (str): La ruta del archivo.
+
+        Raises:
+            ValueError: Si el tamaño del archivo no es múltiplo del tamaño de un evento.
+        """
+        self.__archivo = open(ruta, "rb")
+        tamanio = os.fstat(self.__archivo.fileno()).st_size
+        if tamanio % TAMANIO:
+            self.__archivo.close()
+            raise ValueError("El archivo de eventos está incompleto o dañado")
+        self.__mapa = mmap.mmap(self.__archivo.fileno(), 0, access=mmap.ACCESS_READ) if tamanio else None
+        self.__cantidad: int = tamanio // TAMANIO
+
+    def __len__(self) -> int:
+        """Retorna la cantidad de eventos del archivo."""
+        return self.__cantidad
+
+    def __getitem__(self, indice: int) -> Evento:
+        """Retorna el evento en la posición indicada."""
+        if indice < 0:
+            indice += self.__cantidad
+        if not 0 <= indice < self.__cantidad:
+            raise IndexError("No hay un evento en esa posición")
+        return Evento._make(FORMATO.unpack_from(self.__mapa, indice * TAMANIO))
+
+    def __iter__(self):
+        """Recorre todos los eventos en orden."""
+        if self.__mapa is None:
+            return iter(())
+        return map(Evento._make, FORMATO.iter_unpack(self.__mapa))
+
+    def __buscar_ronda(self, ronda: int) -> int:
+        """Retorna la posición del primer evento con número de ronda >= `ronda` (búsqueda binaria)."""
+        desde, hasta = 0, self.__cantidad
+        while desde < hasta:
+            medio = (desde + hasta) // 2
+            if FORMATO.unpack_from(self.__mapa, medio * TAMANIO)[0] < ronda:
+                desde = medio + 1
+            else:
+                hasta = medio
+        return desde
+
+    def ronda(self, ronda: int) -> list[Evento]:
+        """Retorna los eventos de una ronda.
+
+        Requiere que el archivo tenga los eventos ordenados por ronda, como los escribe
+        una sola mesa.
+        """
+        eventos = []
+        indice = self.__buscar_ronda(ronda)
+        while indice < self.__cantidad:
+            evento = self[indice]
+            if evento.ronda != ronda:
+                break
+            eventos.append(evento)
+            indice += 1
+        return eventos
+
+    def reproducir(self):
+        """Recorre el registro ronda por ronda.
+
+        Yields:
+            tuple[int, list[Evento]]: El número de ronda y sus eventos.
+        """
+        actual = None
+        eventos = []
+        for evento in self:
+            if evento.ronda != actual:
+                if eventos:
+                    yield actual, eventos
+                actual = evento.ronda
+                eventos = []
+            eventos.append(evento)
+        if eventos:
+            yield actual, eventos
+
+    def cerrar(self) -> None:
+        """Cierra el archivo."""
+        if self.__mapa is not None:
+            self.__mapa.close()
+            self.__mapa = None
+        self.__archivo.close()
+
+    def __enter__(self) -> "LectorEventos":
+        return self
+
+    def __exit__(self, *excepcion) -> None:
+        self.cerrar()
+
+
+def test_reproducir():
+    print("Se esta ejecutando el test del registro de eventos")
+    import tempfile
+    from aleatorio import GeneradorContador
+    from cartas import CartaPoker
+    from juego_black_jack import BlackJack
+    from jugadores import Bot
+    from mazos import ManoBlackJack
+    from politicas import ApuestaFija, PoliticaEstrategiaBasica
+    from reglas import ReglasMesa
+
+    def total(codigos: list) -> int:
+        mano = ManoBlackJack()
+        for codigo in codigos:
+            mano.poner_carta(CartaPoker.de_codigo(codigo))
+        return mano.total
+
+    # Con estrategia básica y reglas que permiten dividir, algunas rondas tienen varias manos por asiento
+    reglas = ReglasMesa()
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta = os.path.join(directorio, "partida.bin")
+        with RegistroEventos(ruta) as registro:
+            juego = BlackJack(interactivo=False, registro=registro, generador=GeneradorContador(7), reglas=reglas)
+            for asiento in range(3):
+                juego.agregar_jugador(Bot(f"Bot {asiento + 1}", 1_000_000, PoliticaEstrategiaBasica(reglas),
+                                          ApuestaFija(5)))
+            rondas = list(juego.rondas(300))
+            try:
+                registro.registrar(1, PAGO, asiento=256)
+                raise AssertionError("Se registró un asiento que no cabe en un byte")
+            except ValueError:
+                pass
+        with LectorEventos(ruta) as lector:
+            reproducidas = list(lector.reproducir())
+            assert [numero for numero, _ in reproducidas] == list(range(1, 301))
+            divisiones = 0
+            for (numero, eventos), ronda in zip(reproducidas, rondas):
+                assert lector.ronda(numero) == eventos
+                # Rearma las manos de cada asiento con las cartas del registro y compara cada suma
+                manos = {asiento: [[]] for asiento in range(len(ronda.jugadores))}
+                croupier = []
+                ganancias = [0] * len(ronda.jugadores)
+                for evento in eventos:
+                    if evento.asiento == CROUPIER:
+                        if evento.tipo in (REPARTO, CROUPIER_PIDE):
+                            croupier.append(evento.carta)
+                        if evento.tipo == REPARTO:
+                            # La tapada no suma hasta que se destapa; la visible suma sola
+                            assert evento.suma == (0 if len(croupier) == 1 else total(croupier[1:])), evento
+                        elif evento.tipo in (CROUPIER_PIDE, DESTAPA):
+                            assert evento.suma == total(croupier), evento
+                        continue
+                    mano = manos[evento.asiento][evento.mano]
+                    if evento.tipo in (REPARTO, PIDE):
+                        mano.append(evento.carta)
+                    elif evento.tipo == DIVIDE:
+                        mano.remove(evento.carta)
+                        manos[evento.asiento].insert(evento.mano + 1, [evento.carta])
+                        divisiones += 1
+                    elif evento.tipo in (PAGO, PAGO_SEGURO):
+                        ganancias[evento.asiento] += evento.valor
+                    if evento.tipo in (REPARTO, PIDE, DIVIDE, DOBLA, RINDE, PAGO):
+                        assert evento.suma == total(mano), evento
+                assert total(croupier) == ronda.suma_croupier
+                for asiento, jugador in enumerate(ronda.jugadores):
+                    assert tuple(map(total, manos[asiento])) == jugador.sumas
+                    assert ganancias[asiento] == jugador.ganancia
+            assert divisiones > 0
+
+
+if __name__ == '__main__':
+    test_reproducir()
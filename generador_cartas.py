@@ -1,13 +1,34 @@
 import random
+from functools import lru_cache
 from cartas import CartaPoker
 
 
+@lru_cache(maxsize=None)
+def _candidatas(color, rango_numeros):
+    """
+    Calcula una sola vez por configuración los pares (número, palo) válidos.
+
+    Args:
+        color (str): "rojo", "negro" o None.
+        rango_numeros (tuple): Rango de números (desde, hasta) o None.
+
+    Returns:
+        tuple: Los pares (número, palo) que cumplen con los criterios.
+    """
+    palos = {"rojo": (1, 2), "negro": (3, 4)}.get(color, (1, 2, 3, 4))  # 1: Corazón, 2: Diamante, 3: Trébol, 4: Pica
+    desde, hasta = rango_numeros if rango_numeros else (1, 13)
+    return tuple((num, palo) for num in range(max(1, desde), min(13, hasta) + 1) for palo in palos)
+
+
 class GeneradorCartas:
     """
     Clase GeneradorCartas encargada de generar cartas de póker basadas en ciertos criterios.
     
     Esta clase actúa como un generador, pero se implementa como un objeto iterable que produce cartas
     de póker basadas en los criterios especificados durante la inicialización.
+
+    Las cartas que cumplen los criterios se calculan una sola vez por configuración y se
+    sortean directamente entre ellas, sin descartar cartas que no sirven.
     
     La clase ha sido diseñada para no ser heredable.
     
@@ -17,9 +38,10 @@ class GeneradorCartas:
         color (str): Color de las cartas ("rojo" o "negro"). Si es None, no se filtra por color.
         rango_numeros (tuple): Rango de números para las cartas, por ejemplo (1, 10) para cartas entre As y 10.
         producidas (int): Cantidad de cartas que ya se han producido.
+        generador (random.Random): Generador de números aleatorios; por defecto el módulo random.
     """
     
-    def __init__(self, cantidad, tapada=False, color=None, rango_numeros=None):
+    def __init__(self, cantidad, tapada=False, color=None, rango_numeros=None, generador=None):
         """
         Inicializa una instancia de GeneradorCartas.
         
@@ -28,12 +50,22 @@ class GeneradorCartas:
             tapada (bool): Si las cartas deben estar tapadas. Por defecto es False.
             color (str): Color de las cartas ("rojo" o "negro"). Si es None, no se filtra por color.
             rango_numeros (tuple): Rango de números para las cartas, por ejemplo (1, 10) para cartas entre As y 10.
+            generador (random.Random): Generador de números aleatorios. Por defecto se usa el módulo random.
+
+        Raises:
+            ValueError: Si el color no es válido o ninguna carta cumple con los criterios.
         """
+        if color not in (None, "rojo", "negro"):
+            raise ValueError(f"Color inválido: {color}")
         self.__cantidad = cantidad
         self.__tapada = tapada
         self.__color = color
         self.__rango_numeros = rango_numeros
         self.__producidas = 0
+        self.__generador = random if generador is None else generador
+        self.__candidatas = _candidatas(color, tuple(rango_numeros) if rango_numeros else None)
+        if not self.__candidatas:
+            raise ValueError("Ninguna carta cumple con los criterios indicados")
 
     def __iter__(self):
         """Devuelve el objeto generador para ser iterado."""
@@ -42,31 +74,28 @@ class GeneradorCartas:
     def __next__(self):
         """Produce la siguiente carta válida, o lanza StopIteration si se alcanza la cantidad deseada."""
         if self.__producidas < self.__cantidad:
-            while True:
-                num = random.randint(1, 13)
-                palo = random.randint(1, 4)
-                
-                carta_valida = True
-                
-                # Verificar si la carta cumple con el color especificado
-                if self.__color:
-                    if self.__color == "rojo" and palo not in (1, 2):  # 1: Corazón, 2: Diamante
-                        carta_valida = False
-                    elif self.__color == "negro" and palo not in (3, 4):  # 3: Trébol, 4: Pica
-                        carta_valida = False
-                
-                # Verificar si la carta cumple con el rango de números especificado
-                if self.__rango_numeros and (num < self.__rango_numeros[0] or num > self.__rango_numeros[1]):
-                    carta_valida = False
-                
-                # Si la carta es válida según los criterios, la producimos y aumentamos el contador
-                if carta_valida:
-                    self.__producidas += 1
-                    return CartaPoker(num, palo, self.__tapada)
-
+            num, palo = self.__generador.choice(self.__candidatas)
+            self.__producidas += 1
+            return CartaPoker(num, palo, self.__tapada)
         else:
             raise StopIteration
 
+    def generar(self, n):
+        """
+        Produce varias cartas de una vez, sin pasar de la cantidad deseada.
+
+        Args:
+            n (int): Cantidad de cartas a producir.
+
+        Returns:
+            list: Las cartas producidas; puede tener menos de n si se alcanza la cantidad deseada.
+        """
+        n = max(0, min(n, self.__cantidad - self.__producidas))
+        self.__producidas += n
+        tapada = self.__tapada
+        return [CartaPoker(num, palo, tapada)
+                for num, palo in self.__generador.choices(self.__candidatas, k=n)]
+
     def __init_subclass__(cls, **kwargs):
         """
         Método mágico que se invoca automáticamente al intentar heredar de esta clase.
@@ -90,6 +119,7 @@ def test_generador_cartas():
     for carta in GeneradorCartas(25):
         print(carta,end='')    
     print(list(GeneradorCartas(10)))
+    print(GeneradorCartas(1000, color="rojo", rango_numeros=(1, 1)).generar(5))
 
 if __name__ == '__main__':
     test_generador_cartas()
@@ -0,0 +1,208 @@
+"""
+instrumentacion.py - Tiempos por fase y contadores de una mesa de BlackJack.
+
+Una `Instrumentacion` acumula, para cada fase de la ronda, cuántas veces se
+ejecutó y cuánto tiempo de reloj llevó, y cuenta las cartas que salen y vuelven
+al mazo y las veces que se baraja. Los datos se exportan como diccionario, JSON
+o texto en el formato de exposición de Prometheus.
+
+`BlackJack` solo reemplaza sus fases por versiones medidas cuando recibe una
+instrumentación; sin ella no agrega ni una comparación al camino caliente.
+
+Clases:
+    - Instrumentacion: Acumula tiempos por fase y contadores.
+
+Uso típico:
+
+    instrumentacion = Instrumentacion()
+    juego = BlackJack(interactivo=False, instrumentacion=instrumentacion)
+    ...
+    print(instrumentacion.como_prometheus())
+"""
+
+import functools
+import json
+import time
+from mazos import MazoBlackJack, ObservadorMazo
+
+
+class Instrumentacion(ObservadorMazo):
+    """Tiempos de reloj y cantidad de llamadas por fase, más contadores sueltos.
+
+    También observa el mazo de la mesa para contar las cartas sacadas y devueltas.
+
+    Atributos:
+        __reloj (callable): Retorna el tiempo actual en nanosegundos.
+        __llamadas (dict[str, int]): Llamadas por fase.
+        __nanosegundos (dict[str, int]): Tiempo acumulado por fase.
+        __contadores (dict[str, int]): Contadores por nombre.
+    """
+
+    def __init__(self, reloj=time.perf_counter_ns) -> None:
+        """Inicializa una instrumentación vacía.
+
+        Args:
+            reloj (callable, optional): Función sin argumentos que retorna nanosegundos.
+                Por defecto time.perf_counter_ns.
+        """
+        self.__reloj = reloj
+        self.__llamadas: dict[str, int] = {}
+        self.__nanosegundos: dict[str, int] = {}
+        self.__contadores: dict[str, int] = {}
+
+    @property
+    def llamadas(self) -> dict[str, int]:
+        """Retorna una copia de las llamadas por fase."""
+        return dict(self.__llamadas)
+
+    @property
+    def segundos(self) -> dict[str, float]:
+        """Retorna el tiempo acumulado por fase, en segundos."""
+        return {fase: ns / 1e9 for fase, ns in self.__nanosegundos.items()}
+
+    @property
+    def contadores(self) -> dict[str, int]:
+        """Retorna una copia de los contadores."""
+        return dict(self.__contadores)
+
+    def medir(self, fase: str, funcion):
+        """Retorna una versión de la función que acumula su tiempo y sus llamadas en la fase.
+
+        Si una fase medida llama a otra, el tiempo de la interna también cuenta en la externa.
+
+        Args:
+            fase (str): El nombre de la fase.
+            funcion (callable): La función a medir.
+
+        Returns:
+            callable: La función medida.
+        """
+        llamadas = self.__llamadas
+        nanosegundos = self.__nanosegundos
+        reloj = self.__reloj
+        llamadas.setdefault(fase, 0)
+        nanosegundos.setdefault(fase, 0)
+
+        @functools.wraps(funcion)
+        def medida(*args, **kwargs):
+            inicio = reloj()
+            try:
+                return funcion(*args, **kwargs)
+            finally:
+                nanosegundos[fase] += reloj() - inicio
+                llamadas[fase] += 1
+        return medida
+
+    def contar(self, contador: str, cantidad: int = 1) -> None:
+        """Suma una cantidad a un contador."""
+        self.__contadores[contador] = self.__contadores.get(contador, 0) + cantidad
+
+    def contar_llamadas(self, contador: str, funcion):
+        """Retorna una versión de la función que suma 1 al contador en cada llamada."""
+        contadores = self.__contadores
+        contadores.setdefault(contador, 0)
+
+        @functools.wraps(funcion)
+        def contada(*args, **kwargs):
+            contadores[contador] += 1
+            return funcion(*args, **kwargs)
+        return contada
+
+    def observar_mazo(self, mazo: MazoBlackJack) -> None:
+        """Empieza a contar las cartas sacadas y devueltas, y las barajadas del mazo.
+
+        `barajar` se reemplaza solo en esa instancia del mazo.
+        """
+        for contador in ("cartas_sacadas", "cartas_devueltas", "barajadas"):
+            self.__contadores.setdefault(contador, 0)
+        mazo.barajar = self.contar_llamadas("barajadas", mazo.barajar)
+        mazo.agregar_observador(self)
+
+    def al_sacar(self, codigo: int) -> None:
+        self.__contadores["cartas_sacadas"] += 1
+
+    def al_devolver(self, codigo: int) -> None:
+        self.__contadores["cartas_devueltas"] += 1
+
+    def al_reiniciar(self, mazo: MazoBlackJack) -> None:
+        pass
+
+    def fusionar(self, otra: "Instrumentacion") -> None:
+        """Suma los tiempos y contadores de otra instrumentación (por ejemplo, de otro proceso)."""
+        for fase, cantidad in otra.__llamadas.items():
+            self.__llamadas[fase] = self.__llamadas.get(fase, 0) + cantidad
+            self.__nanosegundos[fase] = self.__nanosegundos.get(fase, 0) + otra.__nanosegundos[fase]
+        for contador, cantidad in otra.__contadores.items():
+            self.contar(contador, cantidad)
+
+    def reiniciar(self) -> None:
+        """Pone en cero todos los tiempos y contadores, manteniendo las fases medidas."""
+        for fase in self.__llamadas:
+            self.__llamadas[fase] = 0
+            self.__nanosegundos[fase] = 0
+        for contador in self.__contadores:
+            self.__contadores[contador] = 0
+
+    def como_dict(self) -> dict:
+        """Retorna los datos como un diccionario con las claves "fases" y "contadores"."""
+        return {
+            "fases": {fase: {"llamadas": self.__llamadas[fase], "segundos": self.__nanosegundos[fase] / 1e9}
+                      for fase in self.__llamadas},
+            "contadores": dict(self.__contadores),
+        }
+
+    def como_json(self, **opciones) -> str:
+        """Retorna los datos en JSON. Las opciones se pasan a json.dumps."""
+        return json.dumps(self.como_dict(), **opciones)
+
+    def como_prometheus(self, prefijo: str = "blackjack") -> str:
+        """Retorna los datos en el formato de texto de Prometheus.
+
+        Args:
+            prefijo (str, optional): Prefijo de los nombres de las métricas. Por defecto "blackjack".
+
+        Returns:
+            str: Una métrica por línea, con sus líneas HELP y TYPE.
+        """
+        lineas = [
+            f"# HELP {prefijo}_fase_segundos_total Tiempo de reloj acumulado en cada fase de la ronda.",
+            f"# TYPE {prefijo}_fase_segundos_total counter",
+        ]
+        for fase, ns in self.__nanosegundos.items():
+            lineas.append(f'{prefijo}_fase_segundos_total{{fase="{fase}"}} {ns / 1e9:.9f}')
+        lineas += [
+            f"# HELP {prefijo}_fase_llamadas_total Veces que se ejecutó cada fase de la ronda.",
+            f"# TYPE {prefijo}_fase_llamadas_total counter",
+        ]
+        for fase, cantidad in self.__llamadas.items():
+            lineas.append(f'{prefijo}_fase_llamadas_total{{fase="{fase}"}} {cantidad}')
+        for contador, cantidad in self.__contadores.items():
+            lineas += [f"# TYPE {prefijo}_{contador}_total counter", f"{prefijo}_{contador}_total {cantidad}"]
+        return "\n".join(lineas) + "\n"
+
+    def __str__(self) -> str:
+        """Retorna una tabla con las fases ordenadas por tiempo, de mayor a menor."""
+        lineas = [f"{'Fase':<28}{'Llamadas':>12}{'Segundos':>12}{'µs/llamada':>12}"]
+        for fase, ns in sorted(self.__nanosegundos.items(), key=lambda par: -par[1]):
+            llamadas = self.__llamadas[fase]
+            por_llamada = ns / llamadas / 1e3 if llamadas else 0.0
+            lineas.append(f"{fase:<28}{llamadas:>12}{ns / 1e9:>12.4f}{por_llamada:>12.2f}")
+        for contador, cantidad in self.__contadores.items():
+            lineas.append(f"{contador:<28}{cantidad:>12}")
+        return "\n".join(lineas)
+
+
+if __name__ == '__main__':
+    from juego_black_jack import BlackJack
+    from jugadores import Bot
+    from politicas import PoliticaEstrategiaBasica, ApuestaFija
+
+    instrumentacion = Instrumentacion()
+    juego = BlackJack(interactivo=False, instrumentacion=instrumentacion)
+    for numero in range(5):
+        juego.agregar_jugador(Bot(f"Bot {numero + 1}", 1_000_000, PoliticaEstrategiaBasica(), ApuestaFija(1)))
+    for _ in juego.rondas(20_000):
+        pass
+    print(instrumentacion)
+    print()
+    print(instrumentacion.como_prometheus())
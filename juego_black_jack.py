@@ -1,25 +1,84 @@
+import os
+import random
 import utilidades2 as util
+import eventos
+from instrumentacion import Instrumentacion
+from barajado import PoliticaBarajado, BarajarCadaRonda
 from cartas import CartaPoker
-from mazos import MazoBlackJack
-from jugadores import Humano, Compu, Croupier, Cliente
+from estrategia import PEDIR, PLANTARSE, DOBLAR, DIVIDIR, RENDIRSE
+from mazos import MazoBlackJack, ManoBlackJack
+from jugadores import Humano, Compu, Croupier, Cliente, Bot
+from reglas import ReglasMesa, REGLAS_CLASICAS, PUEDE_DOBLAR, PUEDE_DIVIDIR, PUEDE_RENDIRSE
+from resultados import ResultadoJugador, ResultadoRonda
 from txtcolores import strclr
 
+# Pedidos que produce BlackJack.ronda_paso_a_paso
+APUESTA = "apuesta"
+SEGURO = "seguro"
+JUGADA = "jugada"
+
+# Donde main() guarda por defecto las fichas de los jugadores entre partidas
+RUTA_DATOS = os.path.join(os.path.expanduser("~"), ".local", "share", "juego_black_jack", "blackjack.db")
+FICHAS_INICIALES = 100
+
 
 class BlackJack:
     """Representa un juego de BlackJack.
 
+    El juego puede ser interactivo (por consola) o silencioso. En modo silencioso
+    no se imprime nada ni se pausa la consola: las decisiones las toman las
+    políticas de cada `Bot` y cada ronda devuelve un `ResultadoRonda`. En modo
+    silencioso los jugadores apuestan antes de que se repartan las cartas; en la
+    consola apuestan después, viendo la carta del croupier.
+
+    Las reglas de la mesa (`ReglasMesa`) deciden qué más se puede hacer además de
+    pedir y plantarse: doblar, dividir, rendirse y tomar seguro, y cuánto paga un
+    Black Jack natural. Por defecto se juega con REGLAS_CLASICAS, el juego original
+    en el que solo se pide o se planta y todo se paga 1 a 1.
+
     Atributos:
         __croupier (Croupier): El croupier del juego.
         __jugadores (list[Cliente]): Lista de jugadores en el juego.
         __mazo (MazoBlackJack): El mazo de cartas utilizado en el juego.
-        __apuestas (list[int]): Las apuestas realizadas por los jugadores.
+        __apuestas (list[int]): La apuesta de cada asiento, alineada con __jugadores.
+        __seguros (list[int]): El seguro de cada asiento, 0 si no tomó.
+        __reglas (ReglasMesa): Las reglas de la mesa.
+        __interactivo (bool): Si el juego usa la consola.
+        __registro (RegistroEventos): Donde se registran los eventos de cada ronda, o None.
+        __ronda (int): Número de la ronda en curso.
+        __opciones (int): Las opciones de la mano del último pedido JUGADA de ronda_paso_a_paso.
+        __instrumentacion (Instrumentacion): Donde se miden los tiempos de cada fase, o None.
     """
-    def __init__(self) -> None:
-        """Inicializa una nueva instancia de BlackJack."""
+    def __init__(self, interactivo: bool = True, registro: eventos.RegistroEventos = None,
+                 generador: random.Random = None, barajado: PoliticaBarajado = None,
+                 reglas: ReglasMesa = None, instrumentacion: Instrumentacion = None) -> None:
+        """Inicializa una nueva instancia de BlackJack.
+
+        Args:
+            interactivo (bool, optional): Si el juego usa la consola. Por defecto es True.
+            registro (RegistroEventos, optional): Registro binario de eventos. Por defecto no se registra nada.
+            generador (random.Random, optional): Generador de números aleatorios del mazo.
+                Por defecto se usa el módulo random.
+            barajado (PoliticaBarajado, optional): Qué se hace con las cartas usadas y cuándo se
+                baraja. Por defecto se baraja el mazo entero en cada ronda.
+            reglas (ReglasMesa, optional): Las reglas de la mesa. Por defecto REGLAS_CLASICAS.
+            instrumentacion (Instrumentacion, optional): Mide el tiempo y las llamadas de cada fase
+                de la ronda y cuenta cartas y barajadas. Por defecto no se mide nada.
+        """
+        self.__reglas: ReglasMesa = REGLAS_CLASICAS if reglas is None else reglas
         self.__croupier: Croupier = Croupier()
         self.__jugadores: list[Cliente] = []
-        self.__mazo: MazoBlackJack = MazoBlackJack()
+        self.__mazo: MazoBlackJack = MazoBlackJack(mazos=self.__reglas.mazos, generador=generador)
         self.__apuestas: list[int] = []
+        self.__seguros: list[int] = []
+        self.__opciones: int = 0
+        self.__interactivo: bool = interactivo
+        self.__barajado: PoliticaBarajado = BarajarCadaRonda() if barajado is None else barajado
+        self.__registro: eventos.RegistroEventos = registro
+        self.__ronda: int = 0
+        self.__instrumentacion: Instrumentacion = instrumentacion
+        if instrumentacion is not None:
+            self.__instrumentar(instrumentacion)
 
     @property
     def croupier(self) -> Croupier:
@@ -29,7 +88,7 @@ class BlackJack:
             Croupier: El croupier del juego.
         """
         return self.__croupier
-    
+
     @property
     def jugadores(self) -> list[Cliente]:
         """Obtiene la lista de jugadores del juego.
@@ -57,6 +116,51 @@ class BlackJack:
         """
         return self.__apuestas
 
+    @property
+    def reglas(self) -> ReglasMesa:
+        """Obtiene las reglas de la mesa.
+
+        Returns:
+            ReglasMesa: Las reglas de la mesa.
+        """
+        return self.__reglas
+
+    @property
+    def opciones(self) -> int:
+        """Obtiene las jugadas permitidas en el último pedido JUGADA de ronda_paso_a_paso.
+
+        Returns:
+            int: Combinación de PUEDE_DOBLAR, PUEDE_DIVIDIR y PUEDE_RENDIRSE.
+        """
+        return self.__opciones
+
+    @property
+    def instrumentacion(self) -> Instrumentacion:
+        """Obtiene la instrumentación de la mesa.
+
+        Returns:
+            Instrumentacion: La instrumentación, o None si no se mide nada.
+        """
+        return self.__instrumentacion
+
+    @property
+    def interactivo(self) -> bool:
+        """Indica si el juego usa la consola.
+
+        Returns:
+            bool: True si el juego es interactivo, False si es silencioso.
+        """
+        return self.__interactivo
+
+    @property
+    def ronda(self) -> int:
+        """Obtiene el número de la última ronda empezada.
+
+        Returns:
+            int: El número de ronda, 0 si todavía no se jugó ninguna.
+        """
+        return self.__ronda
+
     def agregar_jugador(self, jugador: Cliente) -> None:
         """Agrega un nuevo jugador al juego.
 
@@ -64,12 +168,40 @@ class BlackJack:
             jugador (Cliente): El jugador a agregar al juego.
 
         Raises:
-            ValueError: Si el objeto no es una instancia de Cliente.
+            ValueError: Si el objeto no es una instancia de Cliente, si el juego es
+                silencioso y el jugador no es un Bot, o si hay registro de eventos y
+                el asiento no cabe en un evento (ver eventos.CROUPIER).
         """
         if not isinstance(jugador, Cliente):
             raise ValueError("Solo pueden jugar clientes")
+        if not self.__interactivo and not isinstance(jugador, Bot):
+            raise ValueError("En modo silencioso solo pueden jugar bots")
+        if self.__registro is not None and len(self.jugadores) >= eventos.CROUPIER:
+            raise ValueError(f"Con registro de eventos la mesa admite hasta {eventos.CROUPIER} jugadores")
         self.jugadores.append(jugador)
 
+    def __instrumentar(self, instrumentacion: Instrumentacion) -> None:
+        """Reemplaza, solo en esta instancia, cada fase de la ronda por una versión medida.
+
+        Las llamadas internas como self.__croupier_juega() encuentran primero el atributo
+        de la instancia, así que una mesa sin instrumentación no paga nada.
+        """
+        medir = instrumentacion.medir
+        self.__preparar_mazo = medir("preparar_mazo", self.__preparar_mazo)
+        self.__jugadores_apuestan = medir("jugadores_apuestan", self.__jugadores_apuestan)
+        self.__croupier_reparte_dos_cartas = medir("croupier_reparte_dos_cartas",
+                                                   self.__croupier_reparte_dos_cartas)
+        self.__jugadores_aseguran = medir("jugadores_aseguran", self.__jugadores_aseguran)
+        self.__jugadores_juegan = medir("jugadores_juegan", self.__jugadores_juegan)
+        self.__croupier_juega = medir("croupier_juega", self.__croupier_juega)
+        self.__croupier_reparte_premios = medir("croupier_reparte_premios", self.__croupier_reparte_premios)
+        self.__jugadores_se_descartan = medir("jugadores_se_descartan", self.__jugadores_se_descartan)
+        self.__croupier_se_descarta = medir("croupier_se_descarta", self.__croupier_se_descarta)
+        self.__devolver_descartes = medir("devolver_descartes", self.__devolver_descartes)
+        self.__jugadores_se_retiran = medir("jugadores_se_retiran", self.__jugadores_se_retiran)
+        self.jugar_ronda = medir("ronda", self.jugar_ronda)
+        instrumentacion.observar_mazo(self.__mazo)
+
     def __hay_jugadores(self) -> bool:
         """Determina si hay jugadores en el juego.
 
@@ -78,131 +210,589 @@ class BlackJack:
         """
         return len(self.jugadores) > 0
 
+    def __registrar(self, tipo: int, asiento: int = eventos.CROUPIER, carta: CartaPoker = None,
+                    suma: int = 0, valor: int = 0, mano: int = 0) -> None:
+        """Agrega un evento de la ronda en curso al registro."""
+        codigo = eventos.SIN_CARTA if carta is None else MazoBlackJack.codificar(carta)
+        self.__registro.registrar(self.__ronda, tipo, asiento, codigo, suma, valor, mano)
+
     def __jugadores_apuestan(self) -> None:
         """Proceso donde los jugadores realizan sus apuestas."""
-        util.system("cls")
-        print(util.titulo('Los jugadores apuestan'))
-        print(self.croupier)
-        for jugador in self.jugadores:
-            self.apuestas.append(jugador.apuesto())
+        if self.__interactivo:
+            util.system("cls")
+            print(util.titulo('Los jugadores apuestan'))
+            print(self.croupier)
+        for asiento, jugador in enumerate(self.jugadores):
+            self.__apostar(asiento, jugador, jugador.apuesto())
+
+    def __apostar(self, asiento: int, jugador: Cliente, apuesta: int) -> None:
+        """Registra la apuesta del jugador del asiento indicado."""
+        self.apuestas.append(apuesta)
+        self.__seguros.append(0)
+        jugador.mano.apostar(apuesta)
+        if self.__registro is not None:
+            self.__registrar(eventos.APUESTA, asiento, valor=apuesta)
 
     def __croupier_reparte_dos_cartas(self) -> None:
         """El croupier reparte dos cartas a cada jugador y a sí mismo."""
-        print(util.titulo('El croupier reparte dos cartas'))
-        for jugador in self.jugadores:
-            jugador.poner_carta(self.mazo.sacar_carta())
-            jugador.poner_carta(self.mazo.sacar_carta())
-        c = self.mazo.sacar_carta()
-        c.tapar()
-        self.croupier.poner_carta(c)
-        self.croupier.poner_carta(self.mazo.sacar_carta())
+        if self.__interactivo:
+            print(util.titulo('El croupier reparte dos cartas'))
+        if self.__registro is None:
+            for jugador in self.jugadores:
+                jugador.poner_carta(self.mazo.sacar_carta())
+                jugador.poner_carta(self.mazo.sacar_carta())
+            self.croupier.poner_carta(self.mazo.sacar_carta_tapada())
+            self.croupier.poner_carta(self.mazo.sacar_carta())
+            return
+        # Cada carta se registra al repartirla, con la suma que tiene la mano en ese momento
+        for asiento, jugador in enumerate(self.jugadores):
+            for _ in range(2):
+                carta = self.mazo.sacar_carta()
+                jugador.poner_carta(carta)
+                self.__registrar(eventos.REPARTO, asiento, carta, jugador.sumar_cartas())
+        tapada = self.mazo.sacar_carta_tapada()
+        self.croupier.poner_carta(tapada)
+        self.__registrar(eventos.REPARTO, carta=tapada)  # No suma hasta que se destapa
+        visible = self.mazo.sacar_carta()
+        self.croupier.poner_carta(visible)
+        suma_visible = 11 if visible.numero == 1 else min(visible.numero, 10)
+        self.__registrar(eventos.REPARTO, carta=visible, suma=suma_visible)
+
+    def __jugadores_aseguran(self) -> None:
+        """Proceso donde cada jugador decide si toma seguro cuando el croupier muestra un as."""
+        if self.__interactivo:
+            print(util.titulo("el croupier ofrece seguro"))
+        carta_visible = self.croupier.mano.cartas[1]
+        for asiento, jugador in enumerate(self.jugadores):
+            seguro = self.__seguro_posible(asiento, jugador)
+            if seguro and jugador.tomo_seguro(carta_visible):
+                self.__asegurar(asiento, seguro)
+
+    def __hay_seguro(self) -> bool:
+        """Determina si se ofrece seguro: las reglas lo permiten y el croupier muestra un as."""
+        return self.__reglas.seguro and self.croupier.mano.cartas[1].numero == 1
+
+    def __seguro_posible(self, asiento: int, jugador: Cliente) -> int:
+        """Retorna el seguro que puede tomar el jugador (media apuesta), 0 si no le alcanzan las fichas."""
+        apuesta = self.apuestas[asiento]
+        seguro = apuesta // 2
+        return seguro if jugador.fichas - apuesta >= seguro else 0
+
+    def __asegurar(self, asiento: int, seguro: int) -> None:
+        """El jugador del asiento indicado toma seguro."""
+        self.__seguros[asiento] = seguro
+        if self.__registro is not None:
+            self.__registrar(eventos.SEGURO, asiento, valor=seguro)
+
+    def __croupier_revisa(self) -> bool:
+        """El croupier revisa su carta tapada, si las reglas lo indican.
+
+        Returns:
+            bool: True si tiene Black Jack; en ese caso los jugadores no juegan sus manos.
+        """
+        if not self.__reglas.croupier_revisa or not self.croupier.isblackjack():
+            return False
+        if self.__interactivo:
+            print(strclr("El croupier tiene Black Jack", 'red'))
+        return True
 
     def __jugadores_juegan(self) -> None:
-        """Proceso donde cada jugador decide si pide más cartas o se planta."""
-        print(util.titulo("los jugadores juegan"))
-        print(self.croupier)
-        for jugador in self.jugadores:
-            while not jugador.me_planto():
-                jugador.poner_carta(self.mazo.sacar_carta())
+        """Proceso donde cada jugador juega sus manos."""
+        if self.__interactivo:
+            print(util.titulo("los jugadores juegan"))
+            print(self.croupier)
+        carta_visible = self.croupier.mano.cartas[1]
+        for asiento, jugador in enumerate(self.jugadores):
+            manos = self.__jugar_manos(asiento, jugador)
+            try:
+                opciones = next(manos)
+                while True:
+                    opciones = manos.send(jugador.decidir(carta_visible, opciones))
+            except StopIteration:
+                pass
+
+    def __jugar_manos(self, asiento: int, jugador: Cliente):
+        """Juega las manos de un jugador, incluidas las que salen de dividir.
+
+        Es un generador: por cada decisión produce las opciones de la mano activa (ver
+        __opciones_mano) y espera la jugada elegida con `send`. Las manos que llegan a
+        21 o se pasan terminan solas. Las que salen de dividir ases reciben una sola
+        carta, salvo que las reglas permitan pedir: con ellas cualquier jugada que no
+        sea DIVIDIR planta la mano.
+
+        Raises:
+            ValueError: Si la jugada no está entre las permitidas.
+        """
+        pedir_ases = self.__reglas.pedir_ases_divididos
+        registro = self.__registro
+        indice = 0
+        while indice < jugador.cantidad_manos:
+            jugador.activar(indice)
+            mano = jugador.mano
+            if len(mano) == 1:  # La mano nueva de un par dividido recibe su segunda carta
+                self.__jugador_pide(asiento, indice, mano)
+            cartas = mano.cartas
+            ases_divididos = mano.dividida and not pedir_ases and cartas[0].numero == 1
+            while mano.total < 21:
+                opciones = self.__opciones_mano(asiento, jugador, mano) if len(cartas) == 2 else 0
+                if ases_divididos:
+                    opciones &= PUEDE_DIVIDIR
+                    if not opciones:
+                        break
+                accion = yield opciones
+                if accion == PEDIR and not ases_divididos:
+                    self.__jugador_pide(asiento, indice, mano)
+                elif accion == PLANTARSE or (ases_divididos and accion != DIVIDIR):
+                    break
+                elif accion == DOBLAR and opciones & PUEDE_DOBLAR:
+                    mano.doblar()
+                    if registro is not None:
+                        self.__registrar(eventos.DOBLA, asiento, suma=mano.total, valor=mano.apuesta,
+                                         mano=indice)
+                    self.__jugador_pide(asiento, indice, mano)
+                    break
+                elif accion == DIVIDIR and opciones & PUEDE_DIVIDIR:
+                    nueva = jugador.dividir()
+                    if registro is not None:
+                        self.__registrar(eventos.DIVIDE, asiento, nueva.cartas[0], mano.total, nueva.apuesta,
+                                         indice)
+                    self.__jugador_pide(asiento, indice, mano)
+                    # La mano ahora viene de dividir: si eran ases, ya no puede pedir ni doblar
+                    ases_divididos = not pedir_ases and cartas[0].numero == 1
+                elif accion == RENDIRSE and opciones & PUEDE_RENDIRSE:
+                    mano.rendir()
+                    if registro is not None:
+                        self.__registrar(eventos.RINDE, asiento, suma=mano.total, valor=mano.apuesta,
+                                         mano=indice)
+                    break
+                else:
+                    raise ValueError(f"Jugada no permitida: {accion}")
+            if self.__interactivo and mano.total >= 21 and not isinstance(jugador, Bot):
+                jugador.me_planto()  # Muestra la mano que llegó a 21 o se pasó
+            indice += 1
+
+    def __opciones_mano(self, asiento: int, jugador: Cliente, mano: ManoBlackJack) -> int:
+        """Retorna las jugadas que una mano de dos cartas puede hacer además de pedir y plantarse.
+
+        Solo se dobla o se divide con las dos primeras cartas y si las fichas alcanzan
+        para cubrir todo lo apostado en la ronda; solo se rinde la mano original.
+
+        Returns:
+            int: Combinación de PUEDE_DOBLAR, PUEDE_DIVIDIR y PUEDE_RENDIRSE.
+        """
+        reglas = self.__reglas
+        opciones = PUEDE_RENDIRSE if reglas.rendicion and jugador.cantidad_manos == 1 else 0
+        if (reglas.doblar or reglas.max_manos > jugador.cantidad_manos) and \
+                jugador.fichas - jugador.apuesta - self.__seguros[asiento] >= mano.apuesta:
+            if reglas.doblar and (reglas.doblar_despues_de_dividir or not mano.dividida):
+                opciones |= PUEDE_DOBLAR
+            if jugador.cantidad_manos < reglas.max_manos:
+                primera, segunda = mano.cartas
+                numero = primera.numero
+                if min(numero, 10) == min(segunda.numero, 10) and \
+                        (numero != 1 or reglas.redividir_ases or not mano.dividida):
+                    opciones |= PUEDE_DIVIDIR
+        return opciones
+
+    def __jugador_pide(self, asiento: int, indice: int, mano: ManoBlackJack) -> None:
+        """La mano `indice` del jugador del asiento indicado recibe una carta más."""
+        carta = self.mazo.sacar_carta()
+        mano.poner_carta(carta)
+        if self.__registro is not None:
+            self.__registrar(eventos.PIDE, asiento, carta, mano.total, mano=indice)
 
     def __croupier_juega(self) -> None:
         """Proceso donde el croupier juega su mano después de los jugadores."""
-        print(util.titulo("El croupier juega"))
-        c = self.croupier.sacar_carta()
-        c.destapar()
-        self.croupier.poner_carta(c, 0)
-        while not self.croupier.me_planto():
-            self.croupier.poner_carta(self.mazo.sacar_carta())
+        if self.__interactivo:
+            print(util.titulo("El croupier juega"))
+        self.croupier.mano.destapar(0)
+        self.mazo.mostrar(self.croupier.mano.cartas[0])
+        registro = self.__registro
+        if registro is not None:
+            self.__registrar(eventos.DESTAPA, carta=self.croupier.mano.cartas[0],
+                             suma=self.croupier.sumar_cartas())
+        pide_17_blando = self.__reglas.croupier_pide_17_blando
+        plantarse = self.croupier.me_planto if self.__interactivo else self.croupier.plantarse_por_regla
+        while not plantarse(pide_17_blando):
+            carta = self.mazo.sacar_carta()
+            self.croupier.poner_carta(carta)
+            if registro is not None:
+                self.__registrar(eventos.CROUPIER_PIDE, carta=carta, suma=self.croupier.sumar_cartas())
 
-    def __croupier_reparte_premios(self) -> None:
-        """El croupier reparte los premios a los jugadores según las reglas del juego."""
-        util.system("cls")
-        print(util.titulo('el croupier reparte los premios'))
-        suma_croupier = self.croupier.sumar_cartas()
-        print(f"{str(self.croupier)} ({suma_croupier})", end="")
-        suma_jugador = 0
-        if suma_croupier > 21:  # Se paso el croupier
-            print(strclr(" SE PASO", 'red'))
-            for jugador in self.jugadores:
-                apuesta = self.apuestas[self.jugadores.index(jugador)]
-                suma_jugador = jugador.sumar_cartas()
-                if suma_jugador > 21:  # PIERDE EL JUGADOR; SE PASO
-                    jugador.perder_fichas(apuesta)
+    def __croupier_reparte_premios(self, suma_croupier: int) -> tuple[ResultadoJugador, ...]:
+        """El croupier reparte los premios a los jugadores según las reglas del juego.
+
+        Se recorren los asientos una sola vez, leyendo la apuesta y el seguro de cada
+        uno en las listas por asiento. Cada mano se paga por separado; el seguro se paga
+        2 a 1 si el croupier tiene Black Jack.
+
+        Args:
+            suma_croupier (int): La suma final de las cartas del croupier.
+
+        Returns:
+            tuple[ResultadoJugador, ...]: El resultado de cada jugador, en orden de asiento.
+        """
+        interactivo = self.__interactivo
+        blackjack_croupier = self.croupier.isblackjack()
+        natural_croupier = blackjack_croupier and self.__reglas.naturales
+        if interactivo:
+            util.system("cls")
+            print(util.titulo('el croupier reparte los premios'))
+            print(f"{str(self.croupier)} ({suma_croupier})", end="")
+            if suma_croupier > 21:  # Se paso el croupier
+                print(strclr(" SE PASO", 'red'))
+            elif natural_croupier:
+                print(strclr(" BLACK JACK", 'red'))
+            else:
+                print()
+        apuestas = self.__apuestas
+        seguros = self.__seguros
+        registro = self.__registro
+        resultados = []
+        for asiento, jugador in enumerate(self.__jugadores):
+            ganancia = 0
+            seguro = seguros[asiento]
+            apostado = seguro
+            manos = jugador.manos
+            for indice, mano in enumerate(manos):
+                if interactivo:
+                    jugador.activar(indice)  # Para mostrar la mano que se paga
+                apostado += mano.apuesta
+                pago = self.__pagar_mano(jugador, mano, suma_croupier, natural_croupier)
+                if registro is not None:
+                    self.__registrar(eventos.PAGO, asiento, suma=mano.total, valor=pago, mano=indice)
+                ganancia += pago
+            if seguro:
+                pago = self.__pagar_seguro(jugador, seguro, blackjack_croupier)
+                if registro is not None:
+                    self.__registrar(eventos.PAGO_SEGURO, asiento, valor=pago)
+                ganancia += pago
+            resultados.append(ResultadoJugador(jugador.nombre, apuestas[asiento], apostado,
+                                               tuple(mano.total for mano in manos), ganancia, jugador.fichas))
+        if interactivo:
+            util.system('pause')
+        return tuple(resultados)
+
+    def __pagar_mano(self, jugador: Cliente, mano: ManoBlackJack, suma_croupier: int,
+                     natural_croupier: bool) -> int:
+        """Paga o cobra una mano del jugador.
+
+        Args:
+            jugador (Cliente): El dueño de la mano, con la mano activa.
+            mano (ManoBlackJack): La mano a pagar.
+            suma_croupier (int): La suma final de las cartas del croupier.
+            natural_croupier (bool): Si el croupier tiene un Black Jack que le gana a cualquier 21.
+
+        Returns:
+            int: Fichas ganadas (positivo), perdidas (negativo) o 0 si empató.
+        """
+        interactivo = self.__interactivo
+        reglas = self.__reglas
+        apuesta = mano.apuesta
+        suma_jugador = mano.total
+        if mano.rendida:  # PIERDE LA MITAD, SE RINDIO
+            ganancia = -((apuesta + 1) // 2)
+            jugador.perder_fichas(-ganancia)
+            if interactivo:
+                print(f"¡{jugador} SE RINDE Y PIERDE {-ganancia} FICHAS!")
+        elif suma_jugador > 21:  # PIERDE EL JUGADOR, SE PASO
+            jugador.perder_fichas(apuesta)
+            ganancia = -apuesta
+            if interactivo:
+                if suma_croupier > 21:
                     print(f"¡{jugador} PIERDE {apuesta} FICHAS SE PASO!")
-                else:  # GANA EL JUGADOR
-                    jugador.ganar_fichas(apuesta)
-                    print(f"¡{jugador} GANA {apuesta} FICHAS EL CROUPIER SE PASO!")
-        else:  # EL CROUPIUER NO SE PASA
-            print()
-            for jugador in self.jugadores:
-                apuesta = self.apuestas[self.jugadores.index(jugador)]
-                suma_jugador = jugador.sumar_cartas()
-                if suma_jugador > 21:  # PIERDE EL JUGADOR SE PASO
-                    jugador.perder_fichas(apuesta)
+                else:
                     print(f"¡{jugador} PIERDE {apuesta} FICHAS, EL JUGADOR SE PASO!")
-                elif suma_jugador < suma_croupier:  # PIERDE EL JUGADOR, LE GANA EL CROUPIER
-                    jugador.perder_fichas(apuesta)
-                    print(f"¡{jugador} PIERDE {apuesta} FICHAS, EL CROUPIER LE GANO!")
-                elif suma_jugador > suma_croupier:  # GANA EL JUGADOR
-                    jugador.ganar_fichas(apuesta)
-                    print(f"¡{jugador} GANA {apuesta} FICHAS, EL CROUPIER PIERDE!")
-                else:  # EMPATE
+        elif natural_croupier:
+            if mano.isnatural():  # EMPATE, LOS DOS TIENEN BLACK JACK
+                ganancia = 0
+                if interactivo:
                     print(f"¡{jugador} EMPATE!")
-        util.system('pause')
+            else:  # PIERDE EL JUGADOR, EL CROUPIER TIENE BLACK JACK
+                jugador.perder_fichas(apuesta)
+                ganancia = -apuesta
+                if interactivo:
+                    print(f"¡{jugador} PIERDE {apuesta} FICHAS, EL CROUPIER TIENE BLACK JACK!")
+        elif reglas.naturales and mano.isnatural():  # GANA EL JUGADOR CON BLACK JACK
+            ganancia = int(apuesta * reglas.pago_blackjack)
+            jugador.ganar_fichas(ganancia)
+            if interactivo:
+                print(f"¡{jugador} GANA {ganancia} FICHAS CON BLACK JACK!")
+        elif suma_croupier > 21:  # GANA EL JUGADOR, SE PASO EL CROUPIER
+            jugador.ganar_fichas(apuesta)
+            ganancia = apuesta
+            if interactivo:
+                print(f"¡{jugador} GANA {apuesta} FICHAS EL CROUPIER SE PASO!")
+        elif suma_jugador < suma_croupier:  # PIERDE EL JUGADOR, LE GANA EL CROUPIER
+            jugador.perder_fichas(apuesta)
+            ganancia = -apuesta
+            if interactivo:
+                print(f"¡{jugador} PIERDE {apuesta} FICHAS, EL CROUPIER LE GANO!")
+        elif suma_jugador > suma_croupier:  # GANA EL JUGADOR
+            jugador.ganar_fichas(apuesta)
+            ganancia = apuesta
+            if interactivo:
+                print(f"¡{jugador} GANA {apuesta} FICHAS, EL CROUPIER PIERDE!")
+        else:  # EMPATE
+            ganancia = 0
+            if interactivo:
+                print(f"¡{jugador} EMPATE!")
+        return ganancia
 
-    def __jugadores_se_descartan(self) -> None:
-        """Los jugadores se descartan de sus cartas al final de la ronda."""
+    def __pagar_seguro(self, jugador: Cliente, seguro: int, blackjack_croupier: bool) -> int:
+        """Paga o cobra el seguro del jugador y retorna la ganancia."""
+        if blackjack_croupier:
+            jugador.ganar_fichas(2 * seguro)
+            if self.__interactivo:
+                print(f"¡{jugador} COBRA {2 * seguro} FICHAS DEL SEGURO!")
+            return 2 * seguro
+        jugador.perder_fichas(seguro)
+        if self.__interactivo:
+            print(f"¡{jugador} PIERDE {seguro} FICHAS DEL SEGURO!")
+        return -seguro
+
+    def __jugadores_se_descartan(self) -> list:
+        """Los jugadores se descartan de las cartas de todas sus manos al final de la ronda.
+
+        Returns:
+            list[CartaPoker]: Las cartas descartadas, en orden de asiento.
+        """
         #print(util.titulo("los jugadores se descartan"))
+        descartes = []
         for jugador in self.jugadores:
-            while not jugador.mano.isvacio():
-                self.mazo.poner_carta(jugador.sacar_carta())
+            descartes += jugador.descartar_manos()
+        return descartes
 
-    def __croupier_se_descarta(self) -> None:
-        """El croupier se descarta de sus cartas al final de la ronda."""
+    def __croupier_se_descarta(self) -> list:
+        """El croupier se descarta de sus cartas al final de la ronda.
+
+        Returns:
+            list[CartaPoker]: Las cartas descartadas.
+        """
         # print(util.titulo("el croupier se descarta"))
-        while not self.croupier.mano.isvacio():
-            self.mazo.poner_carta(self.croupier.sacar_carta())
-
-    def __jugadores_se_retiran(self) -> None:
-        """Retira a los jugadores que ya no tienen fichas para apostar."""
-        util.system("cls")
-        print(util.titulo("los jugadores se retiran"))
-        bandera = False
-        index = 0
-        while index < len(self.jugadores):
-            if self.jugadores[index].fichas <= 0:
-                print(f"{self.jugadores[index].nombre} Se retira del juego")
-                self.jugadores.pop(index)
-                bandera = True
+        return self.croupier.descartar_mano()
+
+    def __jugadores_se_retiran(self) -> tuple[str, ...]:
+        """Retira a los jugadores que ya no tienen fichas para apostar.
+
+        Compacta en una sola pasada la lista de jugadores y las listas por asiento
+        (apuestas y seguros), de manera que sigan alineadas y el costo sea lineal en
+        la cantidad de asientos, sin importar cuántos jugadores se retiren.
+
+        Returns:
+            tuple[str, ...]: Los nombres de los jugadores retirados.
+        """
+        interactivo = self.__interactivo
+        registro = self.__registro
+        if interactivo:
+            util.system("cls")
+            print(util.titulo("los jugadores se retiran"))
+        jugadores = self.__jugadores
+        apuestas = self.__apuestas
+        seguros = self.__seguros
+        retirados = []
+        libre = 0
+        for asiento, jugador in enumerate(jugadores):
+            if jugador.fichas <= 0:
+                if registro is not None:
+                    self.__registrar(eventos.RETIRO, asiento, valor=jugador.fichas)
+                if interactivo:
+                    print(f"{jugador.nombre} Se retira del juego")
+                retirados.append(jugador.nombre)
             else:
-                index += 1
-        if bandera:
+                if libre != asiento:
+                    jugadores[libre] = jugador
+                    apuestas[libre] = apuestas[asiento]
+                    seguros[libre] = seguros[asiento]
+                libre += 1
+        if retirados:
+            del jugadores[libre:]
+            del apuestas[libre:]
+            del seguros[libre:]
+        if interactivo and retirados:
             util.system("pause")
+        return tuple(retirados)
 
-    def jugar(self) -> None:
-        """Inicia y controla el flujo del juego de BlackJack."""
-        self.mazo.llenar()
-        while self.__hay_jugadores():
-            self.apuestas.clear()
+    def __preparar_mazo(self) -> None:
+        """Llena y baraja el mazo si está vacío, y deja que la política de barajado lo prepare."""
+        if self.mazo.isvacio():
+            self.mazo.llenar()
             self.mazo.barajar()
+        self.__barajado.antes_de_repartir(self.mazo)
+
+    def __devolver_descartes(self, descartes: list) -> None:
+        """Entrega las cartas usadas en la ronda a la política de barajado."""
+        self.__barajado.descartar(self.mazo, descartes)
+
+    def __empezar_ronda(self) -> None:
+        """Prepara el mazo para una ronda nueva."""
+        self.__ronda += 1
+        if self.__registro is not None:
+            self.__registrar(eventos.INICIO_RONDA, valor=len(self.jugadores))
+        self.apuestas.clear()
+        self.__seguros.clear()
+        self.__preparar_mazo()
+
+    def __terminar_ronda(self) -> ResultadoRonda:
+        """Juega el croupier, se pagan los premios y se levanta la mesa."""
+        self.__croupier_juega()
+        suma_croupier = self.croupier.sumar_cartas()
+        carta_visible = min(self.croupier.mano.cartas[1].numero, 10)
+        resultados = self.__croupier_reparte_premios(suma_croupier)
+        descartes = self.__jugadores_se_descartan()
+        descartes += self.__croupier_se_descarta()
+        self.__devolver_descartes(descartes)
+        retirados = self.__jugadores_se_retiran()
+        return ResultadoRonda(suma_croupier, resultados, retirados, carta_visible)
+
+    def jugar_ronda(self) -> ResultadoRonda:
+        """Juega una ronda completa, desde mezclar hasta retirar a los jugadores sin fichas.
+
+        Returns:
+            ResultadoRonda: El resultado de la ronda.
+        """
+        self.__empezar_ronda()
+        if self.__interactivo:
+            # En la consola se apuesta viendo la carta del croupier
             self.__croupier_reparte_dos_cartas()
             self.__jugadores_apuestan()
+        else:
+            # En el modo silencioso se apuesta antes de repartir, como en un casino
+            self.__jugadores_apuestan()
+            self.__croupier_reparte_dos_cartas()
+        if self.__hay_seguro():
+            self.__jugadores_aseguran()
+        if not self.__croupier_revisa():
             self.__jugadores_juegan()
-            self.__croupier_juega()
-            self.__croupier_reparte_premios()
-            self.__jugadores_se_descartan()
-            self.__croupier_se_descarta()
-            self.__jugadores_se_retiran()
+        return self.__terminar_ronda()
+
+    def ronda_paso_a_paso(self):
+        """Juega una ronda del modo silencioso dejando que otro resuelva las decisiones.
+
+        Es un generador: en lugar de llamar a `apuesto`, `tomo_seguro` y `decidir` de cada
+        jugador, produce un pedido y espera la respuesta con `send`. Así las decisiones
+        pueden llegar desde afuera (por ejemplo por la red) sin bloquear.
+
+        Yields:
+            tuple: (APUESTA, jugador, None), que espera la cantidad de fichas apostadas,
+                (SEGURO, jugador, carta_visible), que espera True si el jugador toma seguro, o
+                (JUGADA, jugador, carta_visible), que espera la jugada de la mano activa:
+                PEDIR, PLANTARSE, DOBLAR, DIVIDIR o RENDIRSE, o un bool (True si se planta).
+                Las jugadas permitidas quedan en `opciones` mientras dura el pedido.
+
+        Returns:
+            ResultadoRonda: El resultado de la ronda, en el valor de StopIteration.
+        """
+        self.__empezar_ronda()
+        for asiento, jugador in enumerate(self.jugadores):
+            apuesta = yield (APUESTA, jugador, None)
+            self.__apostar(asiento, jugador, min(max(1, apuesta), jugador.fichas))
+        self.__croupier_reparte_dos_cartas()
+        carta_visible = self.croupier.mano.cartas[1]
+        if self.__hay_seguro():
+            for asiento, jugador in enumerate(self.jugadores):
+                seguro = self.__seguro_posible(asiento, jugador)
+                if seguro and (yield (SEGURO, jugador, carta_visible)):
+                    self.__asegurar(asiento, seguro)
+        if not self.__croupier_revisa():
+            for asiento, jugador in enumerate(self.jugadores):
+                manos = self.__jugar_manos(asiento, jugador)
+                try:
+                    self.__opciones = next(manos)
+                    while True:
+                        jugada = yield (JUGADA, jugador, carta_visible)
+                        if not isinstance(jugada, str):
+                            jugada = PLANTARSE if jugada else PEDIR
+                        self.__opciones = manos.send(jugada)
+                except StopIteration:
+                    pass
+        self.__opciones = 0
+        return self.__terminar_ronda()
+
+    def rondas(self, cantidad: int = None):
+        """Juega rondas mientras haya jugadores, devolviendo cada resultado a medida que se produce.
+
+        Args:
+            cantidad (int, optional): Cantidad máxima de rondas. Por defecto juega hasta que no quedan jugadores.
+
+        Yields:
+            ResultadoRonda: El resultado de cada ronda jugada.
+        """
+        jugadas = 0
+        while self.__hay_jugadores() and (cantidad is None or jugadas < cantidad):
+            yield self.jugar_ronda()
+            jugadas += 1
+
+    def jugar(self) -> None:
+        """Inicia y controla el flujo del juego de BlackJack."""
+        while self.__hay_jugadores():
+            self.jugar_ronda()
+
+
+def main(ruta_datos: str = RUTA_DATOS):
+    # El motor no depende del almacenamiento: solo la partida por consola guarda las fichas
+    from persistencia import AlmacenSQLite, persistir
+
+    directorio = os.path.dirname(ruta_datos)
+    if directorio:
+        os.makedirs(directorio, exist_ok=True)
+    # Cada jugador vuelve con las fichas de la partida anterior; si se había quedado sin nada, empieza de nuevo
+    with AlmacenSQLite(ruta_datos, tamanio_lote=1) as almacen:
+        juego = BlackJack()
+        for clase, nombre in ((Humano, "Cris"), (Compu, "Batman"), (Humano, "Zotel"), (Compu, "Spider-man")):
+            fichas = almacen.fichas(nombre, 0)
+            juego.agregar_jugador(clase(nombre, fichas if fichas > 0 else FICHAS_INICIALES))
+        for _ in persistir(juego, almacen):
+            pass
+
+
+def _mesa_de_prueba(numeros: list, reglas: ReglasMesa, politica=None) -> BlackJack:
+    """Arma una mesa silenciosa con un bot de 100 fichas que apuesta 10 y un mazo con las cartas en ese orden.
+
+    Se reparten dos cartas al jugador, la tapada y la visible al croupier, y después las que se piden.
+    """
+    from barajado import BarajadoContinuo
+    from politicas import ApuestaFija, PlantarseEn
+    juego = BlackJack(interactivo=False, barajado=BarajadoContinuo(), reglas=reglas)
+    juego.mazo.clear()
+    for numero in numeros:
+        juego.mazo.poner_carta(CartaPoker(numero, 1))
+    juego.agregar_jugador(Bot("Prueba", 100, politica or PlantarseEn(17), ApuestaFija(10)))
+    return juego
+
 
+def test_pago_blackjack():
+    print("Se esta ejecutando el test del pago del Black Jack")
+    # A y K contra 10 tapado y 7 visible: 3 a 2 con las reglas por defecto, 1 a 1 con las clásicas
+    ronda = _mesa_de_prueba([1, 13, 10, 7], ReglasMesa()).jugar_ronda()
+    assert ronda.jugadores[0].ganancia == 15
+    ronda = _mesa_de_prueba([1, 13, 10, 7], REGLAS_CLASICAS).jugar_ronda()
+    assert ronda.jugadores[0].ganancia == 10
 
-def main():
 
-    juego = BlackJack()
-    juego.agregar_jugador(Humano("Cris", 100))
-    juego.agregar_jugador(Compu("Batman", 100))
-    juego.agregar_jugador(Humano("Zotel", 100))
-    juego.agregar_jugador(Compu("Spider-man", 100))
-    juego.jugar()
+def test_dividir_ases():
+    print("Se esta ejecutando el test de dividir ases")
+    # A y A contra 10 y 6: cada mano recibe una sola carta (2 y 3) y el croupier se pasa con el 10
+    juego = _mesa_de_prueba([1, 1, 10, 6, 2, 3, 10], ReglasMesa())
+    pasos = juego.ronda_paso_a_paso()
+    assert next(pasos)[0] == APUESTA
+    pedido = pasos.send(10)
+    assert pedido[0] == JUGADA and juego.opciones & PUEDE_DIVIDIR
+    try:
+        pedido = pasos.send(DIVIDIR)
+        raise AssertionError(f"Se pidió otra jugada con ases divididos: {pedido}")
+    except StopIteration as fin:
+        ronda = fin.value
+    assert ronda.jugadores[0].sumas == (13, 14)
+    assert ronda.jugadores[0].apostado == 20
+    assert ronda.suma_croupier == 26
+    assert ronda.jugadores[0].ganancia == 20
 
 
-main()
+if __name__ == '__main__':
+    import argparse
+    parser = argparse.ArgumentParser(description="BlackJack por consola")
+    parser.add_argument("--datos", default=RUTA_DATOS,
+                        help="archivo SQLite donde se guardan las fichas de los jugadores entre partidas")
+    args = parser.parse_args()
+    main(args.datos)
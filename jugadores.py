@@ -3,7 +3,10 @@ from txtcolores import strclr
 import utilidades2 as util
 from abc import ABC, abstractmethod
 from cartas import Carta, CartaPoker, CartaEspaniola
-from mazos import MazoBlackJack, Mazo
+from mazos import MazoBlackJack, ManoBlackJack, Mazo
+from politicas import PoliticaJuego, PoliticaApuesta
+from estrategia import PEDIR, PLANTARSE, DOBLAR, DIVIDIR, RENDIRSE
+from reglas import PUEDE_DOBLAR, PUEDE_DIVIDIR, PUEDE_RENDIRSE
 import random
 
 
@@ -75,12 +78,12 @@ class JugadorBlackJack(JugadorCartas, Plantable):
     específicas de un jugador en el juego de BlackJack.
     """
     def __init__(self, nombre: str) -> None:
-        """Inicializa un nuevo jugador de BlackJack con un nombre y un mazo de BlackJack.
+        """Inicializa un nuevo jugador de BlackJack con un nombre y una mano vacía.
 
         Args:
             nombre (str): El nombre del jugador.
         """
-        super().__init__(nombre, MazoBlackJack())
+        super().__init__(nombre, ManoBlackJack())
 
     def poner_carta(self, carta: CartaPoker, index: int = None) -> None:
         """Agrega una carta a la mano del jugador.
@@ -102,37 +105,49 @@ class JugadorBlackJack(JugadorCartas, Plantable):
         """
         return self.mano.sacar_carta(index)
 
+    def descartar_mano(self) -> list:
+        """Vacía la mano del jugador de una vez.
+
+        Returns:
+            list[CartaPoker]: Las cartas que tenía, en orden.
+        """
+        return self.mano.vaciar()
+
     def sumar_cartas(self) -> int:
         """Calcula la suma total de las cartas en la mano del jugador según las reglas de BlackJack.
 
         En BlackJack, los ases pueden valer 1 u 11 puntos, y esta función calcula el valor óptimo.
+        La mano mantiene su índice en la tabla de totales a medida que recibe cartas, así que
+        la consulta es una lectura de la tabla.
 
         Returns:
             int: La suma total de las cartas en la mano del jugador.
         """
-        cantidad_unos = 0
-        suma_numeros = 0
-        for carta in self.mano:
-            if carta.numero == 1:
-                cantidad_unos += 1
-            elif carta.numero >= 10:
-                suma_numeros += 10
-            else:
-                suma_numeros += carta.numero
-        suma = 0
-        if cantidad_unos == 0:
-            suma = suma_numeros
-        elif cantidad_unos == 1:
-            if 11 + suma_numeros > 21:
-                suma = 1 + suma_numeros
-            else:
-                suma = 11 + suma_numeros
-        else:
-            if suma_numeros + 11 + cantidad_unos - 1 > 21:
-                suma = suma_numeros + cantidad_unos
-            else:
-                suma = suma_numeros + 11 + cantidad_unos - 1
-        return suma
+        return self.mano.total
+
+    def isblanda(self) -> bool:
+        """Indica si la mano del jugador cuenta un as como 11.
+
+        Returns:
+            bool: True si la mano es blanda.
+        """
+        return self.mano.isblanda()
+
+    def isblackjack(self) -> bool:
+        """Indica si la mano del jugador es un Black Jack.
+
+        Returns:
+            bool: True si tiene 21 con dos cartas.
+        """
+        return self.mano.isblackjack()
+
+    def ispasado(self) -> bool:
+        """Indica si el jugador se pasó de 21.
+
+        Returns:
+            bool: True si la suma de sus cartas supera 21.
+        """
+        return self.mano.ispasada()
 
 
 class Croupier(JugadorBlackJack):
@@ -140,15 +155,34 @@ class Croupier(JugadorBlackJack):
 
     El croupier tiene reglas específicas para plantarse que están implementadas en el método me_planto.
     """
+    PLANTA_EN: int = 17
+
     def __init__(self) -> None:
         """Inicializa al croupier con el nombre 'Sr. Croupier'."""
         super().__init__("Sr. Croupier")
 
-    def me_planto(self) -> bool:
+    def plantarse_por_regla(self, pide_17_blando: bool = False) -> bool:
+        """Decide si el croupier se planta sin mostrar nada por consola.
+
+        Args:
+            pide_17_blando (bool, optional): Si la mesa obliga a pedir con 17 blando. Por defecto es False.
+
+        Returns:
+            bool: True si la suma de sus cartas es mayor o igual a PLANTA_EN.
+        """
+        suma = self.sumar_cartas()
+        if pide_17_blando and suma == Croupier.PLANTA_EN:
+            return not self.isblanda()
+        return suma >= Croupier.PLANTA_EN
+
+    def me_planto(self, pide_17_blando: bool = False) -> bool:
         """Decide si el croupier se planta según las reglas de BlackJack.
 
         El croupier se planta si la suma de sus cartas es mayor o igual a 17 y no se ha pasado de 21.
 
+        Args:
+            pide_17_blando (bool, optional): Si la mesa obliga a pedir con 17 blando. Por defecto es False.
+
         Returns:
             bool: True si el croupier se planta, False si decide tomar otra carta.
         """
@@ -158,7 +192,7 @@ class Croupier(JugadorBlackJack):
         if suma > 21:
             print(strclr("Se paso", 'red'))
             system('pause')
-        elif suma >= 17:
+        elif self.plantarse_por_regla(pide_17_blando):
             print("¿Se planta? [S/N]: S")
             system('pause')
         else:
@@ -188,8 +222,15 @@ class Cliente(JugadorBlackJack, Apostable):
 
     Esta clase hereda de JugadorBlackJack y Apostable, permitiendo al cliente apostar y jugar BlackJack.
 
+    Un cliente que divide juega varias manos en la misma ronda. `mano` es siempre
+    la mano activa, así que los métodos heredados (sumar_cartas, poner_carta, etc.)
+    trabajan sobre ella. Las manos se reusan de una ronda a otra.
+
     Atributos:
         __fichas (int): La cantidad de fichas que el cliente posee para apostar.
+        __manos (list[ManoBlackJack]): Las manos del cliente; las primeras __cantidad_manos están en juego.
+        __cantidad_manos (int): Cantidad de manos en juego.
+        __activa (int): Posición de la mano que se está jugando.
     """
 
     def __init__(self, nombre: str, fichas: int) -> None:
@@ -201,6 +242,113 @@ class Cliente(JugadorBlackJack, Apostable):
         """
         super().__init__(nombre)
         self.__fichas:int = fichas
+        self.__manos: list[ManoBlackJack] = [super().mano]
+        self.__cantidad_manos: int = 1
+        self.__activa: int = 0
+
+    @property
+    def mano(self) -> ManoBlackJack:
+        """Obtiene la mano que se está jugando (la única, si no dividió).
+
+        Returns:
+            ManoBlackJack: La mano activa.
+        """
+        return self.__manos[self.__activa]
+
+    @property
+    def manos(self) -> list[ManoBlackJack]:
+        """Obtiene las manos en juego, en el orden en que se juegan.
+
+        Returns:
+            list[ManoBlackJack]: Una lista nueva con las manos.
+        """
+        return self.__manos[:self.__cantidad_manos]
+
+    @property
+    def cantidad_manos(self) -> int:
+        """Obtiene la cantidad de manos en juego."""
+        return self.__cantidad_manos
+
+    @property
+    def apuesta(self) -> int:
+        """Obtiene las fichas apostadas entre todas las manos en juego."""
+        manos = self.__manos
+        apuesta = 0
+        for indice in range(self.__cantidad_manos):
+            apuesta += manos[indice].apuesta
+        return apuesta
+
+    def activar(self, indice: int) -> None:
+        """Elige la mano que se juega.
+
+        Args:
+            indice (int): Posición de la mano, entre 0 y cantidad_manos - 1.
+
+        Raises:
+            IndexError: Si no hay una mano en juego en esa posición.
+        """
+        if not 0 <= indice < self.__cantidad_manos:
+            raise IndexError("El cliente no tiene una mano en esa posición")
+        self.__activa = indice
+
+    def dividir(self) -> ManoBlackJack:
+        """Divide el par de la mano activa.
+
+        La segunda carta pasa a una mano nueva, con la misma apuesta, que se juega
+        inmediatamente después de la activa.
+
+        Returns:
+            ManoBlackJack: La mano nueva.
+
+        Raises:
+            ValueError: Si la mano activa no tiene dos cartas.
+        """
+        if self.__cantidad_manos == len(self.__manos):
+            self.__manos.append(ManoBlackJack())
+        nueva = self.__manos.pop(self.__cantidad_manos)
+        self.mano.dividir(nueva)
+        self.__manos.insert(self.__activa + 1, nueva)
+        self.__cantidad_manos += 1
+        return nueva
+
+    def descartar_manos(self) -> list:
+        """Vacía todas las manos y vuelve a jugar con una sola.
+
+        Returns:
+            list[CartaPoker]: Las cartas de las manos, en el orden en que se jugaron.
+        """
+        if self.__cantidad_manos == 1:
+            descartes = self.__manos[0].vaciar()
+        else:
+            descartes = []
+            for indice in range(self.__cantidad_manos):
+                descartes += self.__manos[indice].vaciar()
+        self.__cantidad_manos = 1
+        self.__activa = 0
+        return descartes
+
+    def decidir(self, carta_croupier: CartaPoker = None, opciones: int = 0) -> str:
+        """Elige la jugada de la mano activa.
+
+        Por defecto solo pide o se planta, según me_planto.
+
+        Args:
+            carta_croupier (CartaPoker, optional): La carta visible del croupier.
+            opciones (int, optional): Jugadas permitidas además de pedir y plantarse
+                (PUEDE_DOBLAR, PUEDE_DIVIDIR, PUEDE_RENDIRSE).
+
+        Returns:
+            str: PEDIR, PLANTARSE, DOBLAR, DIVIDIR o RENDIRSE.
+        """
+        return PLANTARSE if self.me_planto() else PEDIR
+
+    def tomo_seguro(self, carta_croupier: CartaPoker = None) -> bool:
+        """Decide si toma seguro cuando el croupier muestra un as. Por defecto no lo toma.
+
+        Returns:
+            bool: True si toma seguro.
+        """
+        return False
 
     @property
     def fichas(self) -> int:
@@ -287,6 +435,39 @@ class Humano(Cliente):
             respuesta = util.continua("¿Se planta?")
         return respuesta
 
+    def decidir(self, carta_croupier: CartaPoker = None, opciones: int = 0) -> str:
+        """Permite al jugador humano elegir la jugada entre las permitidas.
+
+        Si solo puede pedir o plantarse pregunta como me_planto.
+
+        Returns:
+            str: PEDIR, PLANTARSE, DOBLAR, DIVIDIR o RENDIRSE.
+        """
+        if not opciones:
+            return super().decidir(carta_croupier, opciones)
+        jugadas = {"P": PEDIR, "S": PLANTARSE}
+        textos = ["[P]edir", "[S]e planta"]
+        for opcion, letra, jugada, texto in ((PUEDE_DOBLAR, "D", DOBLAR, "[D]oblar"),
+                                             (PUEDE_DIVIDIR, "V", DIVIDIR, "Di[v]idir"),
+                                             (PUEDE_RENDIRSE, "R", RENDIRSE, "[R]endirse")):
+            if opciones & opcion:
+                jugadas[letra] = jugada
+                textos.append(texto)
+        print(self)
+        respuesta = ""
+        while respuesta not in jugadas:
+            respuesta = input(f"{' '.join(textos)}: ").strip().upper()
+        return jugadas[respuesta]
+
+    def tomo_seguro(self, carta_croupier: CartaPoker = None) -> bool:
+        """Pregunta al jugador humano si toma seguro.
+
+        Returns:
+            bool: True si toma seguro.
+        """
+        print(self)
+        return util.continua("¿Toma seguro?")
+
 
 class Compu(Cliente):
     """Representa a un jugador computarizado en un juego de BlackJack.
@@ -301,14 +482,17 @@ class Compu(Cliente):
     TRAN: int = 1
     LOCO: int = 100
 
-    def __init__(self, nombre: str, fichas: int) -> None:
+    def __init__(self, nombre: str, fichas: int, generador: random.Random = None) -> None:
         """Inicializa un nuevo jugador computarizado con un nombre y una cantidad inicial de fichas.
 
         Args:
             nombre (str): El nombre del jugador computarizado.
             fichas (int): La cantidad inicial de fichas del jugador.
+            generador (random.Random, optional): Generador de números aleatorios del jugador.
+                Por defecto se usa el módulo random.
         """
         super().__init__(nombre, fichas)
+        self.__generador = random if generador is None else generador
         self.__personalidad: int = self.__obtener_personalidad()
 
     @property
@@ -335,7 +519,7 @@ class Compu(Cliente):
         else:
             desde = 1
             hasta = self.fichas // 2
-        cantidad = random.randint(desde, hasta)
+        cantidad = self.__generador.randint(desde, hasta)
         print(f"Cantidad fichas: {cantidad}")
         system('pause')
         return cantidad
@@ -378,7 +562,7 @@ class Compu(Cliente):
         Returns:
             int: Un número aleatorio entre TRAN y LOCO.
         """
-        return random.randint(Compu.TRAN, Compu.LOCO)
+        return self.__generador.randint(Compu.TRAN, Compu.LOCO)
 
     def __obtener_personalidad(self) -> int:
         """Obtiene un valor aleatorio que representa la personalidad del jugador computarizado.
@@ -386,7 +570,82 @@ class Compu(Cliente):
         Returns:
             int: Un número aleatorio entre TRAN y LOCO que define la personalidad del jugador.
         """
-        return random.randint(Compu.TRAN, Compu.LOCO)
+        return self.__generador.randint(Compu.TRAN, Compu.LOCO)
+
+
+class Bot(Cliente):
+    """Representa a un jugador automático que no interactúa con la consola.
+
+    Las decisiones de juego y de apuesta se delegan en políticas, lo que permite
+    usarlo en el modo silencioso de BlackJack.
+
+    Atributos:
+        __politica_juego (PoliticaJuego): Decide si el bot se planta.
+        __politica_apuesta (PoliticaApuesta): Decide cuántas fichas apuesta.
+    """
+
+    def __init__(self, nombre: str, fichas: int,
+                 politica_juego: PoliticaJuego, politica_apuesta: PoliticaApuesta) -> None:
+        """Inicializa un nuevo bot con su nombre, fichas y políticas.
+
+        Args:
+            nombre (str): El nombre del bot.
+            fichas (int): La cantidad inicial de fichas del bot.
+            politica_juego (PoliticaJuego): La política para plantarse o pedir carta.
+            politica_apuesta (PoliticaApuesta): La política para apostar.
+        """
+        super().__init__(nombre, fichas)
+        self.__politica_juego: PoliticaJuego = politica_juego
+        self.__politica_apuesta: PoliticaApuesta = politica_apuesta
+
+    @property
+    def politica_juego(self) -> PoliticaJuego:
+        """Obtiene la política de juego del bot."""
+        return self.__politica_juego
+
+    @property
+    def politica_apuesta(self) -> PoliticaApuesta:
+        """Obtiene la política de apuesta del bot."""
+        return self.__politica_apuesta
+
+    def apuesto(self) -> int:
+        """Realiza la apuesta indicada por la política de apuesta.
+
+        Returns:
+            int: La cantidad de fichas apostadas por el bot.
+        """
+        return self.__politica_apuesta.apuesto(self)
+
+    def me_planto(self, carta_croupier: CartaPoker = None) -> bool:
+        """Decide si se planta según la política de juego.
+
+        Args:
+            carta_croupier (CartaPoker, optional): La carta visible del croupier.
+
+        Returns:
+            bool: True si el bot se planta, False si pide otra carta.
+        """
+        return self.__politica_juego.me_planto(self, carta_croupier)
+
+    def decidir(self, carta_croupier: CartaPoker = None, opciones: int = 0) -> str:
+        """Elige la jugada de la mano activa según la política de juego.
+
+        Args:
+            carta_croupier (CartaPoker, optional): La carta visible del croupier.
+            opciones (int, optional): Jugadas permitidas además de pedir y plantarse.
+
+        Returns:
+            str: PEDIR, PLANTARSE, DOBLAR, DIVIDIR o RENDIRSE.
+        """
+        return self.__politica_juego.decidir(self, carta_croupier, opciones)
+
+    def tomo_seguro(self, carta_croupier: CartaPoker = None) -> bool:
+        """Decide si toma seguro según la política de juego.
+
+        Returns:
+            bool: True si toma seguro.
+        """
+        return self.__politica_juego.tomo_seguro(self, carta_croupier)
 
 
 if __name__ == "__main__":
@@ -395,9 +654,7 @@ if __name__ == "__main__":
     m.barajar()
     print(len(m))
     cr = Croupier()
-    c = m.sacar_carta()
-    c.tapar()
-    cr.poner_carta(c)
+    cr.poner_carta(m.sacar_carta().tapar())
     cr.poner_carta(m.sacar_carta())
     print(cr)
 
@@ -405,8 +662,6 @@ if __name__ == "__main__":
     h.poner_carta(m.sacar_carta())
     h.poner_carta(m.sacar_carta())
     print(h)
-    c = h.sacar_carta()
-    c.tapar()
-    h.poner_carta(c, 0)
+    h.mano.tapar(0)
     print(h)
     print(len(m))
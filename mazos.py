@@ -6,11 +6,17 @@ Este módulo contiene definiciones para la representación y manejo de cartas y
 
 Clases:
     - CartaPoker: Representa una carta individual de un mazo de póker.
+    - ObservadorMazo: Interfaz para enterarse de las cartas que salen y vuelven al mazo de Black Jack.
+    - BandejaDescarte: Guarda las cartas usadas hasta que vuelven al mazo de Black Jack.
     - MazoPoker: Representa un mazo completo de 52 cartas de póker.
+    - MazoBlackJack: Representa el mazo de 6 mazos de póker del Black Jack.
+    - ManoBlackJack: Representa las cartas en la mano de un jugador de Black Jack.
 
 Funciones principales:
     - sacar_carta: Retorna y remueve la carta superior del mazo.
     - poner_carta: Agrega una carta al final del mazo.
+    - poner_cartas: Agrega varias cartas al final del mazo de una vez.
+    - vaciar: Retorna todas las cartas del mazo y lo deja vacío.
     - barajar: Baraja las cartas del mazo de manera aleatoria.
     - isvacio: Retorna `True` si el mazo no tiene cartas y `False` en caso contrario.
 
@@ -30,26 +36,35 @@ Fecha: 05/04/2024
 
 from abc import ABC, abstractmethod
 from cartas import Carta, CartaPoker, CartaEspaniola
+from totales import TOTALES, BLANDAS, LIMITE
 import random
 
 class Mazo(ABC):
     """Clase qye representa un mazo de cartas."""
     
-    def __init__(self, con_cartas: bool = False, tapado: bool = False) -> None:
+    def __init__(self, con_cartas: bool = False, tapado: bool = False, generador: random.Random = None) -> None:
         """
         Inicializa el mazo de Poker.
 
         Args:
             con_cartas (bool, optional): Si el mazo debe ser inicializado con cartas. Por defecto es False.
             tapado (bool, optional): Si las cartas deben ser inicializadas tapadas. Por defecto es False.
+            generador (random.Random, optional): Generador de números aleatorios para barajar y cortar.
+                Por defecto se usa el módulo random.
         """
         self.__cartas: list = []
+        self.__generador = random if generador is None else generador
         if con_cartas:
             self.llenar(tapado)
 
     @property
     def cartas(self)-> list:
         return self.__cartas
+
+    @property
+    def generador(self) -> random.Random:
+        """Retorna el generador de números aleatorios del mazo."""
+        return self.__generador
     
     def clear(self):
         """Limpia el mazo eliminando todas las cartas"""
@@ -62,6 +77,25 @@ class Mazo(ABC):
     def isvacio(self) -> bool:
         """Verifica si el mazo está vacío."""
         return len(self) == 0
+
+    def vaciar(self) -> list:
+        """Retorna las cartas del mazo y lo deja vacío, sin copiarlas una por una.
+
+        Returns:
+            list: Las cartas que tenía el mazo, en orden.
+        """
+        cartas = self.__cartas
+        self.__cartas = []
+        return cartas
+
+    def poner_cartas(self, cartas: list) -> None:
+        """Agrega varias cartas al final del mazo, en orden.
+
+        Args:
+            cartas (list): Las cartas a agregar.
+        """
+        for carta in cartas:
+            self.poner_carta(carta)
     
     @abstractmethod
     def poner_carta(self, carta: Carta, index: int = None) -> None:
@@ -78,14 +112,14 @@ class Mazo(ABC):
 
     def barajar(self) -> None:
         """Baraja las cartas del mazo."""
-        random.shuffle(self.cartas)
+        self.__generador.shuffle(self.cartas)
 
     def cortar(self) -> None:
         """
         Corta el mazo en una posición aleatoria y coloca la parte inferior arriba.
         """
-        posicion = random.randint(0, len(self) - 1)
-        self.cartas = self.cartas[posicion:] + self.cartas[:posicion]
+        posicion = self.__generador.randint(0, len(self) - 1)
+        self.cartas[:] = self.cartas[posicion:] + self.cartas[:posicion]
 
     def __str__(self) -> str:
         """Retorna la representación en cadena del mazo."""
@@ -105,8 +139,8 @@ class Mazo(ABC):
         
 class MazoPoker(Mazo):
 
-    def __init__(self, con_cartas: bool = False, tapado: bool = False) -> None:
-        super().__init__(con_cartas, tapado)
+    def __init__(self, con_cartas: bool = False, tapado: bool = False, generador: random.Random = None) -> None:
+        super().__init__(con_cartas, tapado, generador)
 
     def llenar(self, tapado: bool = False) -> None:
         """Llena el mazo con 52 cartas de Poker."""
@@ -151,29 +185,165 @@ class MazoPoker(Mazo):
 
 
 
-class MazoBlackJack(Mazo):
-    """Clase que representa un mazo de cartas de Black Jack."""
+class ManoBlackJack(Mazo):
+    """Clase que representa las cartas que un jugador tiene en la mano.
 
-    
-    def __init__(self, con_cartas: bool = False, tapado: bool = False) -> None:
-        """ Inicializa el mazo de Black Jack. """
-        super().__init__(con_cartas, tapado)
+    A diferencia del mazo de Black Jack, la mano guarda las cartas como objetos
+    porque cada una puede estar tapada o destapada.
+
+    La mano lleva la cuenta de la cantidad de ases y de su índice en las tablas de
+    `totales` (la suma "dura", contando los ases como 1, y si tiene algún as) a
+    medida que se ponen y se sacan cartas, de modo que el total y si es blanda se
+    leen de una tabla y si es Black Jack o si se pasó se responden en O(1). Las
+    cartas deben ponerse y sacarse con `poner_carta` y `sacar_carta`.
+
+    La mano también guarda su apuesta y lo que se hizo con ella (doblar, dividir,
+    rendirse), porque un jugador que divide juega varias manos en la misma ronda.
+    `clear` deja la mano lista para reusarla en la ronda siguiente.
+
+    Atributos:
+        __indice (int): La suma de las cartas contando los ases como 1 y las figuras como 10,
+            por 2, más 1 si hay algún as (ver totales.indice).
+        __ases (int): Cantidad de ases en la mano.
+        __apuesta (int): Fichas apostadas en la mano.
+        __doblada (bool): Si se dobló la apuesta.
+        __dividida (bool): Si la mano salió de dividir un par.
+        __rendida (bool): Si el jugador se rindió con esta mano.
+    """
+
+    def __init__(self) -> None:
+        """ Inicializa una mano vacía. """
+        self.__indice: int = 0
+        self.__ases: int = 0
+        self.__apuesta: int = 0
+        self.__doblada: bool = False
+        self.__dividida: bool = False
+        self.__rendida: bool = False
+        super().__init__()
+
+    @property
+    def suma_dura(self) -> int:
+        """Retorna la suma de la mano contando los ases como 1."""
+        return self.__indice >> 1
+
+    @property
+    def ases(self) -> int:
+        """Retorna la cantidad de ases en la mano."""
+        return self.__ases
+
+    @property
+    def total(self) -> int:
+        """Retorna el mejor total de la mano: un as vale 11 si no se pasa de 21."""
+        indice = self.__indice
+        return TOTALES[indice] if indice < LIMITE else indice >> 1
+
+    @property
+    def apuesta(self) -> int:
+        """Retorna las fichas apostadas en la mano."""
+        return self.__apuesta
+
+    @property
+    def doblada(self) -> bool:
+        """Retorna True si se dobló la apuesta de la mano."""
+        return self.__doblada
+
+    @property
+    def dividida(self) -> bool:
+        """Retorna True si la mano salió de dividir un par."""
+        return self.__dividida
+
+    @property
+    def rendida(self) -> bool:
+        """Retorna True si el jugador se rindió con esta mano."""
+        return self.__rendida
+
+    def apostar(self, cantidad: int) -> None:
+        """Fija la apuesta de la mano."""
+        self.__apuesta = cantidad
+
+    def doblar(self) -> None:
+        """Dobla la apuesta de la mano."""
+        self.__apuesta *= 2
+        self.__doblada = True
+
+    def rendir(self) -> None:
+        """Marca la mano como rendida."""
+        self.__rendida = True
+
+    def dividir(self, otra: "ManoBlackJack") -> None:
+        """Pasa la segunda carta a otra mano vacía, que queda con la misma apuesta.
+
+        Args:
+            otra (ManoBlackJack): La mano nueva.
+
+        Raises:
+            ValueError: Si la mano no tiene exactamente dos cartas o la otra no está vacía.
+        """
+        if len(self) != 2 or not otra.isvacio():
+            raise ValueError("Solo se divide una mano de dos cartas en una mano vacía")
+        otra.poner_carta(self.sacar_carta(1))
+        otra.__apuesta = self.__apuesta
+        self.__dividida = otra.__dividida = True
+
+    def isblanda(self) -> bool:
+        """Retorna True si la mano es blanda, es decir, si cuenta un as como 11."""
+        indice = self.__indice
+        return indice < LIMITE and BLANDAS[indice] == 1
+
+    def isblackjack(self) -> bool:
+        """Retorna True si la mano es un Black Jack (21 con dos cartas)."""
+        # Suma dura 11 con un as: 11 * 2 + 1
+        return len(self) == 2 and self.__indice == 23
+
+    def isnatural(self) -> bool:
+        """Retorna True si la mano es un Black Jack de las dos primeras cartas, sin haber dividido."""
+        return not self.__dividida and self.isblackjack()
+
+    def ispasada(self) -> bool:
+        """Retorna True si la mano se pasó de 21."""
+        # Suma dura de 22 o más, con o sin as
+        return self.__indice >= 44
+
+    def tapar(self, index: int = 0) -> None:
+        """Tapa la carta en la posición indicada. Por defecto es la primera."""
+        self.cartas[index] = self.cartas[index].tapar()
+
+    def destapar(self, index: int = 0) -> None:
+        """Destapa la carta en la posición indicada. Por defecto es la primera."""
+        self.cartas[index] = self.cartas[index].destapar()
+
+    def clear(self):
+        """Limpia la mano eliminando todas las cartas"""
+        super().clear()
+        self.__reiniciar()
+
+    def vaciar(self) -> list:
+        """Retorna las cartas de la mano y la deja lista para la ronda siguiente, como `clear`.
+
+        Returns:
+            list[CartaPoker]: Las cartas que tenía la mano, en orden.
+        """
+        cartas = super().vaciar()
+        self.__reiniciar()
+        return cartas
+
+    def __reiniciar(self) -> None:
+        """Pone en cero la suma, los ases, la apuesta y lo que se hizo con la mano."""
+        self.__indice = 0
+        self.__ases = 0
+        self.__apuesta = 0
+        self.__doblada = self.__dividida = self.__rendida = False
 
     def llenar(self, tapado: bool = False) -> None:
-        """Llena el mazo con las 312 cartas de Poker."""
+        """Una mano llena es una mano vacía: las cartas las recibe del mazo. Equivale a `clear`."""
         self.clear()
-        for m in range(1, 7):
-            for n in range(1, 14):
-                for p in range(1, 5):
-                    self.poner_carta(CartaPoker(n, p, tapado))
 
-    
     def poner_carta(self, carta: CartaPoker, index: int = None) -> None:
         """
-        Agrega una carta al mazo.
+        Agrega una carta a la mano.
 
         Args:
-            carta (Carta): Carta a agregar al mazo.
+            carta (Carta): Carta a agregar a la mano.
             index (int, optional): Posición donde insertar la carta. Por defecto es al final.
 
         Raises:
@@ -186,6 +356,351 @@ class MazoBlackJack(Mazo):
             self.cartas.append(carta)
         else:
             self.cartas.insert(index, carta)
+        numero = carta.numero
+        if numero == 1:
+            if not self.__ases:
+                self.__indice += 1
+            self.__ases += 1
+        self.__indice += 20 if numero >= 10 else numero << 1
+
+    def sacar_carta(self, index: int = None) -> CartaPoker:
+        """
+        Saca una carta de la mano.
+
+        Args:
+            index (int, optional): Posición de la carta a sacar. Por defecto es la primera.
+
+        Returns:
+            CartaPoker: Carta sacada de la mano.
+        """
+        carta = self.cartas.pop(0 if index is None else index)
+        numero = carta.numero
+        if numero == 1:
+            self.__ases -= 1
+            if not self.__ases:
+                self.__indice -= 1
+        self.__indice -= 20 if numero >= 10 else numero << 1
+        return carta
+
+
+class ObservadorMazo(ABC):
+    """Interfaz para seguir los cambios de un MazoBlackJack (por ejemplo, para contar cartas).
+
+    Las cartas se informan por su código (0..51, ver MazoBlackJack.codificar).
+    """
+
+    @abstractmethod
+    def al_sacar(self, codigo: int) -> None:
+        """Se sacó del mazo (y quedó a la vista) la carta con ese código."""
+        pass
+
+    @abstractmethod
+    def al_devolver(self, codigo: int) -> None:
+        """Volvió al mazo la carta con ese código."""
+        pass
+
+    @abstractmethod
+    def al_reiniciar(self, mazo: "MazoBlackJack") -> None:
+        """Cambiaron en bloque las cartas del mazo (se llenó, se barajó o se recogieron descartes)."""
+        pass
+
+
+def _codificar_cartas(cartas: list) -> bytes:
+    """Retorna los códigos (0..51) de las cartas, en orden.
+
+    Raises:
+        ValueError: Si alguna no es una instancia de CartaPoker.
+    """
+    for carta in cartas:
+        if not isinstance(carta, CartaPoker):
+            raise ValueError(f"{carta} No es un una Carta de Poker")
+    return bytes([(carta.numero - 1) * 4 + carta.palo - 1 for carta in cartas])
+
+
+class BandejaDescarte:
+    """Bandeja donde quedan las cartas usadas hasta que se recogen para volver al mazo.
+
+    Guarda las cartas como códigos de un byte (ver MazoBlackJack.codificar), así que
+    descartar una mano entera es agregar unos bytes al final.
+
+    Atributos:
+        __codigos (bytearray): Códigos de las cartas descartadas, en el orden en que llegaron.
+    """
+
+    def __init__(self) -> None:
+        """Inicializa una bandeja vacía."""
+        self.__codigos: bytearray = bytearray()
+
+    @property
+    def codigos(self) -> bytes:
+        """Retorna una copia de los códigos de las cartas de la bandeja."""
+        return bytes(self.__codigos)
+
+    def __len__(self) -> int:
+        """Retorna el número de cartas en la bandeja."""
+        return len(self.__codigos)
+
+    def isvacia(self) -> bool:
+        """Retorna True si la bandeja no tiene cartas."""
+        return not self.__codigos
+
+    def poner_carta(self, carta: CartaPoker) -> None:
+        """
+        Pone una carta en la bandeja.
+
+        Raises:
+            ValueError: Si el argumento no es una instancia de CartaPoker.
+        """
+        if not isinstance(carta, CartaPoker):
+            raise ValueError(f"{carta} No es un una Carta de Poker")
+        self.__codigos.append((carta.numero - 1) * 4 + carta.palo - 1)
+
+    def poner_cartas(self, cartas: list) -> None:
+        """
+        Pone varias cartas en la bandeja de una vez.
+
+        Raises:
+            ValueError: Si alguna no es una instancia de CartaPoker.
+        """
+        self.__codigos += _codificar_cartas(cartas)
+
+    def vaciar(self) -> bytearray:
+        """Retorna los códigos de las cartas de la bandeja y la deja vacía."""
+        codigos = self.__codigos
+        self.__codigos = bytearray()
+        return codigos
+
+    def clear(self) -> None:
+        """Vacía la bandeja."""
+        self.__codigos.clear()
+
+
+class MazoBlackJack(Mazo):
+    """Clase que representa un mazo de cartas de Black Jack.
+
+    Las cartas se guardan como códigos de un byte (0..51) en un `bytearray`, con un
+    cursor que apunta a la carta de arriba. Sacar la carta de arriba es O(1), barajar
+    y cortar trabajan sobre los bytes sin crear objetos, y las `CartaPoker` solo se
+    crean cuando se sacan del mazo o cuando se muestra el mazo.
+
+    Las cartas usadas pueden volver al mazo (`poner_carta`), insertarse en una posición
+    al azar (`insertar_al_azar`, como una barajadora continua) o ir a la bandeja de
+    descarte (`descartar`, `descartar_cartas`) hasta que se recojan con `recoger_descartes`.
+    `poner_cartas` y `descartar_cartas` mueven una mano entera de una vez. Si el mazo se
+    queda sin cartas en medio de una ronda y hay cartas en la bandeja, se recogen y se
+    barajan antes de sacar la siguiente.
+
+    Los observadores (`agregar_observador`) se enteran de cada carta que sale o vuelve
+    al mazo. La carta tapada del croupier se saca con `sacar_carta_tapada` y se les
+    informa recién cuando se da vuelta, con `mostrar`; mientras tanto queda en `tapadas`.
+
+    Atributos:
+        MAZOS (int): Cantidad de mazos de póker por defecto.
+        __codigos (bytearray): Códigos de las cartas; las anteriores a __inicio ya se sacaron.
+        __inicio (int): Posición de la carta de arriba del mazo.
+        __bandeja (BandejaDescarte): La bandeja de descarte.
+        __tapadas (bytearray): Códigos de las cartas sacadas tapadas que todavía no se mostraron.
+        __observadores (list[ObservadorMazo]): Quienes se enteran de los cambios del mazo.
+    """
+
+    MAZOS: int = 6
+    # Cantidad de cartas ya sacadas a partir de la cual conviene compactar el buffer
+    COMPACTAR_DESDE: int = 256
+
+    def __init__(self, con_cartas: bool = False, tapado: bool = False, mazos: int = MAZOS,
+                 generador: random.Random = None) -> None:
+        """ Inicializa el mazo de Black Jack.
+
+        Args:
+            con_cartas (bool, optional): Si el mazo debe ser inicializado con cartas. Por defecto es False.
+            tapado (bool, optional): Si las cartas deben ser inicializadas tapadas. Por defecto es False.
+            mazos (int, optional): Cantidad de mazos de póker que forman el mazo. Por defecto es MAZOS.
+            generador (random.Random, optional): Generador de números aleatorios para barajar y cortar.
+                Por defecto se usa el módulo random.
+        """
+        self.__codigos: bytearray = bytearray()
+        self.__inicio: int = 0
+        self.__bandeja: BandejaDescarte = BandejaDescarte()
+        self.__tapadas: bytearray = bytearray()
+        self.__observadores: list[ObservadorMazo] = []
+        self.__tapado: bool = tapado
+        self.__mazos: int = mazos
+        super().__init__(con_cartas, tapado, generador)
+
+    @staticmethod
+    def codificar(carta: CartaPoker) -> int:
+        """Retorna el código (0..51) de una carta."""
+        return (carta.numero - 1) * 4 + carta.palo - 1
+
+    def decodificar(self, codigo: int) -> CartaPoker:
+        """Retorna la carta que corresponde a un código."""
+        return CartaPoker.de_codigo(codigo, self.__tapado)
+
+    @property
+    def mazos(self) -> int:
+        """Retorna la cantidad de mazos de póker que forman el mazo."""
+        return self.__mazos
+
+    @property
+    def codigos(self) -> bytes:
+        """Retorna una copia de los códigos de las cartas que quedan, de arriba hacia abajo."""
+        return bytes(self.__codigos[self.__inicio:])
+
+    @property
+    def cartas(self) -> list:
+        """Retorna una lista nueva con las cartas que quedan en el mazo.
+
+        Modificar la lista no modifica el mazo.
+        """
+        return [self.decodificar(codigo) for codigo in self.__codigos[self.__inicio:]]
+
+    @property
+    def bandeja(self) -> BandejaDescarte:
+        """Retorna la bandeja de descarte."""
+        return self.__bandeja
+
+    @property
+    def descartes(self) -> bytes:
+        """Retorna una copia de los códigos de las cartas de la bandeja de descarte."""
+        return self.__bandeja.codigos
+
+    @property
+    def tapadas(self) -> bytes:
+        """Retorna una copia de los códigos de las cartas sacadas tapadas que todavía no se mostraron."""
+        return bytes(self.__tapadas)
+
+    @property
+    def total(self) -> int:
+        """Retorna la cantidad de cartas del mazo completo (mazos * 52)."""
+        return self.__mazos * 52
+
+    def agregar_observador(self, observador: ObservadorMazo) -> None:
+        """Agrega un observador, que empieza a partir del estado actual del mazo."""
+        self.__observadores.append(observador)
+        observador.al_reiniciar(self)
+
+    def quitar_observador(self, observador: ObservadorMazo) -> None:
+        """Quita un observador."""
+        self.__observadores.remove(observador)
+
+    def __reiniciar_observadores(self) -> None:
+        for observador in self.__observadores:
+            observador.al_reiniciar(self)
+
+    def clear(self):
+        """Limpia el mazo eliminando todas las cartas, también las de la bandeja de descarte."""
+        self.__codigos.clear()
+        self.__inicio = 0
+        self.__bandeja.clear()
+        self.__tapadas.clear()
+        self.__reiniciar_observadores()
+
+    def __len__(self) -> int:
+        """Retorna el número de cartas en el mazo."""
+        return len(self.__codigos) - self.__inicio
+
+    def __compactar(self) -> None:
+        """Elimina del buffer los códigos de las cartas ya sacadas."""
+        if self.__inicio:
+            del self.__codigos[:self.__inicio]
+            self.__inicio = 0
+
+    def llenar(self, tapado: bool = False) -> None:
+        """Llena el mazo con las 312 cartas de Poker."""
+        self.__tapado = tapado
+        self.__codigos = bytearray(range(52)) * self.__mazos
+        self.__inicio = 0
+        self.__bandeja.clear()
+        self.__tapadas.clear()
+        self.__reiniciar_observadores()
+
+    def vaciar(self) -> list:
+        """Retorna las cartas que quedan en el mazo y lo deja vacío (la bandeja no cambia)."""
+        cartas = self.cartas
+        self.__codigos = bytearray()
+        self.__inicio = 0
+        self.__reiniciar_observadores()
+        return cartas
+
+    def poner_carta(self, carta: CartaPoker, index: int = None) -> None:
+        """
+        Agrega una carta al mazo.
+
+        Args:
+            carta (Carta): Carta a agregar al mazo.
+            index (int, optional): Posición donde insertar la carta, entre las que quedan y como en
+                list.insert: las negativas cuentan desde abajo del mazo. Por defecto es al final.
+
+        Raises:
+            ValueError: Si el argumento no es una instancia de Carta.
+        """
+        if not isinstance(carta, CartaPoker):
+            raise ValueError(f"{carta} No es un una Carta de Poker")
+
+        codigo = (carta.numero - 1) * 4 + carta.palo - 1
+        if index is None:
+            self.__codigos.append(codigo)
+        else:
+            # Nunca antes del cursor, donde están las cartas ya sacadas
+            if index < 0:
+                index = max(0, index + len(self))
+            self.__codigos.insert(self.__inicio + min(index, len(self)), codigo)
+        for observador in self.__observadores:
+            observador.al_devolver(codigo)
+
+    def poner_cartas(self, cartas: list) -> None:
+        """
+        Agrega varias cartas al final del mazo de una vez.
+
+        Raises:
+            ValueError: Si alguna no es una instancia de CartaPoker.
+        """
+        codigos = _codificar_cartas(cartas)
+        self.__codigos += codigos
+        for observador in self.__observadores:
+            for codigo in codigos:
+                observador.al_devolver(codigo)
+
+    def insertar_al_azar(self, carta: CartaPoker) -> None:
+        """
+        Inserta una carta en una posición al azar entre las que quedan, como una barajadora continua.
+
+        Si las cartas del mazo están en un orden aleatorio, siguen estándolo después de
+        insertar la carta, sin tener que barajar todo el mazo.
+
+        Raises:
+            ValueError: Si el argumento no es una instancia de Carta.
+        """
+        if not isinstance(carta, CartaPoker):
+            raise ValueError(f"{carta} No es un una Carta de Poker")
+        posicion = self.__inicio + self.generador.randint(0, len(self))
+        codigo = (carta.numero - 1) * 4 + carta.palo - 1
+        self.__codigos.insert(posicion, codigo)
+        for observador in self.__observadores:
+            observador.al_devolver(codigo)
+
+    def descartar(self, carta: CartaPoker) -> None:
+        """
+        Pone una carta en la bandeja de descarte.
+
+        Raises:
+            ValueError: Si el argumento no es una instancia de Carta.
+        """
+        self.__bandeja.poner_carta(carta)
+
+    def descartar_cartas(self, cartas: list) -> None:
+        """
+        Pone varias cartas en la bandeja de descarte de una vez.
+
+        Raises:
+            ValueError: Si alguna no es una instancia de CartaPoker.
+        """
+        self.__bandeja.poner_cartas(cartas)
+
+    def recoger_descartes(self) -> None:
+        """Vuelve a poner las cartas de la bandeja de descarte debajo del mazo."""
+        self.__codigos += self.__bandeja.vaciar()
+        self.__reiniciar_observadores()
 
     def sacar_carta(self, index: int = None) -> CartaPoker:
         """
@@ -196,10 +711,80 @@ class MazoBlackJack(Mazo):
 
         Returns:
             CartaPoker: Carta sacada del mazo.
+
+        Raises:
+            IndexError: Si el mazo y la bandeja de descarte están vacíos, o el índice no existe.
         """
-        if index is None:
-            return self.cartas.pop(0)
-        return self.cartas.pop(index)
+        if index is not None:
+            if not -len(self) <= index < len(self):
+                raise IndexError("El mazo no tiene una carta en esa posición")
+            if index < 0:
+                index += len(self)
+            posicion = self.__inicio + index
+            codigo = self.__codigos[posicion]
+            del self.__codigos[posicion]
+        else:
+            codigo = self.__sacar_codigo()
+        for observador in self.__observadores:
+            observador.al_sacar(codigo)
+        return CartaPoker.de_codigo(codigo, self.__tapado)
+
+    def __sacar_codigo(self) -> int:
+        """Saca el código de la carta de arriba."""
+        if self.__inicio >= len(self.__codigos):
+            if self.__bandeja.isvacia():
+                raise IndexError("El mazo está vacío")
+            # Como en el casino: se recogen los descartes y se baraja en medio de la ronda
+            self.recoger_descartes()
+            self.barajar()
+        codigo = self.__codigos[self.__inicio]
+        self.__inicio += 1
+        if self.__inicio >= MazoBlackJack.COMPACTAR_DESDE and 2 * self.__inicio >= len(self.__codigos):
+            self.__compactar()
+        return codigo
+
+    def sacar_carta_tapada(self) -> CartaPoker:
+        """
+        Saca la carta de arriba tapada, sin informarla a los observadores.
+
+        Cuando la carta se dé vuelta hay que informarla con `mostrar`; hasta entonces
+        queda en `tapadas`.
+
+        Raises:
+            IndexError: Si el mazo y la bandeja de descarte están vacíos.
+        """
+        codigo = self.__sacar_codigo()
+        self.__tapadas.append(codigo)
+        return CartaPoker.de_codigo(codigo, True)
+
+    def mostrar(self, carta: CartaPoker) -> None:
+        """Informa a los observadores una carta sacada tapada que ahora está a la vista."""
+        codigo = (carta.numero - 1) * 4 + carta.palo - 1
+        if codigo in self.__tapadas:
+            self.__tapadas.remove(codigo)
+        for observador in self.__observadores:
+            observador.al_sacar(codigo)
+
+    def barajar(self) -> None:
+        """Baraja las cartas del mazo."""
+        self.__compactar()
+        # Barajar una lista de enteros chicos es más rápido que asignar byte a byte
+        # en el bytearray; los enteros chicos son compartidos, no se crean objetos.
+        codigos = list(self.__codigos)
+        self.generador.shuffle(codigos)
+        self.__codigos[:] = bytes(codigos)
+        self.__reiniciar_observadores()
+
+    def cortar(self) -> None:
+        """
+        Corta el mazo en una posición aleatoria y coloca la parte inferior arriba.
+        """
+        self.__compactar()
+        posicion = self.generador.randint(0, len(self) - 1)
+        self.__codigos[:] = self.__codigos[posicion:] + self.__codigos[:posicion]
+
+    def __iter__(self):
+        return iter(self.cartas)
 
 
 
@@ -212,6 +797,36 @@ def test_mazos():
     """for carta in mp:
         print(carta)"""
     c = mp.sacar_carta()
-    
+
+
+def test_poner_carta_con_indice():
+    print("Se esta ejecutando el test de poner cartas en el mazo de Black Jack")
+    mp = MazoBlackJack()
+    mp.llenar()
+    for _ in range(10):
+        mp.sacar_carta()
+    as_de_picas = CartaPoker(1, 4)
+    mp.poner_carta(as_de_picas, -1)
+    assert len(mp) == 303 and mp.cartas[-2] == as_de_picas
+    mp.poner_carta(as_de_picas, -1000)
+    assert len(mp) == 304 and mp.sacar_carta() == as_de_picas
+    mp.poner_carta(as_de_picas, 1000)
+    assert mp.cartas[-1] == as_de_picas
+
+
+def test_mano():
+    print("Se esta ejecutando el test de la clase Mano Black Jack")
+    mano = ManoBlackJack()
+    mano.poner_carta(CartaPoker(1, 1))
+    mano.poner_carta(CartaPoker(6, 2))
+    assert mano.total == 17 and mano.isblanda()
+    mano.poner_carta(CartaPoker(10, 3))
+    assert mano.total == 17 and not mano.isblanda()
+    mano.llenar()
+    assert mano.isvacio() and mano.total == 0
+
+
 if __name__ == '__main__':
     test_mazos()
+    test_poner_carta_con_indice()
+    test_mano()
@@ -0,0 +1,367 @@
+"""
+persistencia.py - Fichas de los jugadores e historial de rondas que sobreviven al programa.
+
+Un almacén guarda las fichas de cada jugador y una fila por jugador y ronda. Las
+escrituras se acumulan en memoria y se hacen de a lotes: el saldo de cada jugador
+se escribe una sola vez por lote (el último gana) y las filas del historial se
+insertan todas juntas en una transacción, así que muchas mesas registrando
+pagos no se frenan insertando fila por fila.
+
+Clases:
+    - FilaHistorial: Lo que le pasó a un jugador en una ronda, leído del almacén.
+    - AlmacenJugadores: Interfaz de un almacén de jugadores.
+    - AlmacenMemoria: Almacén en memoria, para pruebas y simulaciones.
+    - PoolConexiones: Conexiones SQLite reutilizables entre hilos.
+    - AlmacenSQLite: Almacén en un archivo SQLite.
+
+Funciones:
+    - persistir: Generador que juega las rondas de una mesa y las registra en un almacén.
+
+Uso típico:
+
+    with AlmacenSQLite("blackjack.db") as almacen:
+        juego = BlackJack(interactivo=False)
+        juego.agregar_jugador(Bot("R2D2", almacen.fichas("R2D2", 100), PlantarseEn(17), ApuestaFija(5)))
+        for ronda in persistir(juego, almacen, mesa=1):
+            ...
+"""
+
+import queue
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import NamedTuple
+from resultados import ResultadoRonda
+
+
+class FilaHistorial(NamedTuple):
+    """Lo que le pasó a un jugador en una ronda."""
+    mesa: int
+    ronda: int
+    asiento: int
+    nombre: str
+    apuesta: int
+    suma: int
+    ganancia: int
+    fichas: int
+    manos: int
+    suma_croupier: int
+
+
+class AlmacenJugadores(ABC):
+    """Define una interfaz para guardar las fichas y el historial de los jugadores.
+
+    Las implementaciones pueden demorar las escrituras hasta `vaciar`, pero
+    `fichas` y `historial` siempre ven lo registrado hasta el momento.
+    """
+
+    @abstractmethod
+    def fichas(self, nombre: str, por_defecto: int = None) -> int:
+        """Retorna las fichas guardadas de un jugador.
+
+        Args:
+            nombre (str): El nombre del jugador.
+            por_defecto (int, optional): Lo que se retorna si el jugador no está guardado.
+
+        Returns:
+            int: Las fichas del jugador, o `por_defecto`.
+        """
+        pass
+
+    @abstractmethod
+    def guardar(self, nombre: str, fichas: int) -> None:
+        """Guarda las fichas de un jugador."""
+        pass
+
+    @abstractmethod
+    def registrar_ronda(self, mesa: int, ronda: int, resultado: ResultadoRonda) -> None:
+        """Guarda el resultado de cada jugador de una ronda y sus fichas después de la ronda.
+
+        Args:
+            mesa (int): El número de mesa.
+            ronda (int): El número de ronda en esa mesa.
+            resultado (ResultadoRonda): El resultado de la ronda.
+        """
+        pass
+
+    @abstractmethod
+    def historial(self, nombre: str) -> list[FilaHistorial]:
+        """Retorna las rondas jugadas por un jugador, en el orden en que se registraron."""
+        pass
+
+    def vaciar(self) -> None:
+        """Escribe lo que esté pendiente."""
+        pass
+
+    def cerrar(self) -> None:
+        """Escribe lo pendiente y libera los recursos del almacén."""
+        self.vaciar()
+
+    def __enter__(self) -> "AlmacenJugadores":
+        return self
+
+    def __exit__(self, *excepcion) -> None:
+        self.cerrar()
+
+
+class AlmacenMemoria(AlmacenJugadores):
+    """Almacén que guarda todo en memoria; se pierde al terminar el programa.
+
+    Atributos:
+        __fichas (dict[str, int]): Fichas por jugador.
+        __historial (list[FilaHistorial]): Todas las filas registradas.
+    """
+
+    def __init__(self) -> None:
+        self.__fichas: dict[str, int] = {}
+        self.__historial: list[FilaHistorial] = []
+
+    def fichas(self, nombre: str, por_defecto: int = None) -> int:
+        return self.__fichas.get(nombre, por_defecto)
+
+    def guardar(self, nombre: str, fichas: int) -> None:
+        self.__fichas[nombre] = fichas
+
+    def registrar_ronda(self, mesa: int, ronda: int, resultado: ResultadoRonda) -> None:
+        for asiento, jugador in enumerate(resultado.jugadores):
+            self.__historial.append(FilaHistorial(mesa, ronda, asiento, jugador.nombre, jugador.apuesta,
+                                                  jugador.suma, jugador.ganancia, jugador.fichas,
+                                                  jugador.manos, resultado.suma_croupier))
+            self.__fichas[jugador.nombre] = jugador.fichas
+
+    def historial(self, nombre: str) -> list[FilaHistorial]:
+        return [fila for fila in self.__historial if fila.nombre == nombre]
+
+
+class PoolConexiones:
+    """Conexiones a una base SQLite que se reutilizan entre hilos.
+
+    Las conexiones se abren al crear el pool, en modo WAL para que las lecturas no
+    esperen a las escrituras, y se piden con `conexion()`, que espera si están
+    todas en uso.
+
+    Atributos:
+        __libres (queue.Queue): Las conexiones que no están en uso.
+        __todas (list[sqlite3.Connection]): Todas las conexiones, para cerrarlas.
+    """
+
+    def __init__(self, ruta: str, tamanio: int = 4, espera: float = 30.0) -> None:
+        """Abre las conexiones.
+
+        Args:
+            ruta (str): La ruta del archivo SQLite.
+            tamanio (int, optional): Cantidad de conexiones. Por defecto es 4.
+            espera (float, optional): Segundos que una conexión espera a que se libere la base
+                cuando otro proceso está escribiendo. Por defecto es 30.
+
+        Raises:
+            ValueError: Si el tamaño no es positivo.
+        """
+        if tamanio < 1:
+            raise ValueError("El pool necesita al menos una conexión")
+        self.__libres: queue.Queue = queue.Queue()
+        self.__todas: list[sqlite3.Connection] = []
+        for _ in range(tamanio):
+            conexion = sqlite3.connect(ruta, timeout=espera, check_same_thread=False)
+            conexion.execute("PRAGMA journal_mode=WAL")
+            conexion.execute("PRAGMA synchronous=NORMAL")
+            self.__todas.append(conexion)
+            self.__libres.put(conexion)
+
+    @property
+    def tamanio(self) -> int:
+        """Retorna la cantidad de conexiones del pool."""
+        return len(self.__todas)
+
+    @contextmanager
+    def conexion(self):
+        """Presta una conexión mientras dura el bloque with y después la devuelve al pool."""
+        conexion = self.__libres.get()
+        try:
+            yield conexion
+        finally:
+            self.__libres.put(conexion)
+
+    def cerrar(self) -> None:
+        """Cierra todas las conexiones."""
+        for conexion in self.__todas:
+            conexion.close()
+        self.__todas.clear()
+
+
+class AlmacenSQLite(AlmacenJugadores):
+    """Almacén en un archivo SQLite, con escrituras por lotes.
+
+    Los saldos y las filas del historial se acumulan en memoria y se escriben en una
+    sola transacción cuando se juntan `tamanio_lote` filas, al llamar a `vaciar` o al
+    cerrar. Se puede usar desde varios hilos a la vez; varios procesos pueden abrir
+    el mismo archivo, cada uno con su almacén.
+
+    Atributos:
+        __pool (PoolConexiones): Las conexiones a la base.
+        __cerrojo (threading.Lock): Protege los pendientes.
+        __escritura (threading.Lock): Hace que los lotes se escriban de a uno y en orden.
+        __saldos (dict[str, int]): Fichas por jugador que todavía no se escribieron.
+        __filas (list[tuple]): Filas del historial que todavía no se escribieron.
+        __limite (int): Filas pendientes a partir de las cuales se escribe.
+    """
+
+    ESQUEMA = (
+        """CREATE TABLE IF NOT EXISTS jugadores (
+               nombre TEXT PRIMARY KEY,
+               fichas INTEGER NOT NULL)""",
+        """CREATE TABLE IF NOT EXISTS rondas (
+               mesa INTEGER NOT NULL,
+               ronda INTEGER NOT NULL,
+               asiento INTEGER NOT NULL,
+               nombre TEXT NOT NULL,
+               apuesta INTEGER NOT NULL,
+               suma INTEGER NOT NULL,
+               ganancia INTEGER NOT NULL,
+               fichas INTEGER NOT NULL,
+               manos INTEGER NOT NULL,
+               suma_croupier INTEGER NOT NULL)""",
+        "CREATE INDEX IF NOT EXISTS rondas_por_nombre ON rondas (nombre)",
+    )
+
+    def __init__(self, ruta: str, tamanio_lote: int = 10_000, conexiones: int = 4) -> None:
+        """Abre (o crea) la base.
+
+        Args:
+            ruta (str): La ruta del archivo SQLite.
+            tamanio_lote (int, optional): Filas del historial que se acumulan antes de escribir.
+                Por defecto es 10.000.
+            conexiones (int, optional): Conexiones del pool. Por defecto es 4.
+
+        Raises:
+            ValueError: Si el tamaño del lote no es positivo.
+        """
+        if tamanio_lote < 1:
+            raise ValueError("El tamaño del lote debe ser positivo")
+        self.__pool: PoolConexiones = PoolConexiones(ruta, conexiones)
+        self.__cerrojo: threading.Lock = threading.Lock()
+        self.__escritura: threading.Lock = threading.Lock()
+        self.__saldos: dict[str, int] = {}
+        self.__filas: list[tuple] = []
+        self.__limite: int = tamanio_lote
+        with self.__pool.conexion() as conexion, conexion:
+            for sentencia in AlmacenSQLite.ESQUEMA:
+                conexion.execute(sentencia)
+
+    @property
+    def pool(self) -> PoolConexiones:
+        """Retorna el pool de conexiones."""
+        return self.__pool
+
+    def fichas(self, nombre: str, por_defecto: int = None) -> int:
+        with self.__cerrojo:
+            if nombre in self.__saldos:
+                return self.__saldos[nombre]
+        # Si hay un lote escribiéndose, el saldo puede estar en él
+        with self.__escritura, self.__pool.conexion() as conexion:
+            fila = conexion.execute("SELECT fichas FROM jugadores WHERE nombre = ?", (nombre,)).fetchone()
+        return por_defecto if fila is None else fila[0]
+
+    def guardar(self, nombre: str, fichas: int) -> None:
+        with self.__cerrojo:
+            self.__saldos[nombre] = fichas
+
+    def registrar_ronda(self, mesa: int, ronda: int, resultado: ResultadoRonda) -> None:
+        suma_croupier = resultado.suma_croupier
+        filas = [(mesa, ronda, asiento, jugador.nombre, jugador.apuesta, jugador.suma, jugador.ganancia,
+                  jugador.fichas, jugador.manos, suma_croupier)
+                 for asiento, jugador in enumerate(resultado.jugadores)]
+        with self.__cerrojo:
+            self.__filas += filas
+            for jugador in resultado.jugadores:
+                self.__saldos[jugador.nombre] = jugador.fichas
+            lleno = len(self.__filas) >= self.__limite
+        if lleno:
+            self.vaciar()
+
+    def historial(self, nombre: str) -> list[FilaHistorial]:
+        self.vaciar()
+        with self.__pool.conexion() as conexion:
+            filas = conexion.execute("SELECT * FROM rondas WHERE nombre = ? ORDER BY rowid",
+                                     (nombre,)).fetchall()
+        return [FilaHistorial._make(fila) for fila in filas]
+
+    def vaciar(self) -> None:
+        """Escribe los saldos y las filas pendientes en una sola transacción."""
+        with self.__escritura:
+            with self.__cerrojo:
+                if not self.__saldos and not self.__filas:
+                    return
+                saldos, self.__saldos = self.__saldos, {}
+                filas, self.__filas = self.__filas, []
+            with self.__pool.conexion() as conexion, conexion:
+                conexion.executemany("INSERT INTO jugadores (nombre, fichas) VALUES (?, ?) "
+                                     "ON CONFLICT (nombre) DO UPDATE SET fichas = excluded.fichas",
+                                     saldos.items())
+                conexion.executemany("INSERT INTO rondas VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                                     filas)
+
+    def cerrar(self) -> None:
+        """Escribe lo pendiente y cierra las conexiones."""
+        if self.__pool.tamanio:
+            self.vaciar()
+            self.__pool.cerrar()
+
+
+def persistir(juego, almacen: AlmacenJugadores, mesa: int = 0, cantidad: int = None):
+    """Juega rondas de una mesa, registrando cada una en el almacén.
+
+    Args:
+        juego (BlackJack): La mesa.
+        almacen (AlmacenJugadores): Donde se registran las rondas.
+        mesa (int, optional): El número de mesa en el historial. Por defecto es 0.
+        cantidad (int, optional): Cantidad máxima de rondas. Por defecto juega hasta que no quedan jugadores.
+
+    Yields:
+        ResultadoRonda: El resultado de cada ronda, después de registrarlo.
+    """
+    for resultado in juego.rondas(cantidad):
+        almacen.registrar_ronda(mesa, juego.ronda, resultado)
+        yield resultado
+
+
+def test_almacen_sqlite():
+    print("Se esta ejecutando el test del almacén SQLite")
+    import os
+    import tempfile
+    from aleatorio import GeneradorContador
+    from juego_black_jack import BlackJack
+    from jugadores import Bot
+    from politicas import ApuestaFija, PlantarseEn
+
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta = os.path.join(directorio, "blackjack.db")
+
+        def filas_escritas() -> int:
+            with sqlite3.connect(ruta) as otra:
+                return otra.execute("SELECT COUNT(*) FROM rondas").fetchone()[0]
+
+        almacen = AlmacenSQLite(ruta, tamanio_lote=5)
+        juego = BlackJack(interactivo=False, generador=GeneradorContador(3))
+        for nombre in ("R2D2", "C3PO"):
+            juego.agregar_jugador(Bot(nombre, almacen.fichas(nombre, 1000), PlantarseEn(17), ApuestaFija(5)))
+        rondas = persistir(juego, almacen, mesa=7)
+        resultados = [next(rondas), next(rondas)]
+        assert filas_escritas() == 0  # 4 filas pendientes, menos que el lote
+        resultados.append(next(rondas))
+        assert filas_escritas() == 6  # Se juntó el lote y se escribió en una transacción
+        resultados.append(next(rondas))
+        almacen.cerrar()
+        assert filas_escritas() == 8
+
+        with AlmacenSQLite(ruta) as almacen:
+            historial = almacen.historial("C3PO")
+            assert [(fila.mesa, fila.ronda, fila.asiento) for fila in historial] == [(7, ronda, 1) for ronda in range(1, 5)]
+            assert [fila.ganancia for fila in historial] == [resultado.jugadores[1].ganancia for resultado in resultados]
+            assert almacen.fichas("C3PO") == resultados[-1].jugadores[1].fichas
+            assert almacen.fichas("Nadie", 50) == 50
+
+
+if __name__ == '__main__':
+    test_almacen_sqlite()
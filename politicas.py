@@ -0,0 +1,223 @@
+"""
+politicas.py - Políticas de decisión para jugadores sin interacción por consola.
+
+Las políticas separan la toma de decisiones (pedir carta, plantarse, doblar,
+dividir, rendirse, tomar seguro, cuánto apostar) de la entrada/salida por
+consola, de manera que un `Bot` pueda jugar las mismas fases de `BlackJack` en
+modo silencioso.
+
+Clases:
+    - PoliticaJuego: Interfaz para decidir la jugada de un jugador.
+    - PoliticaApuesta: Interfaz para decidir cuántas fichas apuesta un jugador.
+    - PlantarseEn: Se planta a partir de un umbral fijo (como el croupier).
+    - ApuestaFija: Apuesta siempre la misma cantidad de fichas.
+    - PoliticaPersonalidad: Reproduce las decisiones de `Compu` según su personalidad.
+    - PoliticaEstrategiaBasica: Juega según la tabla de estrategia básica.
+
+Uso típico:
+
+    bot = Bot("R2D2", 100, PlantarseEn(17), ApuestaFija(5))
+"""
+
+import random
+from abc import ABC, abstractmethod
+from cartas import CartaPoker
+from estrategia import EstrategiaBasica, obtener_estrategia, valor_carta, PEDIR, PLANTARSE
+from reglas import ReglasMesa, REGLAS_CLASICAS, PUEDE_DOBLAR, PUEDE_DIVIDIR, PUEDE_RENDIRSE
+
+
+class PoliticaJuego(ABC):
+    """Define una interfaz para decidir la jugada de un jugador.
+
+    Alcanza con implementar `me_planto`: por defecto `decidir` solo pide o se
+    planta y nunca se toma seguro.
+    """
+
+    @abstractmethod
+    def me_planto(self, jugador, carta_croupier: CartaPoker = None) -> bool:
+        """Determina si el jugador se planta.
+
+        Args:
+            jugador (JugadorBlackJack): El jugador que debe decidir.
+            carta_croupier (CartaPoker, optional): La carta visible del croupier.
+
+        Returns:
+            bool: True si el jugador se planta, False si pide otra carta.
+        """
+        pass
+
+    def decidir(self, jugador, carta_croupier: CartaPoker = None, opciones: int = 0) -> str:
+        """Elige la jugada de la mano que está jugando el jugador.
+
+        Args:
+            jugador (Cliente): El jugador que debe decidir; `jugador.mano` es la mano en juego.
+            carta_croupier (CartaPoker, optional): La carta visible del croupier.
+            opciones (int, optional): Las jugadas permitidas además de pedir y plantarse,
+                combinando PUEDE_DOBLAR, PUEDE_DIVIDIR y PUEDE_RENDIRSE.
+
+        Returns:
+            str: PEDIR, PLANTARSE o, si están en las opciones, DOBLAR, DIVIDIR o RENDIRSE.
+        """
+        return PLANTARSE if self.me_planto(jugador, carta_croupier) else PEDIR
+
+    def tomo_seguro(self, jugador, carta_croupier: CartaPoker = None) -> bool:
+        """Determina si el jugador toma seguro cuando el croupier muestra un as.
+
+        Returns:
+            bool: True si toma seguro. Por defecto nunca lo toma.
+        """
+        return False
+
+
+class PoliticaApuesta(ABC):
+    """Define una interfaz para decidir la apuesta de un jugador."""
+
+    @abstractmethod
+    def apuesto(self, jugador) -> int:
+        """Calcula la cantidad de fichas que apuesta el jugador.
+
+        Args:
+            jugador (Cliente): El jugador que apuesta.
+
+        Returns:
+            int: La cantidad de fichas apostadas, entre 1 y las fichas del jugador.
+        """
+        pass
+
+
+class PlantarseEn(PoliticaJuego):
+    """Se planta cuando la suma de las cartas alcanza un umbral fijo."""
+
+    def __init__(self, umbral: int = 17) -> None:
+        """Inicializa la política con el umbral indicado.
+
+        Args:
+            umbral (int, optional): Suma a partir de la cual se planta. Por defecto es 17.
+        """
+        self.__umbral: int = umbral
+
+    @property
+    def umbral(self) -> int:
+        """Retorna el umbral a partir del cual se planta."""
+        return self.__umbral
+
+    def me_planto(self, jugador, carta_croupier: CartaPoker = None) -> bool:
+        return jugador.sumar_cartas() >= self.__umbral
+
+
+class ApuestaFija(PoliticaApuesta):
+    """Apuesta siempre la misma cantidad, limitada por las fichas disponibles."""
+
+    def __init__(self, cantidad: int = 1) -> None:
+        """Inicializa la política con la cantidad a apostar.
+
+        Args:
+            cantidad (int, optional): Fichas a apostar en cada ronda. Por defecto es 1.
+
+        Raises:
+            ValueError: Si la cantidad no es positiva.
+        """
+        if cantidad < 1:
+            raise ValueError("La apuesta debe ser de al menos una ficha")
+        self.__cantidad: int = cantidad
+
+    @property
+    def cantidad(self) -> int:
+        """Retorna la cantidad de fichas que se apuestan."""
+        return self.__cantidad
+
+    def apuesto(self, jugador) -> int:
+        return min(self.__cantidad, jugador.fichas)
+
+
+class PoliticaPersonalidad(PoliticaJuego, PoliticaApuesta):
+    """Reproduce las decisiones de `Compu` sin imprimir ni pausar la consola.
+
+    Atributos:
+        personalidad (int): Valor entre Compu.TRAN y Compu.LOCO; cuanto más alto,
+            más agresivo es el jugador al apostar y al pedir cartas.
+    """
+
+    TRAN: int = 1
+    LOCO: int = 100
+
+    def __init__(self, personalidad: int, generador: random.Random = None) -> None:
+        """Inicializa la política con una personalidad.
+
+        Args:
+            personalidad (int): Personalidad entre TRAN y LOCO.
+            generador (random.Random, optional): Generador de números aleatorios.
+                Por defecto se usa el módulo random.
+
+        Raises:
+            ValueError: Si la personalidad está fuera de rango.
+        """
+        if not PoliticaPersonalidad.TRAN <= personalidad <= PoliticaPersonalidad.LOCO:
+            raise ValueError("Personalidad fuera de rango")
+        self.__personalidad: int = personalidad
+        self.__generador = random if generador is None else generador
+
+    @property
+    def personalidad(self) -> int:
+        """Retorna la personalidad de la política."""
+        return self.__personalidad
+
+    def __pensar(self) -> int:
+        return self.__generador.randint(PoliticaPersonalidad.TRAN, PoliticaPersonalidad.LOCO)
+
+    def apuesto(self, jugador) -> int:
+        fichas = jugador.fichas
+        if self.__pensar() < self.__personalidad:
+            desde = max(1, fichas // 2)
+            hasta = fichas
+        else:
+            desde = 1
+            hasta = max(1, fichas // 2)
+        return self.__generador.randint(desde, hasta)
+
+    def me_planto(self, jugador, carta_croupier: CartaPoker = None) -> bool:
+        suma = jugador.sumar_cartas()
+        if suma >= 21:
+            return True
+        if suma >= 15:
+            return self.__pensar() >= self.__personalidad
+        return False
+
+
+class PoliticaEstrategiaBasica(PoliticaJuego):
+    """Juega según la tabla de estrategia básica de las reglas de la mesa.
+
+    `decidir` usa todas las opciones que permite la mesa. `me_planto`, que solo
+    puede pedir o plantarse, usa la jugada que la tabla indica sin doblar ni dividir.
+    Nunca toma seguro.
+    """
+
+    def __init__(self, reglas: ReglasMesa = None, estrategia: EstrategiaBasica = None) -> None:
+        """Inicializa la política.
+
+        Args:
+            reglas (ReglasMesa, optional): Las reglas de la mesa. Por defecto REGLAS_CLASICAS, las
+                mismas que usa BlackJack.
+            estrategia (EstrategiaBasica, optional): Una tabla ya calculada. Por defecto se obtiene la de las reglas.
+        """
+        if estrategia is None:
+            estrategia = obtener_estrategia(REGLAS_CLASICAS if reglas is None else reglas)
+        self.__estrategia: EstrategiaBasica = estrategia
+
+    @property
+    def estrategia(self) -> EstrategiaBasica:
+        """Retorna la tabla de estrategia que usa la política."""
+        return self.__estrategia
+
+    def me_planto(self, jugador, carta_croupier: CartaPoker = None) -> bool:
+        accion = self.__estrategia.decidir(jugador.sumar_cartas(), jugador.isblanda(),
+                                           valor_carta(carta_croupier.numero),
+                                           puede_doblar=False, puede_dividir=False)
+        return accion == PLANTARSE
+
+    def decidir(self, jugador, carta_croupier: CartaPoker = None, opciones: int = 0) -> str:
+        mano = jugador.mano
+        puede_dividir = opciones & PUEDE_DIVIDIR
+        return self.__estrategia.decidir(mano.total, mano.isblanda(), valor_carta(carta_croupier.numero),
+                                         valor_carta(mano.cartas[0].numero) if puede_dividir else None,
+                                         opciones & PUEDE_DOBLAR, puede_dividir, opciones & PUEDE_RENDIRSE)
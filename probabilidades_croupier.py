@@ -0,0 +1,159 @@
+"""
+probabilidades_croupier.py - Distribución exacta del total final del croupier.
+
+Calcula la probabilidad de que el croupier termine en 17, 18, 19, 20, 21 o se
+pase, dada su carta visible y la composición de las cartas que quedan en el
+mazo. El cálculo es exacto: recorre todas las secuencias de cartas que puede
+pedir el croupier, sacando cada carta de la composición, y guarda en memoria
+cada estado (total, blanda, composición) ya resuelto, de manera que las
+consultas repetidas o parecidas no vuelven a calcularse.
+
+La composición es una tupla de 10 cantidades: la posición 0 cuenta los ases, la
+1 los dos, ..., y la 9 los dieces y figuras.
+
+Funciones principales:
+    - distribucion_croupier: Probabilidades de 17, 18, 19, 20, 21 y pasarse.
+    - probabilidad_blackjack: Probabilidad de que el croupier tenga Black Jack.
+    - composicion_completa: Composición de un mazo sin cartas sacadas.
+    - composicion_mazo: Composición de un MazoBlackJack.
+
+Uso típico:
+
+    composicion = quitar(composicion_completa(6), 10, 6, 10)
+    distribucion_croupier(6, composicion)
+"""
+
+from functools import lru_cache
+from estrategia import sumar, PASADO
+
+# Código de carta (0..51) -> posición en la composición (0..9)
+_POSICION_DE_CODIGO = bytes(min(codigo // 4, 9) if codigo < 52 else 255 for codigo in range(256))
+
+
+def composicion_completa(mazos: int = 6) -> tuple[int, ...]:
+    """Retorna la composición de `mazos` mazos de póker completos."""
+    return (4 * mazos,) * 9 + (16 * mazos,)
+
+
+def composicion_mazo(mazo) -> tuple[int, ...]:
+    """Retorna la composición de las cartas que quedan en un MazoBlackJack.
+
+    Args:
+        mazo (MazoBlackJack): El mazo a contar.
+
+    Returns:
+        tuple[int, ...]: Cantidad de cartas de cada valor.
+    """
+    posiciones = mazo.codigos.translate(_POSICION_DE_CODIGO)
+    return tuple(posiciones.count(posicion) for posicion in range(10))
+
+
+def quitar(composicion: tuple[int, ...], *valores: int) -> tuple[int, ...]:
+    """Retorna la composición sin las cartas de los valores indicados (1 a 10).
+
+    Raises:
+        ValueError: Si no quedan cartas de alguno de los valores.
+    """
+    cantidades = list(composicion)
+    for valor in valores:
+        if cantidades[valor - 1] == 0:
+            raise ValueError(f"No quedan cartas de valor {valor}")
+        cantidades[valor - 1] -= 1
+    return tuple(cantidades)
+
+
+@lru_cache(maxsize=1 << 18)
+def _final(total: int, blanda: bool, composicion: tuple[int, ...], pide_17_blando: bool) -> tuple[float, ...]:
+    """Distribución final del croupier desde un estado, sacando cartas de la composición."""
+    if total > 21:
+        return (0.0, 0.0, 0.0, 0.0, 0.0, 1.0)
+    if total >= 17 and not (pide_17_blando and total == 17 and blanda):
+        resultado = [0.0] * 6
+        resultado[total - 17] = 1.0
+        return tuple(resultado)
+    restantes = sum(composicion)
+    if restantes == 0:
+        raise ValueError("El mazo se quedó sin cartas")
+    resultado = [0.0] * 6
+    for posicion, cantidad in enumerate(composicion):
+        if not cantidad:
+            continue
+        p = cantidad / restantes
+        siguiente = _final(*sumar(total, blanda, posicion + 1),
+                           composicion[:posicion] + (cantidad - 1,) + composicion[posicion + 1:],
+                           pide_17_blando)
+        for i in range(6):
+            resultado[i] += p * siguiente[i]
+    return tuple(resultado)
+
+
+def probabilidad_blackjack(carta_visible: int, composicion: tuple[int, ...]) -> float:
+    """Probabilidad de que la carta tapada complete un Black Jack.
+
+    Args:
+        carta_visible (int): El valor de la carta visible del croupier (1 a 10).
+        composicion (tuple[int, ...]): Las cartas que puede ser la tapada.
+
+    Returns:
+        float: La probabilidad de Black Jack del croupier.
+    """
+    restantes = sum(composicion)
+    if carta_visible == 1:
+        return composicion[9] / restantes
+    if carta_visible == 10:
+        return composicion[0] / restantes
+    return 0.0
+
+
+def distribucion_croupier(carta_visible: int, composicion: tuple[int, ...],
+                          pide_17_blando: bool = False, sin_blackjack: bool = True) -> tuple[float, ...]:
+    """Distribución exacta del total final del croupier.
+
+    Args:
+        carta_visible (int): El valor de la carta visible del croupier (1 a 10).
+        composicion (tuple[int, ...]): Las cartas que quedan en el mazo, sin la carta visible.
+            La carta tapada sale de esta composición.
+        pide_17_blando (bool, optional): Si el croupier pide carta con 17 blando. Por defecto es False.
+        sin_blackjack (bool, optional): Si se sabe que el croupier no tiene Black Jack
+            (ya revisó la carta tapada). Si es False, un Black Jack cuenta como 21.
+
+    Returns:
+        tuple[float, ...]: Probabilidades de terminar en 17, 18, 19, 20, 21 y de pasarse.
+    """
+    composicion = tuple(composicion)
+    total, blanda = sumar(0, False, carta_visible)
+    prohibida = None
+    if sin_blackjack:
+        prohibida = 9 if carta_visible == 1 else 0 if carta_visible == 10 else None
+    restantes = sum(composicion) - (composicion[prohibida] if prohibida is not None else 0)
+    if restantes <= 0:
+        raise ValueError("El mazo se quedó sin cartas")
+    resultado = [0.0] * 6
+    for posicion, cantidad in enumerate(composicion):
+        if not cantidad or posicion == prohibida:
+            continue
+        p = cantidad / restantes
+        siguiente = _final(*sumar(total, blanda, posicion + 1),
+                           composicion[:posicion] + (cantidad - 1,) + composicion[posicion + 1:],
+                           pide_17_blando)
+        for i in range(6):
+            resultado[i] += p * siguiente[i]
+    return tuple(resultado)
+
+
+def probabilidad_pasarse(carta_visible: int, composicion: tuple[int, ...],
+                         pide_17_blando: bool = False) -> float:
+    """Probabilidad de que el croupier se pase, sabiendo que no tiene Black Jack."""
+    return distribucion_croupier(carta_visible, composicion, pide_17_blando)[PASADO]
+
+
+def limpiar_cache() -> None:
+    """Libera la memoria de los estados ya calculados."""
+    _final.cache_clear()
+
+
+if __name__ == '__main__':
+    completa = composicion_completa(6)
+    for carta in range(1, 11):
+        distribucion = distribucion_croupier(carta, quitar(completa, carta))
+        print(f"{'A' if carta == 1 else carta:>2}: " + " ".join(f"{p:.4f}" for p in distribucion))
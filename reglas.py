@@ -0,0 +1,81 @@
+"""
+reglas.py - Reglas configurables de una mesa de BlackJack.
+
+Clases:
+    - ReglasMesa: Valores inmutables que describen las reglas de la mesa.
+
+Constantes:
+    - REGLAS_CLASICAS: Las reglas del juego original: solo pedir o plantarse y todo se paga 1 a 1.
+    - PUEDE_DOBLAR, PUEDE_DIVIDIR, PUEDE_RENDIRSE: Bits de las opciones que tiene una mano.
+
+Uso típico:
+
+    reglas = ReglasMesa(mazos=8, croupier_pide_17_blando=True)
+"""
+
+from dataclasses import dataclass, asdict
+
+# Opciones de una mano, además de pedir y plantarse. Se combinan con |.
+PUEDE_DOBLAR = 1
+PUEDE_DIVIDIR = 2
+PUEDE_RENDIRSE = 4
+
+# Las reglas que cambian la estrategia básica (ver estrategia.obtener_estrategia)
+CLAVES_ESTRATEGIA = ("mazos", "croupier_pide_17_blando", "doblar_despues_de_dividir", "croupier_revisa")
+
+
+@dataclass(frozen=True, slots=True)
+class ReglasMesa:
+    """Reglas de una mesa de BlackJack.
+
+    Es inmutable y comparable, así que puede usarse como clave de caché.
+
+    Atributos:
+        mazos (int): Cantidad de mazos de póker del mazo de la mesa.
+        croupier_pide_17_blando (bool): Si el croupier pide carta con 17 blando.
+        doblar_despues_de_dividir (bool): Si se puede doblar una mano que viene de dividir.
+        pago_blackjack (float): Cuánto se paga por ficha un Black Jack natural (1.5 es 3 a 2).
+            El pago se redondea hacia abajo a fichas enteras.
+        naturales (bool): Si un Black Jack natural le gana a cualquier otro 21 y se paga aparte.
+            Si es False, un Black Jack es un 21 más.
+        croupier_revisa (bool): Si el croupier revisa su carta tapada cuando muestra un as o un
+            10 y, si tiene Black Jack, termina la ronda antes de que jueguen los jugadores.
+        doblar (bool): Si se puede doblar con las dos primeras cartas.
+        max_manos (int): Cantidad máxima de manos por jugador al dividir (1 no permite dividir).
+        pedir_ases_divididos (bool): Si las manos que salen de dividir ases pueden pedir más de una carta.
+        redividir_ases (bool): Si se pueden volver a dividir los ases.
+        seguro (bool): Si se ofrece seguro cuando el croupier muestra un as.
+        rendicion (bool): Si se permite la rendición tardía (perder media apuesta sin jugar).
+    """
+    mazos: int = 6
+    croupier_pide_17_blando: bool = False
+    doblar_despues_de_dividir: bool = True
+    pago_blackjack: float = 1.5
+    naturales: bool = True
+    croupier_revisa: bool = True
+    doblar: bool = True
+    max_manos: int = 4
+    pedir_ases_divididos: bool = False
+    redividir_ases: bool = False
+    seguro: bool = True
+    rendicion: bool = False
+
+    def __post_init__(self) -> None:
+        if self.mazos < 1:
+            raise ValueError("La mesa necesita al menos un mazo")
+        if self.max_manos < 1:
+            raise ValueError("Cada jugador juega al menos una mano")
+        if self.pago_blackjack < 1:
+            raise ValueError("El Black Jack no puede pagar menos que una mano ganada")
+
+    def como_dict(self) -> dict:
+        """Retorna las reglas como un diccionario."""
+        return asdict(self)
+
+    def para_estrategia(self) -> "ReglasMesa":
+        """Retorna estas reglas con los valores por defecto en todo lo que no cambia la estrategia básica."""
+        return ReglasMesa(**{clave: getattr(self, clave) for clave in CLAVES_ESTRATEGIA})
+
+
+REGLAS_CLASICAS = ReglasMesa(pago_blackjack=1.0, naturales=False, croupier_revisa=False, doblar=False,
+                             max_manos=1, seguro=False, rendicion=False)
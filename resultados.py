@@ -0,0 +1,76 @@
+"""
+resultados.py - Resultados estructurados de una ronda de BlackJack.
+
+Clases:
+    - ResultadoJugador: Lo que le pasó a un jugador en una ronda.
+    - ResultadoRonda: Lo que pasó en toda la mesa en una ronda.
+"""
+
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True, slots=True)
+class ResultadoJugador:
+    """Resultado de un jugador al terminar una ronda.
+
+    Atributos:
+        nombre (str): El nombre del jugador.
+        apuesta (int): Las fichas apostadas al empezar la ronda, sin contar dobladas, divisiones ni seguro.
+        apostado (int): Todo lo que arriesgó en la ronda: las apuestas finales de sus manos
+            (con dobladas y divisiones) más el seguro.
+        sumas (tuple[int, ...]): La suma final de cada una de sus manos (más de una si dividió).
+        ganancia (int): Fichas ganadas (positivo), perdidas (negativo) o 0 si empató, entre todas sus manos y el seguro.
+        fichas (int): Las fichas del jugador después de cobrar o pagar.
+    """
+    nombre: str
+    apuesta: int
+    apostado: int
+    sumas: tuple
+    ganancia: int
+    fichas: int
+
+    @property
+    def suma(self) -> int:
+        """Retorna la suma final de la primera mano."""
+        return self.sumas[0]
+
+    @property
+    def manos(self) -> int:
+        """Retorna la cantidad de manos que jugó (más de una si dividió)."""
+        return len(self.sumas)
+
+    @property
+    def gano(self) -> bool:
+        """Retorna True si el jugador ganó la ronda."""
+        return self.ganancia > 0
+
+    @property
+    def perdio(self) -> bool:
+        """Retorna True si el jugador perdió la ronda."""
+        return self.ganancia < 0
+
+    @property
+    def empato(self) -> bool:
+        """Retorna True si el jugador empató con el croupier."""
+        return self.ganancia == 0
+
+
+@dataclass(frozen=True, slots=True)
+class ResultadoRonda:
+    """Resultado de una ronda completa.
+
+    Atributos:
+        suma_croupier (int): La suma final de las cartas del croupier.
+        jugadores (tuple[ResultadoJugador, ...]): El resultado de cada jugador, en orden de asiento.
+        retirados (tuple[str, ...]): Los nombres de los jugadores que se retiraron sin fichas.
+        carta_visible (int): El valor (1 a 10) de la carta visible del croupier, 0 si no se conoce.
+    """
+    suma_croupier: int
+    jugadores: tuple
+    retirados: tuple = ()
+    carta_visible: int = 0
+
+    @property
+    def croupier_se_paso(self) -> bool:
+        """Retorna True si el croupier se pasó de 21."""
+        return self.suma_croupier > 21
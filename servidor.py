@@ -0,0 +1,427 @@
+"""
+servidor.py - Servidor asyncio que atiende muchas mesas de BlackJack a la vez.
+
+Cada mesa es una tarea de asyncio que juega rondas del modo silencioso de
+`BlackJack` con `ronda_paso_a_paso`. Las decisiones de los jugadores llegan por
+TCP en lugar del `input()` bloqueante de `utilidades2`, y cada decisión tiene un
+tiempo límite: si el jugador no contesta a tiempo (o se desconecta) se usa su
+política por defecto, así una mesa lenta nunca frena a las demás.
+
+Protocolo (una línea de texto UTF-8 por mensaje):
+
+    cliente -> servidor   NOMBRE <nombre>
+    servidor -> cliente   BIENVENIDO <mesa> <fichas>
+    servidor -> cliente   APUESTA <fichas>            el cliente contesta un entero
+    servidor -> cliente   JUGADA <suma> <numero>      <numero> es la carta visible del croupier (1..13);
+                                                      el cliente contesta S (se planta) o N
+    servidor -> cliente   RESULTADO <suma croupier> <ganancia> <fichas>
+    servidor -> cliente   RETIRADO
+
+Uso:
+
+    python servidor.py --puerto 2121 --asientos 5
+    # Desde otra consola: nc localhost 2121
+"""
+
+import asyncio
+from juego_black_jack import BlackJack, APUESTA, SEGURO
+from jugadores import Bot
+from politicas import ApuestaFija, PlantarseEn, PoliticaJuego, PoliticaApuesta
+
+
+class JugadorRemoto(Bot):
+    """Jugador que decide desde una conexión TCP.
+
+    Las políticas del Bot se usan cuando el jugador no contesta a tiempo o se desconecta.
+
+    Atributos:
+        __lector (asyncio.StreamReader): Lectura de la conexión.
+        __escritor (asyncio.StreamWriter): Escritura de la conexión.
+        __conectado (bool): Si la conexión sigue abierta.
+    """
+
+    def __init__(self, nombre: str, fichas: int, lector: asyncio.StreamReader, escritor: asyncio.StreamWriter,
+                 politica_juego: PoliticaJuego = None, politica_apuesta: PoliticaApuesta = None) -> None:
+        """Inicializa un jugador remoto.
+
+        Args:
+            nombre (str): El nombre del jugador.
+            fichas (int): La cantidad inicial de fichas.
+            lector (asyncio.StreamReader): Lectura de la conexión.
+            escritor (asyncio.StreamWriter): Escritura de la conexión.
+            politica_juego (PoliticaJuego, optional): Política si no contesta. Por defecto se planta.
+            politica_apuesta (PoliticaApuesta, optional): Política si no contesta. Por defecto apuesta 1.
+        """
+        super().__init__(nombre, fichas, politica_juego or PlantarseEn(0), politica_apuesta or ApuestaFija(1))
+        self.__lector: asyncio.StreamReader = lector
+        self.__escritor: asyncio.StreamWriter = escritor
+        self.__conectado: bool = True
+
+    @property
+    def conectado(self) -> bool:
+        """Retorna True si la conexión sigue abierta."""
+        return self.__conectado
+
+    async def enviar(self, mensaje: str) -> None:
+        """Envía una línea al jugador; si falla, lo marca como desconectado."""
+        if not self.__conectado:
+            return
+        try:
+            self.__escritor.write(f"{mensaje}\n".encode())
+            await self.__escritor.drain()
+        except (ConnectionError, OSError):
+            self.__conectado = False
+
+    async def preguntar(self, mensaje: str, tiempo_limite: float) -> str:
+        """Envía una pregunta y espera la respuesta.
+
+        Returns:
+            str | None: La respuesta sin espacios, o None si no llegó a tiempo o se desconectó.
+        """
+        await self.enviar(mensaje)
+        if not self.__conectado:
+            return None
+        try:
+            linea = await asyncio.wait_for(self.__lector.readline(), tiempo_limite)
+        except asyncio.TimeoutError:
+            return None
+        except (ConnectionError, OSError):
+            linea = b""
+        if not linea:
+            self.__conectado = False
+            return None
+        return linea.decode(errors="replace").strip()
+
+    async def cerrar(self) -> None:
+        """Cierra la conexión."""
+        self.__conectado = False
+        self.__escritor.close()
+        try:
+            await self.__escritor.wait_closed()
+        except (ConnectionError, OSError):
+            pass
+
+
+class MesaAsincrona:
+    """Una mesa de BlackJack que juega como tarea de asyncio.
+
+    Los jugadores que llegan durante una ronda se sientan al empezar la siguiente.
+
+    Atributos:
+        __numero (int): El número de la mesa.
+        __juego (BlackJack): El juego silencioso de la mesa.
+        __asientos (int): Cantidad máxima de jugadores.
+        __tiempo_limite (float): Segundos que se espera cada decisión.
+        __espera (list[Bot]): Jugadores que se sientan en la próxima ronda.
+    """
+
+    def __init__(self, numero: int, asientos: int = 5, tiempo_limite: float = 30.0,
+                 pausa_entre_rondas: float = 0.0) -> None:
+        """Inicializa una mesa vacía.
+
+        Args:
+            numero (int): El número de la mesa.
+            asientos (int, optional): Cantidad máxima de jugadores. Por defecto 5.
+            tiempo_limite (float, optional): Segundos que se espera cada decisión. Por defecto 30.
+            pausa_entre_rondas (float, optional): Segundos entre rondas. Por defecto 0.
+        """
+        self.__numero: int = numero
+        self.__juego: BlackJack = BlackJack(interactivo=False)
+        self.__asientos: int = asientos
+        self.__tiempo_limite: float = tiempo_limite
+        self.__pausa: float = pausa_entre_rondas
+        self.__espera: list[Bot] = []
+        self.__hay_espera: asyncio.Event = asyncio.Event()
+        self.__rondas: int = 0
+
+    @property
+    def numero(self) -> int:
+        """Retorna el número de la mesa."""
+        return self.__numero
+
+    @property
+    def juego(self) -> BlackJack:
+        """Retorna el juego de la mesa."""
+        return self.__juego
+
+    @property
+    def rondas(self) -> int:
+        """Retorna la cantidad de rondas jugadas."""
+        return self.__rondas
+
+    def ocupados(self) -> int:
+        """Retorna la cantidad de asientos ocupados o reservados."""
+        return len(self.__juego.jugadores) + len(self.__espera)
+
+    def hay_lugar(self) -> bool:
+        """Retorna True si queda algún asiento libre."""
+        return self.ocupados() < self.__asientos
+
+    def sentar(self, jugador: Bot) -> None:
+        """Reserva un asiento para el jugador a partir de la próxima ronda.
+
+        Raises:
+            ValueError: Si la mesa está llena.
+        """
+        if not self.hay_lugar():
+            raise ValueError("La mesa está llena")
+        self.__espera.append(jugador)
+        self.__hay_espera.set()
+
+    async def __resolver(self, pedido: str, jugador: Bot, carta_visible):
+        """Obtiene la decisión de un jugador, remoto o local."""
+        if pedido == APUESTA:
+            if isinstance(jugador, JugadorRemoto):
+                respuesta = await jugador.preguntar(f"APUESTA {jugador.fichas}", self.__tiempo_limite)
+                if respuesta is not None and respuesta.isdigit() and 1 <= int(respuesta) <= jugador.fichas:
+                    return int(respuesta)
+            return jugador.apuesto()
+        if pedido == SEGURO:  # El protocolo no pregunta por el seguro: decide la política
+            return jugador.tomo_seguro(carta_visible)
+        if isinstance(jugador, JugadorRemoto):
+            respuesta = await jugador.preguntar(f"JUGADA {jugador.sumar_cartas()} {carta_visible.numero}",
+                                                self.__tiempo_limite)
+            if respuesta is not None and respuesta.upper() in ("S", "N"):
+                return respuesta.upper() == "S"
+        return jugador.decidir(carta_visible, self.__juego.opciones)
+
+    async def jugar_ronda(self):
+        """Juega una ronda completa esperando las decisiones sin bloquear.
+
+        Returns:
+            ResultadoRonda: El resultado de la ronda.
+        """
+        for jugador in self.__espera:
+            self.__juego.agregar_jugador(jugador)
+        self.__espera.clear()
+        self.__hay_espera.clear()
+        # Los resultados vienen en orden de asiento, incluidos los de quienes se retiran en la ronda
+        sentados = list(self.__juego.jugadores)
+        pasos = self.__juego.ronda_paso_a_paso()
+        respuesta = None
+        while True:
+            try:
+                pedido, jugador, carta_visible = pasos.send(respuesta)
+            except StopIteration as fin:
+                resultado = fin.value
+                break
+            respuesta = await self.__resolver(pedido, jugador, carta_visible)
+        self.__rondas += 1
+        await self.__avisar(sentados, resultado)
+        return resultado
+
+    async def __avisar(self, sentados: list, resultado) -> None:
+        """Informa el resultado a los jugadores remotos y saca a los desconectados.
+
+        Args:
+            sentados (list[Bot]): Los jugadores que jugaron la ronda, en orden de asiento.
+            resultado (ResultadoRonda): El resultado de la ronda.
+        """
+        for jugador, r in zip(sentados, resultado.jugadores):
+            if isinstance(jugador, JugadorRemoto):
+                await jugador.enviar(f"RESULTADO {resultado.suma_croupier} {r.ganancia} {r.fichas}")
+        for jugador in list(self.__juego.jugadores):
+            if isinstance(jugador, JugadorRemoto) and not jugador.conectado:
+                self.__juego.jugadores.remove(jugador)
+                await jugador.cerrar()
+
+    async def jugar(self) -> None:
+        """Juega rondas para siempre, esperando jugadores cuando la mesa queda vacía."""
+        while True:
+            if not self.__juego.jugadores and not self.__espera:
+                await self.__hay_espera.wait()
+            antes = list(self.__juego.jugadores) + list(self.__espera)
+            await self.jugar_ronda()
+            for jugador in antes:
+                if jugador not in self.__juego.jugadores and isinstance(jugador, JugadorRemoto) \
+                        and jugador.conectado:
+                    await jugador.enviar("RETIRADO")
+                    await jugador.cerrar()
+            await asyncio.sleep(self.__pausa)  # Cede el turno a las otras mesas
+
+
+class ServidorBlackJack:
+    """Servidor TCP que reparte jugadores entre mesas asíncronas.
+
+    Atributos:
+        __mesas (list[MesaAsincrona]): Las mesas abiertas.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", puerto: int = 2121, asientos: int = 5,
+                 fichas_iniciales: int = 100, tiempo_limite: float = 30.0) -> None:
+        """Inicializa el servidor.
+
+        Args:
+            host (str, optional): Dirección donde escuchar. Por defecto 127.0.0.1.
+            puerto (int, optional): Puerto donde escuchar. Por defecto 2121.
+            asientos (int, optional): Asientos por mesa. Por defecto 5.
+            fichas_iniciales (int, optional): Fichas de cada jugador nuevo. Por defecto 100.
+            tiempo_limite (float, optional): Segundos que se espera cada decisión. Por defecto 30.
+        """
+        self.__host: str = host
+        self.__puerto: int = puerto
+        self.__asientos: int = asientos
+        self.__fichas: int = fichas_iniciales
+        self.__tiempo_limite: float = tiempo_limite
+        self.__mesas: list[MesaAsincrona] = []
+        self.__tareas: list[asyncio.Task] = []
+        self.__servidor: asyncio.AbstractServer = None
+
+    @property
+    def mesas(self) -> list[MesaAsincrona]:
+        """Retorna las mesas abiertas."""
+        return self.__mesas
+
+    @property
+    def puerto(self) -> int:
+        """Retorna el puerto donde escucha el servidor (útil si se pidió el puerto 0)."""
+        if self.__servidor is not None and self.__servidor.sockets:
+            return self.__servidor.sockets[0].getsockname()[1]
+        return self.__puerto
+
+    def abrir_mesa(self) -> MesaAsincrona:
+        """Abre una mesa nueva y lanza su tarea."""
+        mesa = MesaAsincrona(len(self.__mesas) + 1, self.__asientos, self.__tiempo_limite)
+        self.__mesas.append(mesa)
+        self.__tareas.append(asyncio.create_task(mesa.jugar()))
+        return mesa
+
+    def mesa_libre(self) -> MesaAsincrona:
+        """Retorna una mesa con lugar, abriendo una nueva si están todas llenas."""
+        for mesa in self.__mesas:
+            if mesa.hay_lugar():
+                return mesa
+        return self.abrir_mesa()
+
+    async def __atender(self, lector: asyncio.StreamReader, escritor: asyncio.StreamWriter) -> None:
+        """Recibe una conexión nueva y sienta al jugador en una mesa."""
+        try:
+            linea = await asyncio.wait_for(lector.readline(), self.__tiempo_limite)
+        except (asyncio.TimeoutError, ConnectionError, OSError):
+            linea = b""
+        partes = linea.decode(errors="replace").strip().split(maxsplit=1)
+        if len(partes) != 2 or partes[0].upper() != "NOMBRE":
+            escritor.write(b"ERROR se esperaba NOMBRE <nombre>\n")
+            escritor.close()
+            return
+        jugador = JugadorRemoto(partes[1], self.__fichas, lector, escritor)
+        # Sin esperas entre buscar la mesa y sentarse: otra conexión podría ocupar el asiento
+        mesa = self.mesa_libre()
+        mesa.sentar(jugador)
+        await jugador.enviar(f"BIENVENIDO {mesa.numero} {jugador.fichas}")
+
+    async def iniciar(self) -> None:
+        """Empieza a escuchar conexiones."""
+        self.__servidor = await asyncio.start_server(self.__atender, self.__host, self.__puerto)
+
+    async def detener(self) -> None:
+        """Deja de escuchar y cancela las mesas."""
+        if self.__servidor is not None:
+            self.__servidor.close()
+            await self.__servidor.wait_closed()
+        for tarea in self.__tareas:
+            tarea.cancel()
+        await asyncio.gather(*self.__tareas, return_exceptions=True)
+
+    async def servir(self) -> None:
+        """Inicia el servidor y atiende hasta que se cancele."""
+        await self.iniciar()
+        try:
+            await self.__servidor.serve_forever()
+        finally:
+            await self.detener()
+
+
+def test_avisar_por_asiento():
+    print("Se esta ejecutando el test de los avisos de la mesa asíncrona")
+
+    class Escritor:
+        """Guarda las líneas enviadas en lugar de mandarlas por la red."""
+        def __init__(self) -> None:
+            self.lineas = []
+
+        def write(self, datos: bytes) -> None:
+            self.lineas.append(datos.decode().strip())
+
+        async def drain(self) -> None:
+            pass
+
+        def close(self) -> None:
+            pass
+
+        async def wait_closed(self) -> None:
+            pass
+
+    async def jugar() -> list:
+        # Dos jugadores con el mismo nombre que nunca contestan: deciden sus políticas
+        mesa = MesaAsincrona(1, tiempo_limite=0.001)
+        escritores = [Escritor(), Escritor()]
+        for escritor, fichas in zip(escritores, (1, 1_000_000)):
+            mesa.sentar(JugadorRemoto("Igual", fichas, asyncio.StreamReader(), escritor))
+        while len(mesa.juego.jugadores) != 1:
+            await mesa.jugar_ronda()
+        return escritores
+
+    pobre, rico = (escritor.lineas for escritor in asyncio.run(jugar()))
+    resultados = [linea for linea in pobre if linea.startswith("RESULTADO")]
+    # Cada uno recibe su propio resultado, también el de la ronda en la que se quedó sin fichas
+    assert len(resultados) == len([linea for linea in rico if linea.startswith("RESULTADO")])
+    assert resultados[-1].split()[-1] == "0"
+    assert all(int(linea.split()[-1]) > 1 for linea in rico if linea.startswith("RESULTADO"))
+
+
+
+def test_ultimo_asiento():
+    print("Se esta ejecutando el test de dos clientes que llegan por el último asiento")
+
+    class Escritor:
+        """Guarda las líneas enviadas y cede el turno al enviarlas, como una conexión lenta."""
+        def __init__(self) -> None:
+            self.lineas = []
+
+        def write(self, datos: bytes) -> None:
+            self.lineas.append(datos.decode().strip())
+
+        async def drain(self) -> None:
+            await asyncio.sleep(0)
+
+        def close(self) -> None:
+            pass
+
+        async def wait_closed(self) -> None:
+            pass
+
+    async def jugar() -> tuple:
+        servidor = ServidorBlackJack(asientos=1, tiempo_limite=0.001)
+        atender = servidor._ServidorBlackJack__atender
+        escritores = [Escritor(), Escritor()]
+        conexiones = []
+        for nombre, escritor in zip(("Uno", "Dos"), escritores):
+            lector = asyncio.StreamReader()
+            lector.feed_data(f"NOMBRE {nombre}\n".encode())
+            conexiones.append(atender(lector, escritor))
+        await asyncio.gather(*conexiones)
+        ocupados = [mesa.ocupados() for mesa in servidor.mesas]
+        await servidor.detener()
+        return escritores, ocupados
+
+    escritores, ocupados = asyncio.run(jugar())
+    # Cada uno queda sentado en su propia mesa antes de recibir la bienvenida
+    assert ocupados == [1, 1]
+    assert [escritor.lineas[0] for escritor in escritores] == ["BIENVENIDO 1 100", "BIENVENIDO 2 100"]
+
+
+if __name__ == '__main__':
+    import argparse
+    parser = argparse.ArgumentParser(description="Servidor de mesas de BlackJack")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--puerto", type=int, default=2121)
+    parser.add_argument("--asientos", type=int, default=5)
+    parser.add_argument("--fichas", type=int, default=100)
+    parser.add_argument("--tiempo-limite", type=float, default=30.0)
+    args = parser.parse_args()
+    servidor = ServidorBlackJack(args.host, args.puerto, args.asientos, args.fichas, args.tiempo_limite)
+    try:
+        asyncio.run(servidor.servir())
+    except KeyboardInterrupt:
+        pass
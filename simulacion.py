@@ -0,0 +1,210 @@
+"""
+simulacion.py - Simulación Monte Carlo de BlackJack en paralelo.
+
+Reparte N rondas del modo silencioso de `BlackJack` en una cantidad fija de
+lotes, que se juegan en varios procesos. Cada lote usa su propio generador
+(`GeneradorContador`), en el flujo de su número de lote y con una semilla
+común, que comparten la mesa y las políticas de sus jugadores. Como los lotes
+no dependen de la cantidad de procesos, la misma semilla da el mismo resultado
+en cualquier máquina; los lotes son independientes entre sí y nadie toca el
+estado global del módulo random.
+
+Funciones principales:
+    - simular: Juega N rondas en paralelo y devuelve un ResultadoSimulacion.
+
+Uso típico:
+
+    resultado = simular(1_000_000, personalidad=50, semilla=42)
+    print(resultado.ventaja_casa)
+"""
+
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from aleatorio import GeneradorContador
+from barajado import PoliticaBarajado, CartaDeCorte
+from juego_black_jack import BlackJack
+from jugadores import Bot
+from politicas import ApuestaFija, PoliticaPersonalidad
+
+# Lotes en los que se reparten las rondas por defecto, sin importar cuántos procesos haya
+LOTES = 16
+
+@dataclass(slots=True)
+class ResultadoSimulacion:
+    """Totales acumulados de una simulación.
+
+    Atributos:
+        rondas (int): Rondas jugadas.
+        manos (int): Manos jugadas (una por jugador y ronda).
+        ganadas (int): Manos ganadas por los jugadores.
+        perdidas (int): Manos perdidas por los jugadores.
+        empates (int): Manos empatadas.
+        apostado (int): Total de fichas apostadas, con dobladas, divisiones y seguro.
+        neto (int): Ganancia neta de los jugadores (negativa si gana la casa).
+        trayectorias (list[list[int]]): Fichas del primer jugador de cada lote, muestreadas cada cierto número de rondas.
+    """
+    rondas: int = 0
+    manos: int = 0
+    ganadas: int = 0
+    perdidas: int = 0
+    empates: int = 0
+    apostado: int = 0
+    neto: int = 0
+    trayectorias: list = field(default_factory=list)
+
+    @property
+    def ventaja_casa(self) -> float:
+        """Retorna la ventaja de la casa como fracción de lo apostado."""
+        return -self.neto / self.apostado if self.apostado else 0.0
+
+    @property
+    def tasa_ganadas(self) -> float:
+        """Retorna la fracción de manos ganadas por los jugadores."""
+        return self.ganadas / self.manos if self.manos else 0.0
+
+    @property
+    def tasa_perdidas(self) -> float:
+        """Retorna la fracción de manos perdidas por los jugadores."""
+        return self.perdidas / self.manos if self.manos else 0.0
+
+    @property
+    def tasa_empates(self) -> float:
+        """Retorna la fracción de manos empatadas."""
+        return self.empates / self.manos if self.manos else 0.0
+
+    def fusionar(self, otro: "ResultadoSimulacion") -> None:
+        """Suma los totales de otro resultado a este.
+
+        Args:
+            otro (ResultadoSimulacion): El resultado a sumar.
+        """
+        self.rondas += otro.rondas
+        self.manos += otro.manos
+        self.ganadas += otro.ganadas
+        self.perdidas += otro.perdidas
+        self.empates += otro.empates
+        self.apostado += otro.apostado
+        self.neto += otro.neto
+        self.trayectorias.extend(otro.trayectorias)
+
+    def __str__(self) -> str:
+        return (f"Rondas: {self.rondas} Manos: {self.manos} "
+                f"Ganadas: {self.tasa_ganadas:.4f} Perdidas: {self.tasa_perdidas:.4f} "
+                f"Empates: {self.tasa_empates:.4f} Ventaja de la casa: {self.ventaja_casa:.4%}")
+
+
+def _nueva_mesa(personalidad: int, jugadores: int, fichas: int, apuesta: int,
+                generador: random.Random, barajado: PoliticaBarajado) -> BlackJack:
+    """Arma una mesa silenciosa con bots que juegan con la personalidad indicada."""
+    juego = BlackJack(interactivo=False, generador=generador, barajado=barajado)
+    politica_juego = PoliticaPersonalidad(personalidad, generador)
+    politica_apuesta = ApuestaFija(apuesta)
+    for i in range(jugadores):
+        juego.agregar_jugador(Bot(f"Bot {i + 1}", fichas, politica_juego, politica_apuesta))
+    return juego
+
+
+def _simular_lote(rondas: int, semilla: int, lote: int, personalidad: int, jugadores: int,
+                  fichas: int, apuesta: int, muestreo: int, barajado: PoliticaBarajado) -> ResultadoSimulacion:
+    """Juega un lote de rondas en el proceso actual.
+
+    Si todos los jugadores se quedan sin fichas se arma una mesa nueva,
+    de manera que el lote siempre juega la cantidad de rondas pedida.
+    """
+    generador = GeneradorContador(semilla, lote)
+    resultado = ResultadoSimulacion()
+    trayectoria = []
+    juego = _nueva_mesa(personalidad, jugadores, fichas, apuesta, generador, barajado)
+    while resultado.rondas < rondas:
+        for ronda in juego.rondas(rondas - resultado.rondas):
+            resultado.rondas += 1
+            for jugador in ronda.jugadores:
+                resultado.manos += 1
+                resultado.apostado += jugador.apostado
+                resultado.neto += jugador.ganancia
+                if jugador.ganancia > 0:
+                    resultado.ganadas += 1
+                elif jugador.ganancia < 0:
+                    resultado.perdidas += 1
+                else:
+                    resultado.empates += 1
+            if muestreo and resultado.rondas % muestreo == 0:
+                trayectoria.append(ronda.jugadores[0].fichas)
+        if resultado.rondas < rondas:
+            juego = _nueva_mesa(personalidad, jugadores, fichas, apuesta, generador, barajado)
+    resultado.trayectorias.append(trayectoria)
+    return resultado
+
+
+def simular(rondas: int, personalidad: int = 50, jugadores: int = 1, fichas: int = 1_000_000,
+            apuesta: int = 1, semilla: int = 0, procesos: int = None,
+            muestreo: int = 1000, barajado: PoliticaBarajado = None, lotes: int = LOTES) -> ResultadoSimulacion:
+    """Juega `rondas` rondas repartidas en `lotes` lotes, que se juegan en varios procesos.
+
+    El resultado solo depende de la semilla y de los lotes, no de los procesos.
+
+    Args:
+        rondas (int): Cantidad total de rondas a jugar.
+        personalidad (int, optional): Personalidad de los bots, como la de Compu. Por defecto es 50.
+        jugadores (int, optional): Cantidad de bots por mesa. Por defecto es 1.
+        fichas (int, optional): Fichas iniciales de cada bot. Por defecto es 1.000.000.
+        apuesta (int, optional): Fichas que apuesta cada bot por ronda. Por defecto es 1.
+        semilla (int, optional): Semilla de la que se derivan los flujos de cada lote. Por defecto es 0.
+        procesos (int, optional): Cantidad de procesos. Por defecto, uno por núcleo; con 1 se juega
+            en el proceso actual.
+        muestreo (int, optional): Cada cuántas rondas se registra la trayectoria de fichas. 0 la desactiva.
+        barajado (PoliticaBarajado, optional): Política de barajado de las mesas. Por defecto se
+            baraja el mazo entero en cada ronda.
+        lotes (int, optional): Cantidad de lotes, cada uno con su flujo. Por defecto es LOTES.
+
+    Returns:
+        ResultadoSimulacion: Los totales de todos los lotes.
+
+    Raises:
+        ValueError: Si la cantidad de lotes no es positiva.
+    """
+    if lotes < 1:
+        raise ValueError("La cantidad de lotes debe ser positiva")
+    procesos = procesos or os.cpu_count() or 1
+    lotes = min(lotes, rondas) or 1
+    tamanios = [rondas // lotes + (1 if i < rondas % lotes else 0) for i in range(lotes)]
+    resultado = ResultadoSimulacion()
+    if procesos == 1:
+        for lote, tamanio in enumerate(tamanios):
+            resultado.fusionar(_simular_lote(tamanio, semilla, lote, personalidad, jugadores,
+                                             fichas, apuesta, muestreo, barajado))
+        return resultado
+    with ProcessPoolExecutor(max_workers=procesos) as ejecutor:
+        futuros = [ejecutor.submit(_simular_lote, tamanio, semilla, lote, personalidad,
+                                   jugadores, fichas, apuesta, muestreo, barajado)
+                   for lote, tamanio in enumerate(tamanios)]
+        for futuro in futuros:
+            resultado.fusionar(futuro.result())
+    return resultado
+
+
+def test_simular_reproducible():
+    print("Se esta ejecutando el test de la simulación con distintos procesos")
+    opciones = dict(jugadores=2, semilla=9, muestreo=50, lotes=5)
+    en_serie = simular(1_003, procesos=1, **opciones)
+    assert en_serie.rondas == 1_003 and len(en_serie.trayectorias) == 5
+    assert simular(1_003, procesos=2, **opciones) == en_serie
+
+
+if __name__ == '__main__':
+    import argparse
+    parser = argparse.ArgumentParser(description="Simulación Monte Carlo de BlackJack")
+    parser.add_argument("rondas", type=int)
+    parser.add_argument("--personalidad", type=int, default=50)
+    parser.add_argument("--jugadores", type=int, default=1)
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--procesos", type=int, default=None)
+    parser.add_argument("--lotes", type=int, default=LOTES)
+    parser.add_argument("--penetracion", type=float, default=None,
+                        help="baraja al llegar a la carta de corte en lugar de en cada ronda")
+    args = parser.parse_args()
+    barajado = CartaDeCorte(args.penetracion) if args.penetracion else None
+    print(simular(args.rondas, personalidad=args.personalidad, jugadores=args.jugadores,
+                  semilla=args.semilla, procesos=args.procesos, barajado=barajado, lotes=args.lotes))
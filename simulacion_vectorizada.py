@@ -0,0 +1,213 @@
+"""
+simulacion_vectorizada.py - Simulación de BlackJack por lotes con NumPy.
+
+Juega muchas manos independientes a la vez. Cada mano tiene su propio mazo,
+representado por la cantidad de cartas de cada valor que quedan (una fila de
+un arreglo de N x 10), y todas avanzan juntas: reparto, decisiones del
+jugador, juego del croupier y pago. Sacar una carta de un mazo recién barajado
+es equivalente a elegir una al azar entre las que quedan, así que no hace
+falta barajar las 312 cartas.
+
+Las reglas son las del modo silencioso de `BlackJack`: se baraja el mazo en
+cada ronda, el jugador pide mientras tenga menos de 21 y su política se lo
+indique, el croupier pide hasta llegar a 17 (`Croupier.plantarse_por_regla`) y
+el pago es 1 a 1, como en `__croupier_reparte_premios` con REGLAS_CLASICAS. De las
+reglas de la mesa solo se pueden cambiar la cantidad de mazos y si el croupier
+pide con 17 blando; no se dobla, no se divide, no hay seguro ni rendición y el
+Black Jack se paga como cualquier mano ganada.
+
+Requiere numpy.
+
+Funciones principales:
+    - simular_lotes: Juega N manos y devuelve un ResultadoSimulacion.
+    - tabla_de_politica: Convierte una política de juego en una tabla de decisiones.
+
+Uso típico:
+
+    resultado = simular_lotes(1_000_000, PoliticaEstrategiaBasica(), semilla=1)
+    print(resultado.ventaja_casa)
+"""
+
+from dataclasses import replace
+
+try:
+    import numpy as np
+except ImportError:  # numpy es opcional: solo lo necesita este módulo
+    np = None
+
+from estrategia import PLANTARSE
+from politicas import PlantarseEn, PoliticaEstrategiaBasica
+from reglas import ReglasMesa, REGLAS_CLASICAS
+from simulacion import ResultadoSimulacion
+from totales import TOTALES, BLANDAS
+
+if np is not None:
+    # Las tablas de totales como arreglos, indexadas por dura * 2 + tiene_as
+    _TOTALES = np.frombuffer(TOTALES, dtype=np.uint8).astype(np.int16)
+    _BLANDAS = np.frombuffer(BLANDAS, dtype=np.bool_)
+
+
+def _requiere_numpy() -> None:
+    if np is None:
+        raise ImportError("simulacion_vectorizada requiere numpy (pip install numpy)")
+
+
+def tabla_de_politica(politica):
+    """Convierte una política determinista en una tabla de decisiones.
+
+    Args:
+        politica (PlantarseEn | PoliticaEstrategiaBasica): La política a convertir.
+
+    Returns:
+        numpy.ndarray: Arreglo booleano `pide[total, blanda, carta_visible]` de 32 x 2 x 11;
+            True si el jugador pide carta.
+
+    Raises:
+        TypeError: Si la política no se puede expresar como tabla.
+    """
+    _requiere_numpy()
+    pide = np.zeros((32, 2, 11), dtype=bool)
+    if isinstance(politica, PlantarseEn):
+        pide[:politica.umbral, :, :] = True
+    elif isinstance(politica, PoliticaEstrategiaBasica):
+        estrategia = politica.estrategia
+        for carta_visible in range(1, 11):
+            for total in range(4, 21):
+                pide[total, 0, carta_visible] = estrategia.decidir(
+                    total, False, carta_visible, puede_doblar=False, puede_dividir=False) != PLANTARSE
+            for total in range(12, 21):
+                pide[total, 1, carta_visible] = estrategia.decidir(
+                    total, True, carta_visible, puede_doblar=False, puede_dividir=False) != PLANTARSE
+    else:
+        raise TypeError(f"No se puede vectorizar la política {type(politica).__name__}")
+    pide[21:, :, :] = False
+    return pide
+
+
+def _sacar(cantidades, filas, rng):
+    """Saca una carta al azar del mazo de cada fila indicada.
+
+    Args:
+        cantidades (numpy.ndarray): Cartas de cada valor que quedan en cada mazo (N x 10).
+        filas (numpy.ndarray): Índices de los mazos de los que se saca.
+        rng (numpy.random.Generator): Generador de números aleatorios.
+
+    Returns:
+        numpy.ndarray: El valor (1 a 10) de cada carta sacada.
+    """
+    mazos = cantidades[filas]
+    acumuladas = mazos.cumsum(axis=1)
+    sorteo = (rng.random(len(filas)) * acumuladas[:, -1]).astype(np.int64)
+    posiciones = (acumuladas <= sorteo[:, None]).sum(axis=1)
+    cantidades[filas, posiciones] -= 1
+    return posiciones + 1
+
+
+def _agregar(dura, ases, filas, valores) -> None:
+    """Agrega cartas a las manos de las filas indicadas."""
+    dura[filas] += valores
+    ases[filas] += valores == 1
+
+
+def _total(dura, ases):
+    """Mejor total de cada mano y si es blanda, leídos de las tablas de totales."""
+    indices = (dura << 1) | (ases > 0)
+    return _TOTALES[indices], _BLANDAS[indices]
+
+
+def _jugar_lote(manos: int, pide, reglas: ReglasMesa, rng):
+    """Juega un lote de manos y retorna la ganancia de cada una (-1, 0 o 1)."""
+    composicion = np.array((4 * reglas.mazos,) * 9 + (16 * reglas.mazos,), dtype=np.int16)
+    cantidades = np.tile(composicion, (manos, 1))
+    todas = np.arange(manos)
+    jugador_dura = np.zeros(manos, dtype=np.int16)
+    jugador_ases = np.zeros(manos, dtype=np.int16)
+    croupier_dura = np.zeros(manos, dtype=np.int16)
+    croupier_ases = np.zeros(manos, dtype=np.int16)
+
+    # Reparto: dos cartas al jugador, la tapada y la visible al croupier
+    _agregar(jugador_dura, jugador_ases, todas, _sacar(cantidades, todas, rng))
+    _agregar(jugador_dura, jugador_ases, todas, _sacar(cantidades, todas, rng))
+    _agregar(croupier_dura, croupier_ases, todas, _sacar(cantidades, todas, rng))
+    visible = _sacar(cantidades, todas, rng)
+    _agregar(croupier_dura, croupier_ases, todas, visible)
+
+    # Juegan los jugadores
+    total, blanda = _total(jugador_dura, jugador_ases)
+    activas = np.nonzero(pide[total, blanda.astype(np.int8), visible])[0]
+    while len(activas):
+        _agregar(jugador_dura, jugador_ases, activas, _sacar(cantidades, activas, rng))
+        total, blanda = _total(jugador_dura[activas], jugador_ases[activas])
+        activas = activas[pide[np.minimum(total, 31), blanda.astype(np.int8), visible[activas]]]
+    total_jugador = _total(jugador_dura, jugador_ases)[0]
+
+    # Juega el croupier (solo importa donde el jugador no se pasó)
+    def croupier_pide(filas):
+        total, blanda = _total(croupier_dura[filas], croupier_ases[filas])
+        pide_croupier = total < 17
+        if reglas.croupier_pide_17_blando:
+            pide_croupier |= (total == 17) & blanda
+        return filas[pide_croupier]
+
+    activas = croupier_pide(np.nonzero(total_jugador <= 21)[0])
+    while len(activas):
+        _agregar(croupier_dura, croupier_ases, activas, _sacar(cantidades, activas, rng))
+        activas = croupier_pide(activas)
+    total_croupier = _total(croupier_dura, croupier_ases)[0]
+
+    # Pago 1 a 1
+    ganancia = np.sign(total_jugador - total_croupier).astype(np.int8)
+    ganancia[total_croupier > 21] = 1
+    ganancia[total_jugador > 21] = -1
+    return ganancia
+
+
+def simular_lotes(manos: int, politica=None, reglas: ReglasMesa = REGLAS_CLASICAS,
+                  semilla: int = 0, tamanio_lote: int = 100_000) -> ResultadoSimulacion:
+    """Juega `manos` manos independientes en lotes vectorizados.
+
+    Args:
+        manos (int): Cantidad total de manos.
+        politica (PlantarseEn | PoliticaEstrategiaBasica | numpy.ndarray, optional): La política
+            del jugador, o una tabla ya armada con `tabla_de_politica`. Por defecto PlantarseEn(17).
+        reglas (ReglasMesa, optional): Las reglas de la mesa. Por defecto REGLAS_CLASICAS. Solo
+            se pueden cambiar `mazos` y `croupier_pide_17_blando`.
+        semilla (int, optional): Semilla del generador. Por defecto es 0.
+        tamanio_lote (int, optional): Manos que se juegan a la vez. Por defecto 100.000.
+
+    Returns:
+        ResultadoSimulacion: Los totales de la simulación, con apuesta de una ficha por mano.
+
+    Raises:
+        ValueError: Si las reglas cambian algo más que los mazos y el 17 blando del croupier.
+    """
+    _requiere_numpy()
+    if replace(reglas, mazos=REGLAS_CLASICAS.mazos, croupier_pide_17_blando=REGLAS_CLASICAS.croupier_pide_17_blando,
+               doblar_despues_de_dividir=REGLAS_CLASICAS.doblar_despues_de_dividir) != REGLAS_CLASICAS:
+        raise ValueError("La simulación por lotes solo juega las reglas clásicas: "
+                         "se pueden cambiar los mazos y el 17 blando del croupier")
+    if politica is None:
+        politica = PlantarseEn(17)
+    pide = politica if isinstance(politica, np.ndarray) else tabla_de_politica(politica)
+    rng = np.random.default_rng(semilla)
+    resultado = ResultadoSimulacion()
+    restantes = manos
+    while restantes > 0:
+        lote = min(tamanio_lote, restantes)
+        ganancia = _jugar_lote(lote, pide, reglas, rng)
+        resultado.rondas += lote
+        resultado.manos += lote
+        resultado.apostado += lote
+        resultado.neto += int(ganancia.sum(dtype=np.int64))
+        resultado.ganadas += int(np.count_nonzero(ganancia > 0))
+        resultado.perdidas += int(np.count_nonzero(ganancia < 0))
+        resultado.empates += int(np.count_nonzero(ganancia == 0))
+        restantes -= lote
+    return resultado
+
+
+if __name__ == '__main__':
+    import time
+    inicio = time.perf_counter()
+    print(simular_lotes(1_000_000, PoliticaEstrategiaBasica(), semilla=1))
+    print(f"{time.perf_counter() - inicio:.2f} s")
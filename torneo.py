@@ -0,0 +1,365 @@
+"""
+torneo.py - Torneos de supervivencia de jugadores computarizados, en paralelo.
+
+Sienta a muchos jugadores, cada uno con su personalidad (como la de `Compu`), en
+mesas silenciosas de `BlackJack` y juega cada mesa hasta que todos se retiran
+sin fichas o se llega a un máximo de rondas. Las mesas se reparten entre varios
+procesos y sus resultados se devuelven a medida que terminan, así que se pueden
+acumular estadísticas de millones de jugadores en memoria constante.
+
+`Compu` imprime y pausa la consola en cada decisión, así que en el torneo cada
+jugador es un `Bot` con una `PoliticaPersonalidad`, que toma las mismas
+decisiones sin interacción. Cada mesa usa su propio `GeneradorContador`, en el
+flujo de su número de mesa, así que el torneo es reproducible.
+
+Clases:
+    - ResultadoTorneoJugador: Cómo terminó cada jugador.
+    - EstadisticasPersonalidad: Probabilidad y tiempo de ruina de una personalidad.
+    - EstadisticasTorneo: Estadísticas de todas las personalidades.
+
+Funciones principales:
+    - jugar_torneo: Generador que devuelve los resultados de cada mesa a medida que termina.
+    - torneo: Juega un torneo completo y devuelve sus EstadisticasTorneo.
+
+Uso típico:
+
+    estadisticas = torneo(range(1, 101), repeticiones=100, semilla=42)
+    print(estadisticas)
+"""
+
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import chain, islice, repeat
+from aleatorio import GeneradorContador
+from barajado import PoliticaBarajado
+from estadisticas import Welford
+from juego_black_jack import BlackJack
+from jugadores import Bot
+from politicas import PoliticaPersonalidad
+from reglas import ReglasMesa, REGLAS_CLASICAS
+
+
+@dataclass(frozen=True, slots=True)
+class ResultadoTorneoJugador:
+    """Cómo terminó un jugador del torneo.
+
+    Atributos:
+        mesa (int): Número de mesa.
+        asiento (int): Asiento inicial en la mesa.
+        personalidad (int): Personalidad del jugador.
+        rondas (int): Rondas jugadas hasta arruinarse, o hasta el final si sobrevivió.
+        fichas (int): Fichas al terminar (0 o menos si se arruinó).
+        arruinado (bool): Si se retiró sin fichas.
+    """
+    mesa: int
+    asiento: int
+    personalidad: int
+    rondas: int
+    fichas: int
+    arruinado: bool
+
+
+class EstadisticasPersonalidad:
+    """Ruina y supervivencia de los jugadores de una personalidad.
+
+    El tiempo de ruina se guarda como media y varianza (Welford) y como
+    histograma por clases de `ancho` rondas.
+
+    Atributos:
+        __ancho (int): Rondas por clase del histograma de tiempo de ruina.
+        __jugadores (int): Jugadores agregados.
+        __rondas_ruina (Welford): Rondas hasta arruinarse, de los que se arruinaron.
+        __fichas_finales (Welford): Fichas al terminar, de los que sobrevivieron.
+        __clases (dict[int, int]): Arruinados por clase (rondas // ancho).
+    """
+
+    def __init__(self, ancho: int = 50) -> None:
+        """Inicializa estadísticas vacías.
+
+        Args:
+            ancho (int, optional): Rondas por clase del histograma de tiempo de ruina. Por defecto es 50.
+
+        Raises:
+            ValueError: Si el ancho no es positivo.
+        """
+        if ancho < 1:
+            raise ValueError("El ancho de clase debe ser positivo")
+        self.__ancho: int = ancho
+        self.__jugadores: int = 0
+        self.__rondas_ruina: Welford = Welford()
+        self.__fichas_finales: Welford = Welford()
+        self.__clases: dict[int, int] = {}
+
+    @property
+    def ancho(self) -> int:
+        """Retorna las rondas por clase del histograma de tiempo de ruina."""
+        return self.__ancho
+
+    @property
+    def jugadores(self) -> int:
+        """Retorna la cantidad de jugadores agregados."""
+        return self.__jugadores
+
+    @property
+    def arruinados(self) -> int:
+        """Retorna la cantidad de jugadores que se arruinaron."""
+        return self.__rondas_ruina.cantidad
+
+    @property
+    def probabilidad_ruina(self) -> float:
+        """Retorna la fracción de jugadores que se arruinaron."""
+        return self.arruinados / self.__jugadores if self.__jugadores else 0.0
+
+    @property
+    def rondas_ruina(self) -> Welford:
+        """Retorna media y varianza de las rondas hasta arruinarse."""
+        return self.__rondas_ruina
+
+    @property
+    def fichas_finales(self) -> Welford:
+        """Retorna media y varianza de las fichas de los que sobrevivieron."""
+        return self.__fichas_finales
+
+    @property
+    def histograma_ruina(self) -> dict[int, int]:
+        """Retorna los arruinados por clase: primera ronda de la clase -> cantidad."""
+        return {clase * self.__ancho: cantidad for clase, cantidad in sorted(self.__clases.items())}
+
+    def agregar(self, resultado: ResultadoTorneoJugador) -> None:
+        """Agrega el resultado de un jugador."""
+        self.__jugadores += 1
+        if resultado.arruinado:
+            self.__rondas_ruina.agregar(resultado.rondas)
+            clase = resultado.rondas // self.__ancho
+            self.__clases[clase] = self.__clases.get(clase, 0) + 1
+        else:
+            self.__fichas_finales.agregar(resultado.fichas)
+
+    def fusionar(self, otra: "EstadisticasPersonalidad") -> None:
+        """Suma otras estadísticas, con el mismo ancho de clase, a estas.
+
+        Raises:
+            ValueError: Si los anchos de clase son distintos.
+        """
+        if otra.__ancho != self.__ancho:
+            raise ValueError("Solo se fusionan estadísticas con el mismo ancho de clase")
+        self.__jugadores += otra.__jugadores
+        self.__rondas_ruina.fusionar(otra.__rondas_ruina)
+        self.__fichas_finales.fusionar(otra.__fichas_finales)
+        for clase, cantidad in otra.__clases.items():
+            self.__clases[clase] = self.__clases.get(clase, 0) + cantidad
+
+    def __str__(self) -> str:
+        return (f"Jugadores: {self.__jugadores} Ruina: {self.probabilidad_ruina:.4f} "
+                f"Rondas hasta la ruina: {self.__rondas_ruina.media:.1f} "
+                f"± {self.__rondas_ruina.desviacion:.1f}")
+
+
+class EstadisticasTorneo:
+    """Estadísticas de un torneo, separadas por personalidad.
+
+    Atributos:
+        __ancho (int): Rondas por clase del histograma de tiempo de ruina.
+        __personalidades (dict[int, EstadisticasPersonalidad]): Estadísticas por personalidad.
+    """
+
+    def __init__(self, ancho: int = 50) -> None:
+        """Inicializa estadísticas vacías.
+
+        Args:
+            ancho (int, optional): Rondas por clase del histograma de tiempo de ruina. Por defecto es 50.
+        """
+        self.__ancho: int = ancho
+        self.__personalidades: dict[int, EstadisticasPersonalidad] = {}
+
+    @property
+    def personalidades(self) -> dict[int, EstadisticasPersonalidad]:
+        """Retorna las estadísticas de cada personalidad, ordenadas por personalidad."""
+        return dict(sorted(self.__personalidades.items()))
+
+    def personalidad(self, personalidad: int) -> EstadisticasPersonalidad:
+        """Retorna las estadísticas de una personalidad, creándolas si no existen."""
+        estadisticas = self.__personalidades.get(personalidad)
+        if estadisticas is None:
+            estadisticas = self.__personalidades[personalidad] = EstadisticasPersonalidad(self.__ancho)
+        return estadisticas
+
+    def agregar(self, resultado: ResultadoTorneoJugador) -> None:
+        """Agrega el resultado de un jugador."""
+        self.personalidad(resultado.personalidad).agregar(resultado)
+
+    def consumir(self, mesas) -> "EstadisticasTorneo":
+        """Agrega los resultados de todas las mesas de un iterable (por ejemplo, jugar_torneo).
+
+        Returns:
+            EstadisticasTorneo: Estas mismas estadísticas, para encadenar.
+        """
+        for mesa in mesas:
+            for resultado in mesa:
+                self.agregar(resultado)
+        return self
+
+    def fusionar(self, otra: "EstadisticasTorneo") -> None:
+        """Suma las estadísticas de otro torneo a estas."""
+        for personalidad, estadisticas in otra.__personalidades.items():
+            self.personalidad(personalidad).fusionar(estadisticas)
+
+    def __str__(self) -> str:
+        lineas = [f"{'Personalidad':>12}{'Jugadores':>11}{'Ruina':>9}{'Rondas media':>14}{'Desvío':>10}"]
+        for personalidad, estadisticas in self.personalidades.items():
+            rondas = estadisticas.rondas_ruina
+            lineas.append(f"{personalidad:>12}{estadisticas.jugadores:>11}"
+                          f"{estadisticas.probabilidad_ruina:>9.4f}{rondas.media:>14.1f}{rondas.desviacion:>10.1f}")
+        return "\n".join(lineas)
+
+
+def _jugar_mesa(mesa: int, personalidades: tuple, fichas: int, max_rondas: int, semilla: int,
+                reglas: ReglasMesa, barajado: PoliticaBarajado) -> tuple[ResultadoTorneoJugador, ...]:
+    """Juega una mesa hasta que no quedan jugadores o se llega a max_rondas.
+
+    Returns:
+        tuple[ResultadoTorneoJugador, ...]: Un resultado por jugador, en orden de asiento.
+    """
+    generador = GeneradorContador(semilla, mesa)
+    juego = BlackJack(interactivo=False, generador=generador, barajado=barajado, reglas=reglas)
+    asientos = {}
+    for asiento, personalidad in enumerate(personalidades):
+        politica = PoliticaPersonalidad(personalidad, generador)
+        nombre = f"Mesa {mesa} Jugador {asiento + 1}"
+        asientos[nombre] = asiento
+        juego.agregar_jugador(Bot(nombre, fichas, politica, politica))
+    resultados = [None] * len(personalidades)
+    for ronda in juego.rondas(max_rondas):
+        if ronda.retirados:
+            fichas_finales = {jugador.nombre: jugador.fichas for jugador in ronda.jugadores}
+            for nombre in ronda.retirados:
+                asiento = asientos[nombre]
+                resultados[asiento] = ResultadoTorneoJugador(mesa, asiento, personalidades[asiento],
+                                                             juego.ronda, fichas_finales[nombre], True)
+    for jugador in juego.jugadores:
+        asiento = asientos[jugador.nombre]
+        resultados[asiento] = ResultadoTorneoJugador(mesa, asiento, personalidades[asiento],
+                                                     juego.ronda, jugador.fichas, False)
+    return tuple(resultados)
+
+
+def _en_grupos(elementos, tamanio: int):
+    """Recorre un iterable de a grupos de `tamanio` elementos (el último puede ser más chico).
+
+    Yields:
+        tuple: Cada grupo, sin materializar el resto del iterable.
+    """
+    elementos = iter(elementos)
+    while grupo := tuple(islice(elementos, tamanio)):
+        yield grupo
+
+
+def _jugar_mesas(lote: tuple, fichas: int, max_rondas: int, semilla: int,
+                 reglas: ReglasMesa, barajado: PoliticaBarajado) -> list:
+    """Juega varias mesas en el proceso actual; cada elemento del lote es (mesa, personalidades)."""
+    return [_jugar_mesa(mesa, personalidades, fichas, max_rondas, semilla, reglas, barajado)
+            for mesa, personalidades in lote]
+
+
+def jugar_torneo(personalidades, repeticiones: int = 1, por_mesa: int = 7, fichas: int = 100,
+                 max_rondas: int = 10_000, semilla: int = 0, procesos: int = None,
+                 mesas_por_lote: int = 64, reglas: ReglasMesa = REGLAS_CLASICAS,
+                 barajado: PoliticaBarajado = None):
+    """Juega un torneo y devuelve los resultados de cada mesa a medida que terminan.
+
+    Los jugadores se sientan en el orden de `personalidades` (repetidas `repeticiones`
+    veces), de a `por_mesa` por mesa. Las mesas se envían a los procesos en lotes de
+    `mesas_por_lote` para no pagar la comunicación entre procesos por cada mesa, y los
+    resultados salen en el orden de las mesas. Las mesas y los lotes se arman a medida
+    que hacen falta y nunca hay más de dos lotes por proceso en vuelo, así que la memoria
+    no crece con la cantidad de jugadores.
+
+    Args:
+        personalidades (iterable[int]): Personalidad de cada jugador, entre Compu.TRAN y Compu.LOCO.
+        repeticiones (int, optional): Cuántas veces se repite la lista de personalidades. Por defecto es 1.
+        por_mesa (int, optional): Jugadores por mesa. Por defecto es 7.
+        fichas (int, optional): Fichas iniciales de cada jugador. Por defecto es 100.
+        max_rondas (int, optional): Rondas a partir de las cuales una mesa termina aunque queden
+            jugadores. Por defecto es 10.000.
+        semilla (int, optional): Semilla de la que se derivan los flujos de cada mesa. Por defecto es 0.
+        procesos (int, optional): Cantidad de procesos. Por defecto, uno por núcleo; con 1 se juega
+            en el proceso actual.
+        mesas_por_lote (int, optional): Mesas que juega cada proceso por envío. Por defecto es 64.
+        reglas (ReglasMesa, optional): Las reglas de las mesas. Por defecto REGLAS_CLASICAS.
+        barajado (PoliticaBarajado, optional): Política de barajado de las mesas. Por defecto se
+            baraja el mazo entero en cada ronda.
+
+    Yields:
+        tuple[ResultadoTorneoJugador, ...]: Los resultados de cada mesa, en orden de asiento.
+
+    Raises:
+        ValueError: Si una personalidad está fuera de rango o los tamaños no son positivos.
+    """
+    if por_mesa < 1 or fichas < 1 or max_rondas < 1 or mesas_por_lote < 1:
+        raise ValueError("Los jugadores por mesa, las fichas, las rondas y el lote deben ser positivos")
+    personalidades = tuple(personalidades)
+    for personalidad in personalidades:
+        if not PoliticaPersonalidad.TRAN <= personalidad <= PoliticaPersonalidad.LOCO:
+            raise ValueError("Personalidad fuera de rango")
+    jugadores = chain.from_iterable(repeat(personalidades, repeticiones))
+    lotes = _en_grupos(enumerate(_en_grupos(jugadores, por_mesa)), mesas_por_lote)
+    procesos = procesos or os.cpu_count() or 1
+    if procesos == 1:
+        for lote in lotes:
+            yield from _jugar_mesas(lote, fichas, max_rondas, semilla, reglas, barajado)
+        return
+    with ProcessPoolExecutor(max_workers=procesos) as ejecutor:
+        en_vuelo = deque()
+        for lote in lotes:
+            en_vuelo.append(ejecutor.submit(_jugar_mesas, lote, fichas, max_rondas, semilla, reglas, barajado))
+            if len(en_vuelo) >= 2 * procesos:
+                yield from en_vuelo.popleft().result()
+        while en_vuelo:
+            yield from en_vuelo.popleft().result()
+
+
+def torneo(personalidades, repeticiones: int = 1, ancho: int = 50, **opciones) -> EstadisticasTorneo:
+    """Juega un torneo completo y acumula sus estadísticas.
+
+    Args:
+        personalidades (iterable[int]): Personalidad de cada jugador.
+        repeticiones (int, optional): Cuántas veces se repite la lista de personalidades. Por defecto es 1.
+        ancho (int, optional): Rondas por clase del histograma de tiempo de ruina. Por defecto es 50.
+        **opciones: Se pasan a jugar_torneo.
+
+    Returns:
+        EstadisticasTorneo: Las estadísticas por personalidad.
+    """
+    return EstadisticasTorneo(ancho).consumir(jugar_torneo(personalidades, repeticiones, **opciones))
+
+
+def test_jugar_torneo():
+    print("Se esta ejecutando el test del torneo")
+    opciones = dict(por_mesa=3, max_rondas=30, semilla=5, mesas_por_lote=2)
+    en_serie = list(jugar_torneo((1, 50, 100), repeticiones=5, procesos=1, **opciones))
+    assert [mesa[0].mesa for mesa in en_serie] == list(range(5))
+    assert [len(mesa) for mesa in en_serie] == [3] * 5
+    assert list(jugar_torneo((1, 50, 100), repeticiones=5, procesos=2, **opciones)) == en_serie
+    try:
+        next(jugar_torneo((0,), procesos=1))
+        raise AssertionError("Se aceptó una personalidad fuera de rango")
+    except ValueError:
+        pass
+
+
+if __name__ == '__main__':
+    import argparse
+    parser = argparse.ArgumentParser(description="Torneo de supervivencia de jugadores computarizados")
+    parser.add_argument("--repeticiones", type=int, default=10,
+                        help="jugadores por cada personalidad de 1 a 100")
+    parser.add_argument("--por-mesa", type=int, default=7)
+    parser.add_argument("--fichas", type=int, default=100)
+    parser.add_argument("--max-rondas", type=int, default=10_000)
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--procesos", type=int, default=None)
+    args = parser.parse_args()
+    print(torneo(range(PoliticaPersonalidad.TRAN, PoliticaPersonalidad.LOCO + 1), args.repeticiones,
+                 por_mesa=args.por_mesa, fichas=args.fichas, max_rondas=args.max_rondas,
+                 semilla=args.semilla, procesos=args.procesos))
@@ -0,0 +1,95 @@
+"""
+totales.py - Tabla precalculada del total de una mano de BlackJack.
+
+El total de una mano y si es blanda solo dependen de su suma dura (ases como 1,
+figuras como 10) y de si tiene algún as. Por eso cualquier composición de la
+mano (cuántos ases, cuántos 2, ..., cuántas cartas de 10) se reduce a un índice
+`dura * 2 + tiene_as`, y el total y si es blanda salen de leer ese índice en
+una tabla, sin ramas para los ases.
+
+Las tablas son `bytes` de LIMITE posiciones y se arman al importar el módulo,
+así que no hace falta guardarlas en un archivo. Los motores por lotes pueden
+verlas como arreglos sin copiarlas:
+
+    totales = numpy.frombuffer(TOTALES, dtype=numpy.uint8)
+
+Constantes:
+    - MAXIMA_DURA: La mayor suma dura que cubren las tablas.
+    - LIMITE: Cantidad de índices de las tablas; un índice mayor es una mano pasada.
+    - TOTALES: Mejor total por índice.
+    - BLANDAS: 1 si la mano es blanda, por índice.
+    - VALORES: El valor de cada posición de una composición (as, 2 a 9 y 10).
+
+Funciones:
+    - indice: Índice de una mano a partir de su suma dura y sus ases.
+    - indice_composicion: Índice de una mano a partir de su composición.
+    - total_composicion: Mejor total y si es blanda de una composición.
+"""
+
+MAXIMA_DURA = 127
+LIMITE = 2 * (MAXIMA_DURA + 1)
+VALORES = (1, 2, 3, 4, 5, 6, 7, 8, 9, 10)
+
+
+def _armar_tablas() -> tuple[bytes, bytes]:
+    """Calcula el total y si es blanda de cada índice."""
+    totales = bytearray(LIMITE)
+    blandas = bytearray(LIMITE)
+    for dura in range(MAXIMA_DURA + 1):
+        totales[2 * dura] = dura
+        # Un as vale 11 si con eso la mano no se pasa
+        blanda = dura <= 11
+        totales[2 * dura + 1] = dura + 10 if blanda else dura
+        blandas[2 * dura + 1] = blanda
+    return bytes(totales), bytes(blandas)
+
+
+TOTALES, BLANDAS = _armar_tablas()
+
+
+def indice(dura: int, ases: int) -> int:
+    """Retorna el índice de una mano en las tablas.
+
+    Args:
+        dura (int): La suma de la mano contando los ases como 1.
+        ases (int): La cantidad de ases de la mano.
+
+    Returns:
+        int: dura * 2 + 1 si tiene algún as, dura * 2 si no; LIMITE o más si dura > MAXIMA_DURA.
+    """
+    return (dura << 1) | (ases > 0)
+
+
+def indice_composicion(cuentas) -> int:
+    """Retorna el índice de una mano a partir de su composición.
+
+    Args:
+        cuentas (Sequence[int]): Cantidad de cartas de cada valor, en el orden de VALORES.
+
+    Returns:
+        int: El índice de la mano en las tablas.
+
+    Raises:
+        ValueError: Si no hay una cantidad por cada valor o alguna es negativa.
+    """
+    if len(cuentas) != len(VALORES) or min(cuentas) < 0:
+        raise ValueError("La composición necesita una cantidad no negativa por cada valor")
+    return indice(sum(cantidad * valor for cantidad, valor in zip(cuentas, VALORES)), cuentas[0])
+
+
+def total_composicion(cuentas) -> tuple[int, bool]:
+    """Retorna el mejor total de una composición y si es blanda.
+
+    Args:
+        cuentas (Sequence[int]): Cantidad de cartas de cada valor, en el orden de VALORES.
+
+    Returns:
+        tuple[int, bool]: El total y si la mano cuenta un as como 11.
+
+    Raises:
+        ValueError: Si no hay una cantidad por cada valor o alguna es negativa.
+    """
+    posicion = indice_composicion(cuentas)
+    if posicion >= LIMITE:
+        return posicion >> 1, False
+    return TOTALES[posicion], bool(BLANDAS[posicion])
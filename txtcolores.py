@@ -6,11 +6,53 @@ Este módulo utiliza la librería colored (https://pypi.org/project/colored/).
 Funciones:
     - strclr: Devuelve el texto indicado con el color de texto, fondo y estilo indicado.
     - strclr_random: Devuelve el texto indicado con un color de texto aleatorio.
+    - usar_colores: Activa o desactiva los colores (modo sin color).
+    - colores_activos: Indica si los colores están activos.
+
+Los resultados de strclr se guardan en una caché por (texto, color_texto,
+color_fondo, estilo), así que colorear muchas veces el mismo texto no vuelve a
+armar las secuencias de escape. Si la salida no es una terminal, o si está
+definida la variable de entorno NO_COLOR, los colores empiezan desactivados y
+strclr devuelve el texto sin cambios.
 """
+import os
 import random
+import sys
+from functools import lru_cache
 from colored import fore, back, style
 
 
+def _detectar_colores() -> bool:
+    """Retorna True si la salida estándar es una terminal y no se pidió NO_COLOR."""
+    if os.environ.get("NO_COLOR"):
+        return False
+    try:
+        return sys.stdout.isatty()
+    except (AttributeError, ValueError):
+        return False
+
+
+_colores_activos: bool = _detectar_colores()
+
+
+def colores_activos() -> bool:
+    """Retorna True si strclr agrega colores al texto."""
+    return _colores_activos
+
+
+def usar_colores(activar: bool = None) -> None:
+    """
+    Activa o desactiva los colores.
+
+    args:
+        - activar: True para usar colores, False para el modo sin color,
+          None para detectarlo según la salida estándar.
+    """
+    global _colores_activos
+    _colores_activos = _detectar_colores() if activar is None else bool(activar)
+    _strclr.cache_clear()
+
+
 # escribir los comentarios con la forma pep8
 def strclr(texto, color_texto: str | int = None, color_fondo: str | int = None, estilo: str | int = None) -> str:
     """
@@ -42,6 +84,17 @@ def strclr(texto, color_texto: str | int = None, color_fondo: str | int = None,
         - strclr('texto', color_texto= 11,    color_fondo= 12,    estilo= 1)
 
     """
+    if not _colores_activos:
+        return texto if isinstance(texto, str) else str(texto)
+    try:
+        return _strclr(texto, color_texto, color_fondo, estilo)
+    except TypeError:  # Argumentos que no se pueden usar como clave de la caché
+        return _strclr.__wrapped__(texto, color_texto, color_fondo, estilo)
+
+
+@lru_cache(maxsize=1024)
+def _strclr(texto, color_texto: str | int = None, color_fondo: str | int = None, estilo: str | int = None) -> str:
+    """Arma el texto coloreado; strclr guarda el resultado en la caché."""
     try:
         color_str = ''
         if color_texto:
@@ -72,6 +125,8 @@ def strclr_random(texto: str, cantidad_colores: int=250) -> str:
     @raise: 
         - ValueError si el color o estilo indicado no existe.
     """
+    if not _colores_activos:
+        return texto
     try:
         color_str = ''
         for letra in texto:
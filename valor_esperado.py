@@ -0,0 +1,288 @@
+"""
+valor_esperado.py - Valor esperado exacto de cada jugada según la composición del mazo.
+
+Calcula el valor esperado (en apuestas) de plantarse, pedir, doblar y dividir
+para una mano, una carta visible del croupier y la composición exacta de las
+cartas que quedan sin ver. Al pedir se sacan las cartas de la composición, y el
+croupier juega con lo que quedó (ver `probabilidades_croupier`).
+
+Los resultados se guardan en una caché LRU de tamaño acotado, con clave la
+mano, la carta visible, si el croupier revisa el Black Jack y la composición
+empaquetada en bytes, así que repetir consultas durante un mismo mazo no vuelve
+a calcular nada. Si el croupier no revisa la carta tapada (como en
+REGLAS_CLASICAS), su Black Jack se cuenta como cualquier otro 21.
+
+Clases:
+    - CacheLRU: Caché acotada que descarta lo usado menos recientemente.
+    - ValoresEsperados: Valor esperado de cada jugada.
+    - CalculadoraEV: Calcula y guarda los valores esperados.
+
+Uso típico:
+
+    calculadora = CalculadoraEV(ReglasMesa(mazos=6))
+    valores = calculadora.valores((10, 6), 10, composicion)
+    valores.mejor  # "H"
+"""
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from estrategia import sumar, valor_carta, ev_plantarse, PEDIR, PLANTARSE, DOBLAR, DIVIDIR
+from probabilidades_croupier import distribucion_croupier, composicion_mazo
+from reglas import ReglasMesa, REGLAS_CLASICAS
+
+
+class CacheLRU:
+    """Caché acotada que descarta el elemento usado menos recientemente.
+
+    Atributos:
+        capacidad (int): Cantidad máxima de elementos guardados.
+        aciertos (int): Consultas que encontraron el valor guardado.
+        fallos (int): Consultas que no lo encontraron.
+    """
+
+    def __init__(self, capacidad: int) -> None:
+        """Inicializa una caché vacía.
+
+        Args:
+            capacidad (int): Cantidad máxima de elementos.
+
+        Raises:
+            ValueError: Si la capacidad no es positiva.
+        """
+        if capacidad < 1:
+            raise ValueError("La capacidad debe ser positiva")
+        self.__capacidad: int = capacidad
+        self.__datos: OrderedDict = OrderedDict()
+        self.aciertos: int = 0
+        self.fallos: int = 0
+
+    @property
+    def capacidad(self) -> int:
+        """Retorna la cantidad máxima de elementos."""
+        return self.__capacidad
+
+    def __len__(self) -> int:
+        return len(self.__datos)
+
+    def obtener(self, clave, defecto=None):
+        """Retorna el valor guardado para la clave y lo marca como recién usado."""
+        try:
+            valor = self.__datos[clave]
+        except KeyError:
+            self.fallos += 1
+            return defecto
+        self.__datos.move_to_end(clave)
+        self.aciertos += 1
+        return valor
+
+    def guardar(self, clave, valor) -> None:
+        """Guarda un valor, descartando el menos usado si la caché está llena."""
+        self.__datos[clave] = valor
+        self.__datos.move_to_end(clave)
+        if len(self.__datos) > self.__capacidad:
+            self.__datos.popitem(last=False)
+
+    def clear(self) -> None:
+        """Vacía la caché y reinicia las estadísticas."""
+        self.__datos.clear()
+        self.aciertos = 0
+        self.fallos = 0
+
+
+@dataclass(frozen=True, slots=True)
+class ValoresEsperados:
+    """Valor esperado de cada jugada, en apuestas iniciales.
+
+    Atributos:
+        plantarse (float): Valor de plantarse.
+        pedir (float): Valor de pedir y seguir jugando de forma óptima.
+        doblar (float): Valor de doblar (recibe una carta y se planta).
+        dividir (float | None): Valor de dividir, o None si la mano no es un par.
+    """
+    plantarse: float
+    pedir: float
+    doblar: float
+    dividir: float = None
+
+    @property
+    def mejor(self) -> str:
+        """Retorna la jugada de mayor valor esperado: PEDIR, PLANTARSE, DOBLAR o DIVIDIR."""
+        opciones = [(self.plantarse, PLANTARSE), (self.pedir, PEDIR), (self.doblar, DOBLAR)]
+        if self.dividir is not None:
+            opciones.append((self.dividir, DIVIDIR))
+        return max(opciones)[1]
+
+
+def _empaquetar(composicion: tuple[int, ...]):
+    """Retorna una clave compacta para la composición: bytes si entra, si no la tupla."""
+    return bytes(composicion) if max(composicion) < 256 else composicion
+
+
+class CalculadoraEV:
+    """Calcula valores esperados exactos y los guarda en una caché LRU.
+
+    Atributos:
+        __reglas (ReglasMesa): Las reglas de la mesa.
+        __cache (CacheLRU): Resultados de consultas y de estados intermedios.
+    """
+
+    def __init__(self, reglas: ReglasMesa = ReglasMesa(), capacidad: int = 200_000) -> None:
+        """Inicializa la calculadora.
+
+        Args:
+            reglas (ReglasMesa, optional): Las reglas de la mesa. Por defecto ReglasMesa().
+            capacidad (int, optional): Cantidad máxima de resultados guardados. Por defecto 200.000.
+        """
+        self.__reglas: ReglasMesa = reglas
+        self.__revisa: bool = reglas.croupier_revisa
+        self.__cache: CacheLRU = CacheLRU(capacidad)
+
+    @property
+    def reglas(self) -> ReglasMesa:
+        """Retorna las reglas de la mesa."""
+        return self.__reglas
+
+    @property
+    def cache(self) -> CacheLRU:
+        """Retorna la caché de resultados."""
+        return self.__cache
+
+    def __croupier(self, carta_visible: int, composicion: tuple[int, ...]) -> tuple[float, ...]:
+        return distribucion_croupier(carta_visible, composicion, self.__reglas.croupier_pide_17_blando,
+                                     sin_blackjack=self.__revisa)
+
+    def plantarse(self, total: int, carta_visible: int, composicion: tuple[int, ...]) -> float:
+        """Valor esperado de plantarse con `total`."""
+        if total > 21:
+            return -1.0
+        return ev_plantarse(total, self.__croupier(carta_visible, composicion))
+
+    def __optimo(self, total: int, blanda: bool, carta_visible: int, composicion: tuple[int, ...]) -> float:
+        """Mejor valor entre plantarse y pedir desde un estado, guardado en la caché."""
+        clave = ("o", self.__revisa, total, blanda, carta_visible, _empaquetar(composicion))
+        valor = self.__cache.obtener(clave)
+        if valor is None:
+            valor = self.plantarse(total, carta_visible, composicion)
+            if total < 21:
+                valor = max(valor, self.pedir(total, blanda, carta_visible, composicion))
+            self.__cache.guardar(clave, valor)
+        return valor
+
+    def pedir(self, total: int, blanda: bool, carta_visible: int, composicion: tuple[int, ...]) -> float:
+        """Valor esperado de pedir una carta y seguir jugando de forma óptima."""
+        restantes = sum(composicion)
+        ev = 0.0
+        for posicion, cantidad in enumerate(composicion):
+            if not cantidad:
+                continue
+            nuevo, nueva_blanda = sumar(total, blanda, posicion + 1)
+            if nuevo > 21:
+                ev -= cantidad / restantes
+            else:
+                resto = composicion[:posicion] + (cantidad - 1,) + composicion[posicion + 1:]
+                ev += cantidad / restantes * self.__optimo(nuevo, nueva_blanda, carta_visible, resto)
+        return ev
+
+    def doblar(self, total: int, blanda: bool, carta_visible: int, composicion: tuple[int, ...]) -> float:
+        """Valor esperado de doblar: se duplica la apuesta, se recibe una carta y se planta."""
+        restantes = sum(composicion)
+        ev = 0.0
+        for posicion, cantidad in enumerate(composicion):
+            if not cantidad:
+                continue
+            nuevo = sumar(total, blanda, posicion + 1)[0]
+            resto = composicion[:posicion] + (cantidad - 1,) + composicion[posicion + 1:]
+            ev += cantidad / restantes * self.plantarse(nuevo, carta_visible, resto)
+        return 2.0 * ev
+
+    def dividir(self, valor: int, carta_visible: int, composicion: tuple[int, ...]) -> float:
+        """Valor esperado de dividir un par de `valor`, sin volver a dividir.
+
+        La composición no debe incluir las dos cartas del par. Cada mano se evalúa
+        por separado contra la misma composición.
+        """
+        total, blanda = sumar(0, False, valor)
+        puede_doblar = self.__reglas.doblar_despues_de_dividir
+        restantes = sum(composicion)
+        ev = 0.0
+        for posicion, cantidad in enumerate(composicion):
+            if not cantidad:
+                continue
+            nuevo, nueva_blanda = sumar(total, blanda, posicion + 1)
+            resto = composicion[:posicion] + (cantidad - 1,) + composicion[posicion + 1:]
+            if valor == 1:  # Los ases divididos reciben una sola carta
+                mano = self.plantarse(nuevo, carta_visible, resto)
+            else:
+                mano = self.__optimo(nuevo, nueva_blanda, carta_visible, resto)
+                if puede_doblar and nuevo < 21:
+                    mano = max(mano, self.doblar(nuevo, nueva_blanda, carta_visible, resto))
+            ev += cantidad / restantes * mano
+        return 2.0 * ev
+
+    def valores(self, cartas: tuple[int, ...], carta_visible: int,
+                composicion: tuple[int, ...]) -> ValoresEsperados:
+        """Valor esperado de cada jugada para una mano.
+
+        Args:
+            cartas (tuple[int, ...]): Los valores (1 a 10) de las cartas del jugador.
+            carta_visible (int): El valor de la carta visible del croupier.
+            composicion (tuple[int, ...]): Las cartas sin ver: el mazo más la carta tapada
+                del croupier, sin las cartas del jugador ni la carta visible.
+
+        Returns:
+            ValoresEsperados: Los valores de plantarse, pedir, doblar y dividir.
+        """
+        composicion = tuple(composicion)
+        par = cartas[0] if len(cartas) == 2 and cartas[0] == cartas[1] else None
+        clave = ("v", self.__revisa, tuple(sorted(cartas)), carta_visible, _empaquetar(composicion))
+        resultado = self.__cache.obtener(clave)
+        if resultado is not None:
+            return resultado
+        total, blanda = 0, False
+        for valor in cartas:
+            total, blanda = sumar(total, blanda, valor)
+        plantarse = self.plantarse(total, carta_visible, composicion)
+        pedir = self.pedir(total, blanda, carta_visible, composicion) if total < 21 else -1.0
+        doblar = self.doblar(total, blanda, carta_visible, composicion) if total < 21 else -2.0
+        dividir = None
+        if par is not None:
+            dividir = self.dividir(par, carta_visible, composicion)
+        resultado = ValoresEsperados(plantarse, pedir, doblar, dividir)
+        self.__cache.guardar(clave, resultado)
+        return resultado
+
+    def consultar(self, jugador, croupier, mazo) -> ValoresEsperados:
+        """Valor esperado de cada jugada para la mano de un jugador en una mesa.
+
+        Las cartas sin ver son las del mazo más las cartas tapadas del croupier.
+
+        Args:
+            jugador (JugadorBlackJack): El jugador que decide.
+            croupier (Croupier): El croupier, con una carta visible.
+            mazo (MazoBlackJack): El mazo de la mesa.
+
+        Returns:
+            ValoresEsperados: Los valores de cada jugada.
+        """
+        composicion = list(composicion_mazo(mazo))
+        carta_visible = None
+        for carta in croupier.mano.cartas:
+            if carta.istapada:
+                composicion[valor_carta(carta.numero) - 1] += 1
+            elif carta_visible is None:
+                carta_visible = valor_carta(carta.numero)
+        cartas = tuple(valor_carta(carta.numero) for carta in jugador.mano.cartas)
+        return self.valores(cartas, carta_visible, tuple(composicion))
+
+
+def test_croupier_sin_revisar():
+    print("Se esta ejecutando el test del valor esperado sin revisar el Black Jack")
+    composicion = (23, 24, 24, 24, 24, 24, 24, 24, 24, 94)  # Seis mazos sin el as visible ni los dos 10
+    revisa = CalculadoraEV(ReglasMesa(mazos=6)).valores((10, 10), 1, composicion)
+    no_revisa = CalculadoraEV(REGLAS_CLASICAS).valores((10, 10), 1, composicion)
+    # Sin revisar, el croupier con un as visible puede tener Black Jack y el 20 vale menos
+    assert no_revisa.plantarse < revisa.plantarse
+
+
+if __name__ == '__main__':
+    test_croupier_sin_revisar()